@@ -98,6 +98,7 @@ class cuTensorNet(Backend):
         elif tn_format is not None:
             # TODO: dump expression & size_dict as plain unicode?
             raise NotImplementedError(f"the TN format {tn_format} is not supported")
+        self.circuit_converter = circuit_converter
         self.network = cutn.Network(
             self.expression, *self.operands, options=self.network_opts)
 
@@ -120,10 +121,20 @@ class cuTensorNet(Backend):
         return preprocess_data
 
     def run(self, circuit, nshots=0):
-        if self.rank == 0 and nshots > 0:
-            warnings.warn("the cutn backend does not support sampling")
+        results = None
+        if nshots > 0:
+            try:
+                # not available in older cuQuantum Python releases
+                from cuquantum.cutensornet.experimental import sample_circuit
+            except ImportError:
+                if self.rank == 0:
+                    warnings.warn("the cutn backend does not support sampling")
+            else:
+                results = sample_circuit(
+                    self.circuit_converter, nshots, options=self.network_opts,
+                    optimize={'samples': 8, 'threads': self.ncpu_threads})
 
         self.network.contract()
 
         # TODO: support these return values?
-        return {'results': None, 'post_results': None, 'run_data': {}}
+        return {'results': results, 'post_results': None, 'run_data': {}}
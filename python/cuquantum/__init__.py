@@ -6,7 +6,7 @@ from cuquantum import custatevec
 from cuquantum import cutensornet
 from cuquantum.cutensornet import (
     contract, contract_path, einsum, einsum_path, tensor, tensor_qualifiers_dtype, Network, BaseCUDAMemoryManager, MemoryPointer,
-    NetworkOptions, OptimizerInfo, OptimizerOptions, PathFinderOptions, ReconfigOptions, SlicerOptions, CircuitToEinsum)
+    NetworkOptions, OptimizerInfo, OptimizerOptions, PathCache, PathFinderOptions, ReconfigOptions, SlicerOptions, CircuitToEinsum, NativeCircuit)
 from cuquantum.utils import ComputeType, cudaDataType, libraryPropertyType
 from cuquantum._version import __version__
 
@@ -5,8 +5,10 @@
 from cuquantum.cutensornet.cutensornet import *
 from cuquantum.cutensornet.configuration import *
 from cuquantum.cutensornet.memory import *
+from cuquantum.cutensornet.path_cache import *
 from cuquantum.cutensornet.tensor_network import *
 from cuquantum.cutensornet.circuit_converter import *
+from cuquantum.cutensornet.native_circuit import *
 from cuquantum.cutensornet._internal.utils import get_mpi_comm_pointer
 from . import experimental
 from . import tensor
@@ -0,0 +1,154 @@
+# Copyright (c) 2023, NVIDIA CORPORATION & AFFILIATES
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Canonical form of tensor networks that is invariant under the relabeling of modes and the permutation of operands.
+"""
+
+__all__ = ['CanonicalForm', 'canonicalize']
+
+import hashlib
+import json
+
+from . import path_utils
+
+
+def _rank(signatures):
+    """
+    Compress the signatures into colors 0, ..., K-1 that are ordered like the signatures themselves.
+    """
+    ranking = {s: c for c, s in enumerate(sorted(set(signatures)))}
+    return [ranking[s] for s in signatures]
+
+
+def _refine(tensor_colors, mode_colors, tensor_modes, mode_tensors):
+    """
+    Refine the coloring of the bipartite tensor-mode graph until it is stable (1-dimensional Weisfeiler-Lehman).
+    """
+    num_classes = len(set(tensor_colors)) + len(set(mode_colors))
+    while True:
+        tensor_colors = _rank([(tensor_colors[t], tuple(sorted(mode_colors[m] for m in modes))) for t, modes in enumerate(tensor_modes)])
+        mode_colors = _rank([(mode_colors[m], tuple(sorted(tensor_colors[t] for t in tensors))) for m, tensors in enumerate(mode_tensors)])
+        n = len(set(tensor_colors)) + len(set(mode_colors))
+        if n == num_classes:
+            return tensor_colors, mode_colors
+        num_classes = n
+
+
+def _individualize(colors):
+    """
+    Return the colors with the first member of the smallest non-singleton color class distinguished, or None if all
+    classes are singletons.
+    """
+    seen = {}
+    for i, c in enumerate(colors):
+        seen.setdefault(c, []).append(i)
+    candidates = [c for c, members in seen.items() if len(members) > 1]
+    if not candidates:
+        return None
+    chosen = seen[min(candidates)][0]
+    return [2*c if i == chosen else 2*c+1 for i, c in enumerate(colors)]
+
+
+class CanonicalForm:
+    """
+    The canonical form of a tensor network.
+
+    Attributes:
+        fingerprint: A hexadecimal digest of the canonical network, shared by networks that are identical up to the
+            relabeling of modes, the permutation of operands and the order of the modes within each operand or the
+            output.
+        operand_order: A sequence whose k-th element is the user operand placed at position k in the canonical network.
+        mode_map_ord_to_canonical: A map from the mode ordinals of the network to the canonical mode ordinals.
+        mode_map_canonical_to_ord: The inverse of ``mode_map_ord_to_canonical``.
+    """
+
+    def __init__(self, fingerprint, operand_order, mode_map_ord_to_canonical):
+        self.fingerprint = fingerprint
+        self.operand_order = tuple(operand_order)
+        self.mode_map_ord_to_canonical = mode_map_ord_to_canonical
+        self.mode_map_canonical_to_ord = {c: m for m, c in mode_map_ord_to_canonical.items()}
+
+        self._operand_to_canonical = [None] * len(self.operand_order)
+        for k, t in enumerate(self.operand_order):
+            self._operand_to_canonical[t] = k
+
+    def _map_path(self, path, operand_map):
+        num_operands = len(self.operand_order)
+        ssa_path = path_utils.linear_to_ssa(path, num_operands)
+        ssa_path = [tuple(operand_map[i] if i < num_operands else i for i in pair) for pair in ssa_path]
+        return path_utils.ssa_to_linear(ssa_path, num_operands)
+
+    def path_to_canonical(self, path):
+        """
+        Map a contraction path in the :func:`numpy.einsum_path` format from the network to the canonical network.
+        """
+        return self._map_path(path, self._operand_to_canonical)
+
+    def path_from_canonical(self, path):
+        """
+        Map a contraction path in the :func:`numpy.einsum_path` format from the canonical network to the network.
+        """
+        return self._map_path(path, self.operand_order)
+
+
+def canonicalize(inputs, output, size_dict):
+    """
+    Compute the canonical form of a tensor network.
+
+    Args:
+        inputs: The input modes of the network as a sequence of sequences of mode ordinals, as returned by
+            :func:`einsum_parser.parse_einsum`.
+        output: The output modes of the network as a sequence of mode ordinals.
+        size_dict: A map from mode ordinals to the extents.
+
+    Returns:
+        CanonicalForm: The canonical form of the network.
+
+    Notes:
+        The canonical ordering is obtained by color refinement on the bipartite graph of tensors and modes, with the
+        mode extents and the membership in the output as initial mode colors. Symmetric networks whose colors remain
+        tied are ordered by individualizing one member of a tied class at a time, which keeps the fingerprint exact (it
+        is computed from the relabeled network) at the expense of possibly missing some isomorphisms.
+    """
+    modes = sorted(size_dict)
+    mode_index = {m: i for i, m in enumerate(modes)}
+
+    tensor_modes = [[mode_index[m] for m in _input] for _input in inputs]
+    mode_tensors = [[] for _ in modes]
+    for t, _input in enumerate(tensor_modes):
+        for m in _input:
+            mode_tensors[m].append(t)
+
+    output_modes = set(mode_index[m] for m in output)
+    tensor_colors = [0] * len(tensor_modes)
+    mode_colors = _rank([(size_dict[m], mode_index[m] in output_modes) for m in modes])
+
+    tensor_colors, mode_colors = _refine(tensor_colors, mode_colors, tensor_modes, mode_tensors)
+    while True:
+        colors = _individualize(tensor_colors)
+        if colors is not None:
+            tensor_colors = colors
+        else:
+            colors = _individualize(mode_colors)
+            if colors is None:
+                break
+            mode_colors = colors
+        tensor_colors, mode_colors = _refine(tensor_colors, mode_colors, tensor_modes, mode_tensors)
+
+    # All colors are distinct at this point, and they define the canonical positions.
+    operand_order = [None] * len(tensor_colors)
+    for t, c in enumerate(tensor_colors):
+        operand_order[c] = t
+
+    content = {
+        'inputs': [sorted(mode_colors[m] for m in tensor_modes[t]) for t in operand_order],
+        'output': sorted(mode_colors[m] for m in output_modes),
+        'extents': [size_dict[m] for _, m in sorted(zip(mode_colors, modes))]
+    }
+    fingerprint = hashlib.sha256(json.dumps(content, default=int).encode()).hexdigest()
+
+    mode_map_ord_to_canonical = {m: mode_colors[i] for i, m in enumerate(modes)}
+
+    return CanonicalForm(fingerprint, operand_order, mode_map_ord_to_canonical)
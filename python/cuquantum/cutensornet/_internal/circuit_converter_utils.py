@@ -2,19 +2,17 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-try:
-    import cirq
-    from . import circuit_parser_utils_cirq
-except ImportError:
-    cirq = circuit_parser_utils_cirq = None
+import dataclasses
+import functools
+import importlib
+import itertools
+
 import cupy as cp
-try:
-    import qiskit
-    from . import circuit_parser_utils_qiskit
-except ImportError:
-    qiskit = circuit_parser_utils_qiskit = None
+import numpy as np
 
+from . import tensor_wrapper
 from .tensor_wrapper import _get_backend_asarray_func
+from ..native_circuit import NativeCircuit
 
 EINSUM_SYMBOLS_BASE = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
 
@@ -24,6 +22,11 @@ QISKIT_MIN_VERSION = '0.24.0' # qiskit metapackage version
 import types
 EMPTY_DICT = types.MappingProxyType({})
 
+PAULI_MATRICES = {'I': np.array([[1,0], [0,1]]),
+                  'X': np.array([[0,1], [1,0]]),
+                  'Y': np.array([[0,-1j], [1j,0]]),
+                  'Z': np.array([[1,0], [0,-1]])}
+
 def check_version(package_name, version, minimum_version):
     """
     Check if the current version of a package is above the required minimum.
@@ -45,34 +48,52 @@ def _get_symbol(i):
         return EINSUM_SYMBOLS_BASE[i]
     return chr(i + 140)
 
+def _get_circuit_package(circuit):
+    """
+    Return the name of the top-level package defining the class of the circuit object (or one of its base classes) among
+    qiskit and cirq, or None. The package is only imported if it defines the circuit.
+    """
+    for cls in type(circuit).__mro__:
+        base = cls.__module__.split('.')[0]
+        if base in ('qiskit', 'cirq'):
+            return importlib.import_module(base)
+    return None
+
 def infer_parser(circuit):
     """
     Infer the package that defines the circuit object.
     """
-    if qiskit and isinstance(circuit, qiskit.QuantumCircuit):
+    if isinstance(circuit, NativeCircuit):
+        from . import circuit_parser_utils_native
+        return circuit_parser_utils_native
+    package = _get_circuit_package(circuit)
+    if package is not None and package.__name__ == 'qiskit' and isinstance(circuit, package.QuantumCircuit):
         import importlib.metadata
         qiskit_version = importlib.metadata.version('qiskit') # qiskit metapackage version
         check_version('qiskit', qiskit_version, QISKIT_MIN_VERSION)
+        from . import circuit_parser_utils_qiskit
         return circuit_parser_utils_qiskit
-    elif cirq and isinstance(circuit, cirq.Circuit):
-        cirq_version  = cirq.__version__
+    elif package is not None and package.__name__ == 'cirq' and isinstance(circuit, package.Circuit):
+        cirq_version  = package.__version__
         check_version('cirq', cirq_version, CIRQ_MIN_VERSION)
+        from . import circuit_parser_utils_cirq
         return circuit_parser_utils_cirq
     else:
         base = circuit.__module__.split('.')[0]
         raise NotImplementedError(f'circuit from {base} not supported')
 
-def parse_inputs(qubits, gates, dtype, backend):
+def parse_inputs(qubits, gates, dtype, backend, reduce_gate=None, basis_map=None):
     """
     Given a sequence of qubits and gates, generate the mode labels, 
     tensor operands and qubits_frontier map for the initial states and gate operations.
     """
     n_qubits = len(qubits)
-    operands = get_bitstring_tensors('0'*n_qubits, dtype, backend=backend)
+    operands = get_bitstring_tensors('0'*n_qubits, dtype, backend=backend, basis_map=basis_map)
     mode_labels, qubits_frontier, next_frontier = _init_mode_labels_from_qubits(qubits)
     gate_mode_labels, gate_operands = parse_gates_to_mode_labels_operands(gates, 
                                                                           qubits_frontier, 
-                                                                          next_frontier)
+                                                                          next_frontier,
+                                                                          reduce_gate=reduce_gate)
     mode_labels += gate_mode_labels
     operands += gate_operands                                         
     return mode_labels, operands, qubits_frontier
@@ -110,7 +131,17 @@ def _init_mode_labels_from_qubits(qubits):
     n = len(qubits)
     return [[i] for i in range(n)], dict(zip(qubits, count())), n
 
-def get_bitstring_tensors(bitstring, dtype='complex128', backend=cp):
+def get_basis_tensors(dtype='complex128', backend=cp):
+    """
+    Create the tensor operands for the computational basis states, as a dictionary mapping '0' and '1' to the tensors.
+    """
+    asarray = _get_backend_asarray_func(backend)
+    state_0 = asarray([1, 0], dtype=dtype)
+    state_1 = asarray([0, 1], dtype=dtype)
+    return {'0': state_0,
+            '1': state_1}
+
+def get_bitstring_tensors(bitstring, dtype='complex128', backend=cp, basis_map=None):
     """
     Create the tensors operands for a given bitstring state.
 
@@ -118,16 +149,13 @@ def get_bitstring_tensors(bitstring, dtype='complex128', backend=cp):
         bitstring: A sequence of 0/1 specifing the product state.
         dtype: Data type for the tensor operands.
         backend: The package the tensor operands belong to.
+        basis_map: Optional, the basis state tensors to reuse, as returned by :func:`get_basis_tensors`.
 
     Returns:
         A list of tensor operands stored as `backend` array
     """
-    asarray = _get_backend_asarray_func(backend)
-    state_0 = asarray([1, 0], dtype=dtype)
-    state_1 = asarray([0, 1], dtype=dtype)
-
-    basis_map = {'0': state_0,
-                 '1': state_1}
+    if basis_map is None:
+        basis_map = get_basis_tensors(dtype, backend)
     
     operands = [basis_map[ibit] for ibit in bitstring]
     return operands
@@ -147,17 +175,37 @@ def convert_mode_labels_to_expression(input_mode_labels, output_mode_labels):
     expression = ','.join(input_symbols) + '->' + ''.join(map(_get_symbol, output_mode_labels))
     return expression
 
-def get_pauli_gates(pauli_map, dtype='complex128', backend=cp):
+def convert_mode_labels_to_interleaved(input_mode_labels, output_mode_labels):
     """
-    Populate the gates for all pauli operators.
+    Create the integer mode label arrays of the interleaved Einsum format from input and output index labels, without building
+    an expression string.
 
     Args:
-        pauli_map: A dictionary mapping qubits to pauli operators. 
-        dtype: Data type for the tensor operands.
-        backend: The package the tensor operands belong to.
+        input_mode_labels: A sequence of mode labels for each input tensor.
+        output_mode_labels: The desired mode labels for the output tensor.
 
     Returns:
-        A sequence of pauli gates.
+        A 2-tuple of a list of one-dimensional integer arrays (the mode labels of each input tensor, as views into a single
+        array) and a one-dimensional integer array (the output mode labels).
+    """
+    sizes = [len(labels) for labels in input_mode_labels]
+    labels = np.fromiter(itertools.chain.from_iterable(input_mode_labels), dtype=np.int64, count=sum(sizes))
+    input_labels = np.split(labels, np.cumsum(sizes[:-1]))
+    return input_labels, np.asarray(output_mode_labels, dtype=np.int64).reshape(-1)
+
+def get_contraction_operands(expression, operands):
+    """
+    Return the positional arguments of :func:`contract` or :class:`Network` for an Einsum expression in the string format or in
+    the interleaved format (as returned by :func:`convert_mode_labels_to_interleaved`) and the tensor operands.
+    """
+    if isinstance(expression, str):
+        return (expression, *operands)
+    input_labels, output_labels = expression
+    return (*itertools.chain.from_iterable(zip(operands, input_labels)), output_labels)
+
+def get_pauli_tensors(dtype='complex128', backend=cp):
+    """
+    Create the tensor operands for the Pauli operators, as a dictionary mapping 'I', 'X', 'Y' and 'Z' to the tensors.
     """
     asarray = _get_backend_asarray_func(backend)
     pauli_i = asarray([[1,0], [0,1]], dtype=dtype)
@@ -165,10 +213,26 @@ def get_pauli_gates(pauli_map, dtype='complex128', backend=cp):
     pauli_y = asarray([[0,-1j], [1j,0]], dtype=dtype)
     pauli_z = asarray([[1,0], [0,-1]], dtype=dtype)
     
-    operand_map = {'I': pauli_i,
-                   'X': pauli_x,
-                   'Y': pauli_y,
-                   'Z': pauli_z}
+    return {'I': pauli_i,
+            'X': pauli_x,
+            'Y': pauli_y,
+            'Z': pauli_z}
+
+def get_pauli_gates(pauli_map, dtype='complex128', backend=cp, operand_map=None):
+    """
+    Populate the gates for all pauli operators.
+
+    Args:
+        pauli_map: A dictionary mapping qubits to pauli operators. 
+        dtype: Data type for the tensor operands.
+        backend: The package the tensor operands belong to.
+        operand_map: Optional, the Pauli operator tensors to reuse, as returned by :func:`get_pauli_tensors`.
+
+    Returns:
+        A sequence of pauli gates.
+    """
+    if operand_map is None:
+        operand_map = get_pauli_tensors(dtype, backend)
     gates = []
     for qubit, pauli_char in pauli_map.items():
         operand = operand_map.get(pauli_char)
@@ -177,10 +241,46 @@ def get_pauli_gates(pauli_map, dtype='complex128', backend=cp):
         gates.append((operand, (qubit,)))
     return gates
 
+def get_batched_pauli_gates(pauli_maps, qubits, dtype='complex128', backend=cp):
+    """
+    Populate the gates for a batch of Pauli strings, stacking the Pauli operators acting on each qubit.
+
+    Args:
+        pauli_maps: A sequence of dictionaries mapping qubits to pauli operators. Qubits not specified are assumed to be
+            applied with the identity operator.
+        qubits: The qubits to populate the gates for.
+        dtype: Data type for the tensor operands.
+        backend: The package the tensor operands belong to.
+
+    Returns:
+        A sequence of gates, one per qubit, whose tensors have the batch mode first, followed by the output and input modes.
+        The tensors are views into one buffer created in a single transfer.
+    """
+    if not qubits:
+        return []
+    stacked = np.empty((len(qubits), len(pauli_maps), 2, 2), dtype=np.complex128)
+    for i, qubit in enumerate(qubits):
+        for k, pauli_map in enumerate(pauli_maps):
+            matrix = PAULI_MATRICES.get(pauli_map.get(qubit, 'I'))
+            if matrix is None:
+                raise ValueError('pauli string character must be one of I/X/Y/Z')
+            stacked[i, k] = matrix
+    asarray = _get_backend_asarray_func(backend)
+    stacked = asarray(stacked, dtype=dtype)
+    return [(stacked[i], (qubit,)) for i, qubit in enumerate(qubits)]
+
+def get_ones_tensor(size, dtype='complex128', backend=cp):
+    """
+    Create a vector of ones of the specified size.
+    """
+    asarray = _get_backend_asarray_func(backend)
+    return asarray(np.ones(size), dtype=dtype)
+
 def parse_gates_to_mode_labels_operands(
     gates, 
     qubits_frontier, 
-    next_frontier
+    next_frontier,
+    reduce_gate=None
 ):
     """
     Populate the indices for all gate tensors
@@ -189,6 +289,8 @@ def parse_gates_to_mode_labels_operands(
         gates: An list of gate tensors and the corresponding qubits.
         qubits_frontier: The map of the qubits to its current frontier index.
         next_frontier: The next index to use. 
+        reduce_gate: An optional callable returning the reduced tensor of a gate and the qubits it is diagonal on (see
+            :func:`reduce_gate_tensor`). The mode of a qubit a gate is diagonal on is shared by its input and output.
 
     Returns:
         Gate mode labels and gate operands.
@@ -197,13 +299,191 @@ def parse_gates_to_mode_labels_operands(
     operands = []
 
     for tensor, gate_qubits in gates:
+        diagonal = (False,) * len(gate_qubits)
+        if reduce_gate is not None and tensor.ndim == 2 * len(gate_qubits):
+            tensor, diagonal = reduce_gate(tensor)
         operands.append(tensor)
         input_mode_labels = []
         output_mode_labels = []
-        for q in gate_qubits:
+        for q, is_diagonal in zip(gate_qubits, diagonal):
+            if is_diagonal:
+                output_mode_labels.append(qubits_frontier[q])
+                continue
             input_mode_labels.append(qubits_frontier[q])
             output_mode_labels.append(next_frontier)
             qubits_frontier[q] = next_frontier
             next_frontier += 1
         mode_labels.append(output_mode_labels+input_mode_labels)
     return mode_labels, operands
+
+def reduce_gate_tensor(tensor, backend=cp):
+    """
+    Detect the qubits a gate is diagonal on (for example, all the qubits of a diagonal gate such as CZ or RZ, and the control
+    qubits of a controlled gate), and drop the corresponding input modes from the gate tensor.
+
+    Args:
+        tensor: A gate tensor with modes ordered as ``AB...ab...`` (output modes first).
+        backend: The package the tensor belongs to.
+
+    Returns:
+        A 2-tuple of the reduced tensor, with the modes of all the qubits followed by the input modes of the qubits the gate
+        is not diagonal on, and a tuple of booleans indicating the qubits the gate is diagonal on.
+    """
+    n = tensor.ndim // 2
+    host = tensor_wrapper.wrap_operand(tensor)
+    host = np.asarray(host.tensor if host.device_id is None else host.to('cpu'))
+    diagonal = []
+    for q in range(n):
+        entries = np.moveaxis(host, (q, n+q), (0, 1))
+        diagonal.append(not (entries[0, 1].any() or entries[1, 0].any()))
+    diagonal = tuple(diagonal)
+    if not any(diagonal):
+        return tensor, diagonal
+
+    output_symbols = [_get_symbol(q) for q in range(n)]
+    input_symbols = [output_symbols[q] if diagonal[q] else _get_symbol(n+q) for q in range(n)]
+    reduced_symbols = output_symbols + [s for s, d in zip(input_symbols, diagonal) if not d]
+    expression = ''.join(output_symbols + input_symbols) + '->' + ''.join(reduced_symbols)
+    return backend.einsum(expression, tensor), diagonal
+
+def get_inverse_gate_tensor(tensor, backend=cp):
+    """
+    Return the tensor of the inverse gate (the conjugate transpose), given a gate tensor with modes ordered as
+    ``AB...ab...`` (output modes first).
+    """
+    n = tensor.ndim // 2
+    axes = tuple(range(n, 2*n)) + tuple(range(n))
+    if backend.__name__ == 'torch':
+        return tensor.permute(axes).conj().resolve_conj()
+    return tensor.transpose(axes).conj()
+
+class LightconeIndex:
+    """
+    A gate dependency index for answering unitary reverse lightcone queries on a gate sequence.
+
+    Each gate is linked to the previous gate acting on each of its qubits, so that the gates in the lightcone of a set of
+    qubits are those reachable backwards from the last gates acting on these qubits.
+    """
+    def __init__(self, gates, maxsize=128):
+        self.gates = gates
+        self.predecessors = []
+        self.last_gate = dict()
+        for i, (_, gate_qubits) in enumerate(gates):
+            self.predecessors.append([self.last_gate[q] for q in gate_qubits if q in self.last_gate])
+            for q in gate_qubits:
+                self.last_gate[q] = i
+        self._query = functools.lru_cache(maxsize=maxsize)(self._reachable)
+
+    def _reachable(self, coned_qubits):
+        visited = set(self.last_gate[q] for q in coned_qubits if q in self.last_gate)
+        stack = list(visited)
+        while stack:
+            for j in self.predecessors[stack.pop()]:
+                if j not in visited:
+                    visited.add(j)
+                    stack.append(j)
+        return tuple(sorted(visited))
+
+    def get_lightcone_gates(self, coned_qubits):
+        """
+        Return the gates in the lightcone of the coned qubits, in their original order.
+        """
+        return [self.gates[i] for i in self._query(frozenset(coned_qubits))]
+
+@dataclasses.dataclass
+class GateFusionStats:
+    """
+    Statistics of the gate fusion pre-pass.
+
+    Attributes:
+        max_qubits: The largest number of qubits of a fused gate.
+        num_gates: The number of gates before fusion.
+        num_fused_gates: The number of gates after fusion.
+        num_tensors_removed: The number of gate tensors removed from the networks by fusion.
+    """
+    max_qubits: int
+    num_gates: int
+    num_fused_gates: int
+    num_tensors_removed: int
+
+def _fuse_block_tensor(qubits, block_gates, dtype, backend, identities):
+    """
+    Contract the gates of a block into a single gate tensor acting on the block qubits.
+    """
+    k = len(qubits)
+    if k not in identities:
+        asarray = _get_backend_asarray_func(backend)
+        identities[k] = asarray(np.eye(2**k).reshape((2,)*2*k), dtype=dtype)
+    tensor = identities[k]
+    position = {q: i for i, q in enumerate(qubits)}
+    tensor_symbols = ''.join(map(_get_symbol, range(2*k)))
+    for gate_tensor, gate_qubits in block_gates:
+        # apply the gate to the output modes of the block tensor
+        positions = [position[q] for q in gate_qubits]
+        new_modes = list(range(2*k, 2*k+len(positions)))
+        output_modes = list(range(2*k))
+        for p, m in zip(positions, new_modes):
+            output_modes[p] = m
+        expression = (''.join(map(_get_symbol, new_modes + positions)) + ',' + tensor_symbols + '->' +
+                      ''.join(map(_get_symbol, output_modes)))
+        tensor = backend.einsum(expression, gate_tensor, tensor)
+    return tensor
+
+def fuse_gates(gates, max_qubits, dtype='complex128', backend=cp, exclude=()):
+    """
+    Fuse consecutive gates into gates acting on at most ``max_qubits`` qubits, to reduce the number of tensors in the networks.
+
+    The gates are processed in order, and each gate is merged with the fused gates that last acted on its qubits, provided
+    that no other gate has acted on their qubits since and that the merged gate does not exceed ``max_qubits`` qubits. This
+    absorbs runs of single-qubit gates into their neighbors and merges the gates acting on the same qubits.
+
+    Args:
+        gates: A sequence of gates as 2-tuples (``tensor``, ``qubits``).
+        max_qubits: The largest number of qubits of a fused gate.
+        dtype: Data type for the tensor operands.
+        backend: The package the tensor operands belong to.
+        exclude: The ids of the gate tensors that must not be fused. These gates are kept as they are and act as barriers on
+            their qubits.
+
+    Returns:
+        A 2-tuple of the sequence of fused gates and a :class:`GateFusionStats` object. Gates that are not merged with any
+        other gate keep their original tensors.
+    """
+    if max_qubits < 1:
+        raise ValueError(f'the largest number of qubits of a fused gate must be positive, got {max_qubits}')
+
+    blocks = dict() # block ID -> [qubits, gates, time of the last update]
+    last_block = dict() # qubit -> ID of the block that last acted on it
+    sealed = set() # IDs of the blocks of excluded gates
+    for time, (tensor, gate_qubits) in enumerate(gates):
+        qubits = list(gate_qubits)
+        block_gates = []
+        if id(tensor) in exclude:
+            sealed.add(time)
+        elif len(qubits) <= max_qubits:
+            candidates = sorted(set(last_block[q] for q in gate_qubits if q in last_block), key=lambda b: len(blocks[b][0]))
+            for b in candidates:
+                b_qubits, b_gates, _ = blocks[b]
+                # a block can only be extended if no other gate acted on its qubits since
+                if b in sealed or any(last_block[q] != b for q in b_qubits):
+                    continue
+                merged_qubits = b_qubits + [q for q in qubits if q not in b_qubits]
+                if len(merged_qubits) <= max_qubits:
+                    qubits = merged_qubits
+                    block_gates += b_gates
+                    del blocks[b]
+        block_gates.append((tensor, gate_qubits))
+        blocks[time] = [qubits, block_gates, time]
+        for q in qubits:
+            last_block[q] = time
+
+    identities = dict()
+    fused_gates = []
+    for qubits, block_gates, _ in sorted(blocks.values(), key=lambda block: block[2]):
+        if len(block_gates) == 1:
+            fused_gates.append(block_gates[0])
+        else:
+            fused_gates.append((_fuse_block_tensor(qubits, block_gates, dtype, backend, identities), tuple(qubits)))
+
+    stats = GateFusionStats(max_qubits, len(gates), len(fused_gates), len(gates) - len(fused_gates))
+    return fused_gates, stats
@@ -4,10 +4,10 @@
 
 from types import MappingProxyType
 
-from cirq import protocols, unitary, Circuit, MeasurementGate, Moment
+from cirq import protocols, unitary, MeasurementGate, Moment
 import cupy as cp
 
-from .tensor_wrapper import _get_backend_asarray_func
+from .gate_tensors import create_gate_tensors
 
 def remove_measurements(circuit):
     """
@@ -23,57 +23,60 @@ def remove_measurements(circuit):
             circuit.batch_remove(measurement_gates)
     return circuit
 
-def get_inverse_circuit(circuit):
+def get_circuit_parameters(circuit):
     """
-    Return a circuit with all gate operations inversed
+    Return the unbound parameters (symbols) of the circuit.
     """
-    return protocols.inverse(circuit)
+    return tuple(sorted(protocols.parameter_symbols(circuit), key=str))
 
-def unfold_circuit(circuit, dtype='complex128', backend=cp):
+def get_gate_key(operation):
+    """
+    Return a hashable key identifying the matrix of the operation by its gate, or None if the operation can only be
+    identified by its matrix.
+    """
+    gate = getattr(operation, 'gate', None)
+    if gate is None:
+        return None
+    try:
+        hash(gate)
+    except TypeError:
+        return None
+    return gate, len(operation.qubits)
+
+def unfold_circuit(circuit, dtype='complex128', backend=cp, gate_cache=None, param_values=None, parametric_gates=None):
     """
     Unfold the circuit to obtain the qubits and all gate tensors.
 
     Args:
-        circuit: A :class:`cirq.Circuit` object. All parameters in the circuit must be resolved.
+        circuit: A :class:`cirq.Circuit` object. All parameters in the circuit must be resolved, unless their values are
+            provided in ``param_values``.
         dtype: Data type for the tensor operands.
         backend: The package the tensor operands belong to.
+        gate_cache: An optional dictionary of interned gate tensors to reuse and update (see :func:`create_gate_tensors`).
+        param_values: An optional mapping from the unbound parameters (symbols) to their values. The mapping is referenced (not
+            copied) by the functions recorded in ``parametric_gates``.
+        parametric_gates: An optional dictionary to be updated with the gates depending on unbound parameters, mapping their
+            keys in ``gate_cache`` to 2-tuples of a function computing the matrix for the current ``param_values`` and the
+            set of parameters the gate depends on.
 
     Returns:
         All qubits and gate operations from the input circuit
     """
     qubits = sorted(circuit.all_qubits())
-    asarray = _get_backend_asarray_func(backend)
-    gates = []
+    gate_specs = []
     for moment in circuit.moments:
         for operation in moment:
-            gate_qubits = operation.qubits
-            tensor = unitary(operation).reshape((2,) * 2 * len(gate_qubits))
-            tensor = asarray(tensor, dtype=dtype)
-            gates.append((tensor, operation.qubits))
+            if protocols.is_parameterized(operation):
+                if param_values is None:
+                    raise ValueError(f'the values of the parameters of the operation {operation} must be provided')
+                key = get_gate_key(operation)
+                key = ('parametric',) + (key if key is not None else (id(operation),))
+                get_matrix = lambda operation=operation: unitary(protocols.resolve_parameters(operation, param_values))
+                if parametric_gates is not None:
+                    parametric_gates[key] = get_matrix, frozenset(protocols.parameter_symbols(operation))
+            else:
+                key = get_gate_key(operation)
+                get_matrix = lambda operation=operation: unitary(operation)
+            gate_specs.append((key, get_matrix, operation.qubits))
+    gates = create_gate_tensors(gate_specs, dtype, backend, cache=gate_cache)
     return qubits, gates
-
-def get_lightcone_circuit(circuit, coned_qubits):
-    """
-    Use unitary reversed lightcone cancellation technique to reduce the effective circuit size based on the qubits to be coned. 
-
-    Args:
-        circuit: A :class:`cirq.Circuit` object. 
-        coned_qubits: An iterable of qubits to be coned.
-
-    Returns:
-        A :class:`cirq.Circuit` object that potentially contains less number of gates
-    """
-    coned_qubits = set(coned_qubits)
-    all_operations = list(circuit.all_operations())
-    n_qubits = len(circuit.all_qubits())
-    ix = len(all_operations)
-    tail_operations = []
-    while len(coned_qubits) != n_qubits and ix>0:
-        ix -= 1
-        operation = all_operations[ix]
-        qubit_set = set(operation.qubits)
-        if qubit_set & coned_qubits:
-            tail_operations.append(operation)
-            coned_qubits |= qubit_set
-    newqc = Circuit(all_operations[:ix]+tail_operations[::-1])
-    return newqc
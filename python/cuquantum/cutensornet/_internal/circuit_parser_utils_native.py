@@ -0,0 +1,151 @@
+# Copyright (c) 2023, NVIDIA CORPORATION & AFFILIATES
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import cupy as cp
+import numpy as np
+
+from .gate_tensors import create_gate_tensors
+from ..native_circuit import GATE_SPECS, UNITARY
+
+_I = np.eye(2, dtype=np.complex128)
+_X = np.array([[0, 1], [1, 0]], dtype=np.complex128)
+_Y = np.array([[0, -1j], [1j, 0]], dtype=np.complex128)
+_Z = np.array([[1, 0], [0, -1]], dtype=np.complex128)
+_SWAP = np.eye(4, dtype=np.complex128)[[0, 2, 1, 3]]
+
+def _diagonal(*entries):
+    """
+    Return the batch of diagonal matrices with the specified (broadcast) diagonal entries.
+    """
+    entries = np.broadcast_arrays(*entries)
+    matrices = np.zeros(entries[0].shape + (len(entries),) * 2, dtype=np.complex128)
+    for k, entry in enumerate(entries):
+        matrices[..., k, k] = entry
+    return matrices
+
+def _controlled(u):
+    """
+    Return the controlled version of the (batch of) matrices, with the control qubit as the most significant one.
+    """
+    d = u.shape[-1]
+    matrices = np.zeros(u.shape[:-2] + (2*d, 2*d), dtype=np.complex128)
+    matrices[..., :d, :d] = np.eye(d)
+    matrices[..., d:, d:] = u
+    return matrices
+
+def _rotation(generator, theta):
+    """
+    Return the batch of rotation matrices :math:`\\exp(-i \\theta G / 2)` for a Pauli string ``G``.
+    """
+    theta = theta[:, None, None]
+    return np.cos(theta / 2) * np.eye(generator.shape[-1]) - 1j * np.sin(theta / 2) * generator
+
+def _u(params):
+    theta, phi, lam = (params[:, k] for k in range(3))
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    matrices = np.empty((len(params), 2, 2), dtype=np.complex128)
+    matrices[:, 0, 0] = c
+    matrices[:, 0, 1] = -np.exp(1j * lam) * s
+    matrices[:, 1, 0] = np.exp(1j * phi) * s
+    matrices[:, 1, 1] = np.exp(1j * (phi + lam)) * c
+    return matrices
+
+_FIXED_MATRICES = {
+    'i': _I, 'x': _X, 'y': _Y, 'z': _Z,
+    'h': np.array([[1, 1], [1, -1]], dtype=np.complex128) / np.sqrt(2),
+    's': _diagonal(1, 1j), 'sdg': _diagonal(1, -1j),
+    't': _diagonal(1, np.exp(1j * np.pi / 4)), 'tdg': _diagonal(1, np.exp(-1j * np.pi / 4)),
+    'sx': np.array([[1+1j, 1-1j], [1-1j, 1+1j]]) / 2, 'sxdg': np.array([[1-1j, 1+1j], [1+1j, 1-1j]]) / 2,
+    'cx': _controlled(_X), 'cy': _controlled(_Y), 'cz': _controlled(_Z), 'swap': _SWAP,
+    'ccx': _controlled(_controlled(_X)), 'cswap': _controlled(_SWAP),
+}
+
+# Functions computing the batch of matrices of a parametric gate from the (M, 3) array of parameters.
+_PARAMETRIC_MATRICES = {
+    'rx': lambda p: _rotation(_X, p[:, 0]),
+    'ry': lambda p: _rotation(_Y, p[:, 0]),
+    'rz': lambda p: _rotation(_Z, p[:, 0]),
+    'p': lambda p: _diagonal(1, np.exp(1j * p[:, 0])),
+    'u': _u,
+    'crx': lambda p: _controlled(_rotation(_X, p[:, 0])),
+    'cry': lambda p: _controlled(_rotation(_Y, p[:, 0])),
+    'crz': lambda p: _controlled(_rotation(_Z, p[:, 0])),
+    'cp': lambda p: _diagonal(1, 1, 1, np.exp(1j * p[:, 0])),
+    'rxx': lambda p: _rotation(np.kron(_X, _X), p[:, 0]),
+    'ryy': lambda p: _rotation(np.kron(_Y, _Y), p[:, 0]),
+    'rzz': lambda p: _rotation(np.kron(_Z, _Z), p[:, 0]),
+}
+
+def get_gate_matrices(opcodes, params, unitaries):
+    """
+    Compute the matrices of the gates, vectorized over the gates of the same type.
+
+    Args:
+        opcodes: An integer array of shape (M,) holding the opcodes of the gates.
+        params: A real array of shape (M, 3) holding the parameters of the gates.
+        unitaries: The unitary matrices used by the ``unitary`` gates.
+
+    Returns:
+        A list of M matrices as :class:`numpy.ndarray`.
+    """
+    matrices = [None] * len(opcodes)
+    for opcode in np.unique(opcodes).tolist():
+        indices = np.flatnonzero(opcodes == opcode)
+        name = GATE_SPECS[opcode][0]
+        if opcode == UNITARY:
+            batch = [unitaries[int(i)] for i in params[indices, 0]]
+        elif name in _FIXED_MATRICES:
+            batch = [_FIXED_MATRICES[name]] * len(indices)
+        else:
+            batch = _PARAMETRIC_MATRICES[name](params[indices])
+        for i, matrix in zip(indices.tolist(), batch):
+            matrices[i] = matrix
+    return matrices
+
+def remove_measurements(circuit):
+    """
+    Return the circuit, as a :class:`NativeCircuit` does not contain measurement operations.
+    """
+    return circuit
+
+def get_circuit_parameters(circuit):
+    """
+    Return the unbound parameters of the circuit, which are always bound in a :class:`NativeCircuit`.
+    """
+    return ()
+
+def unfold_circuit(circuit, dtype='complex128', backend=cp, gate_cache=None):
+    """
+    Unfold the circuit to obtain the qubits and all gate tensors. The matrices are computed once for each distinct gate
+    (opcode and parameters), vectorized over the gates of the same type.
+
+    Args:
+        circuit: A :class:`NativeCircuit` object.
+        dtype: Data type for the tensor operands.
+        backend: The package the tensor operands belong to.
+        gate_cache: An optional dictionary of interned gate tensors to reuse and update (see :func:`create_gate_tensors`).
+
+    Returns:
+        All qubits and gate operations from the input circuit
+    """
+    qubits = list(range(circuit.num_qubits))
+    if len(circuit) == 0:
+        return qubits, []
+
+    rows = np.column_stack((circuit.opcodes, circuit.params))
+    unique_rows, inverse = np.unique(rows, axis=0, return_inverse=True)
+    unique_opcodes, unique_params = unique_rows[:, 0].astype(np.int64), unique_rows[:, 1:]
+    matrices = get_gate_matrices(unique_opcodes, unique_params, circuit.unitaries)
+
+    gate_specs = []
+    for opcode, params, matrix in zip(unique_opcodes.tolist(), unique_params.tolist(), matrices):
+        # unitary gates are identified by their matrices, as the indices are specific to the circuit
+        key = None if opcode == UNITARY else ('native', opcode, tuple(params))
+        gate_specs.append((key, lambda matrix=matrix: matrix, None))
+    tensors = [tensor for tensor, _ in create_gate_tensors(gate_specs, dtype, backend, cache=gate_cache)]
+
+    gates = []
+    for index, gate_qubits, arity in zip(inverse.reshape(-1).tolist(), circuit.qubits.tolist(), circuit.num_gate_qubits.tolist()):
+        gates.append((tensors[index], tuple(gate_qubits[:arity])))
+    return qubits, gates
@@ -4,10 +4,10 @@
 
 import cupy as cp
 from qiskit import QuantumCircuit
-from qiskit.circuit import Barrier, ControlledGate, Delay, Gate, Measure
+from qiskit.circuit import Barrier, ControlledGate, Delay, Gate, Measure, ParameterExpression
 from qiskit.extensions import UnitaryGate
 
-from .tensor_wrapper import _get_backend_asarray_func
+from .gate_tensors import create_gate_tensors
 
 def remove_measurements(circuit):
     """
@@ -20,11 +20,11 @@ def remove_measurements(circuit):
             raise ValueError('mid-circuit measurement not supported in tensor network simulation')
     return circuit
 
-def get_inverse_circuit(circuit):
+def get_circuit_parameters(circuit):
     """
-    Return a circuit with all gate operations inversed.
+    Return the unbound parameters of the circuit.
     """
-    return circuit.inverse()
+    return tuple(circuit.parameters)
 
 def get_decomposed_gates(circuit, qubit_map=None, gates=None, gate_process_func=None):
     """
@@ -55,58 +55,82 @@ def get_decomposed_gates(circuit, qubit_map=None, gates=None, gate_process_func=
         gates = get_decomposed_gates(operation.definition, qubit_map=next_qubit_map, gates=gates, gate_process_func=gate_process_func)
     return gates
 
-def unfold_circuit(circuit, dtype='complex128', backend=cp):
+def get_gate_key(operation):
+    """
+    Return a hashable key identifying the matrix of a standard gate by its type and parameters, or None if the gate
+    can only be identified by its matrix.
+    """
+    if isinstance(operation, UnitaryGate):
+        return None
+    try:
+        params = tuple(complex(p) for p in operation.params)
+    except TypeError:
+        return None
+    return type(operation).__name__, operation.num_qubits, params, getattr(operation, 'ctrl_state', None)
+
+def get_operation_parameters(operation):
+    """
+    Return the set of unbound parameters the operation depends on.
+    """
+    parameters = set()
+    for p in operation.params:
+        if isinstance(p, ParameterExpression):
+            parameters |= p.parameters
+    return frozenset(parameters)
+
+def bind_operation(operation, param_values):
+    """
+    Return a copy of the operation with all the parameters bound to the values in the ``param_values`` mapping.
+    """
+    operation = operation.copy()
+    params = []
+    for p in operation.params:
+        if isinstance(p, ParameterExpression):
+            p = complex(p.bind({q: param_values[q] for q in p.parameters}))
+            p = p.real if p.imag == 0 else p
+        params.append(p)
+    operation.params = params
+    return operation
+
+def unfold_circuit(circuit, dtype='complex128', backend=cp, gate_cache=None, param_values=None, parametric_gates=None):
     """
     Unfold the circuit to obtain the qubits and all gate tensors. All :class:`qiskit.circuit.Gate` and 
     :class:`qiskit.circuit.Instruction` in the circuit will be decomposed into either standard gates or customized unitary gates.
     Barrier and delay operations will be discarded.
 
     Args:
-        circuit: A :class:`qiskit.QuantumCircuit` object. All parameters in the circuit must be binded.
+        circuit: A :class:`qiskit.QuantumCircuit` object. All parameters in the circuit must be binded, unless their values are
+            provided in ``param_values``.
         dtype: Data type for the tensor operands.
         backend: The package the tensor operands belong to.
+        gate_cache: An optional dictionary of interned gate tensors to reuse and update (see :func:`create_gate_tensors`).
+        param_values: An optional mapping from the unbound parameters to their values. The mapping is referenced (not copied)
+            by the functions recorded in ``parametric_gates``.
+        parametric_gates: An optional dictionary to be updated with the gates depending on unbound parameters, mapping their
+            keys in ``gate_cache`` to 2-tuples of a function computing the matrix for the current ``param_values`` and the
+            set of parameters the gate depends on.
 
     Returns:
         All qubits and gate operations from the input circuit
     """
-    asarray = _get_backend_asarray_func(backend)
     qubits = circuit.qubits
     
     def gate_process_func(operation, gate_qubits):
-        tensor = operation.to_matrix().reshape((2,2)*len(gate_qubits))
-        tensor = asarray(tensor, dtype=dtype)
         if isinstance(operation, ControlledGate):
             # in qiskit notation, qubit at high index is the target qubit
             gate_qubits = gate_qubits[::-1]
-        return tensor, gate_qubits
+        if operation.is_parameterized():
+            if param_values is None:
+                raise ValueError(f'the values of the parameters of the operation {operation.name} must be provided')
+            key = ('parametric', type(operation).__name__, operation.num_qubits, tuple(map(str, operation.params)), 
+                   getattr(operation, 'ctrl_state', None))
+            get_matrix = lambda operation=operation: bind_operation(operation, param_values).to_matrix()
+            if parametric_gates is not None:
+                parametric_gates[key] = get_matrix, get_operation_parameters(operation)
+            return key, get_matrix, gate_qubits
+        return get_gate_key(operation), operation.to_matrix, gate_qubits
     
-    gates = get_decomposed_gates(circuit, gate_process_func=gate_process_func)
+    gate_specs = get_decomposed_gates(circuit, gate_process_func=gate_process_func)
+    gates = create_gate_tensors(gate_specs, dtype, backend, cache=gate_cache)
 
     return qubits, gates
-
-def get_lightcone_circuit(circuit, coned_qubits):
-    """
-    Use unitary reversed lightcone cancellation technique to reduce the effective circuit size based on the qubits to be coned. 
-
-    Args:
-        circuit: A :class:`qiskit.QuantumCircuit` object. 
-        coned_qubits: An iterable of qubits to be coned.
-
-    Returns:
-        A :class:`qiskit.QuantumCircuit` object that potentially contains less number of gates
-    """
-    coned_qubits = set(coned_qubits)
-    gates = get_decomposed_gates(circuit)
-    newqc = QuantumCircuit(circuit.qubits)
-    ix = len(gates)
-    tail_operations = []
-    while len(coned_qubits) != circuit.num_qubits and ix>0:
-        ix -= 1
-        operation, gate_qubits = gates[ix]
-        qubit_set = set(gate_qubits)
-        if qubit_set & coned_qubits:
-            tail_operations.append([operation, gate_qubits])
-            coned_qubits |= qubit_set
-    for operation, gate_qubits in gates[:ix] + tail_operations[::-1]:
-        newqc.append(operation, gate_qubits)
-    return newqc
@@ -0,0 +1,146 @@
+# Copyright (c) 2023, NVIDIA CORPORATION & AFFILIATES
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+A host-side cost model for ranking many candidate contraction paths of a network at once.
+"""
+
+__all__ = ['PathCosts', 'evaluate_paths', 'evaluate_einsum_paths']
+
+import dataclasses
+
+import numpy as np
+
+from . import einsum_parser
+from . import path_utils
+
+
+@dataclasses.dataclass
+class PathCosts:
+    """
+    The costs of P candidate paths for a network of N operands. All attributes except ``num_slices`` are NumPy arrays
+    indexed by the candidate path.
+
+    Attributes:
+        num_slices: The number of slices, shared by all paths.
+        flop_count: The FLOP count of the contraction over all the slices, counting one multiplication and one addition for
+            each term of each pairwise contraction, of shape (P,).
+        unsliced_flop_count: The FLOP count of the contraction without slicing, of shape (P,).
+        slicing_overhead: The ratio of ``flop_count`` to ``unsliced_flop_count``, of shape (P,).
+        intermediate_sizes: The number of elements of the intermediate tensor created at each step of a slice, of shape
+            (P, N-1).
+        largest_intermediate: The number of elements of the largest intermediate tensor of a slice, of shape (P,).
+        peak_memory: The largest total size in bytes of the tensors alive at the same time while contracting a slice, operands
+            included, of shape (P,).
+    """
+    num_slices: int
+    flop_count: np.ndarray
+    unsliced_flop_count: np.ndarray
+    slicing_overhead: np.ndarray
+    intermediate_sizes: np.ndarray
+    largest_intermediate: np.ndarray
+    peak_memory: np.ndarray
+
+
+def evaluate_paths(inputs, output, size_dict, paths, slices=(), itemsize=8):
+    """
+    Evaluate the cost of contracting the network along each of the candidate paths.
+
+    Args:
+        inputs: The input modes of the network as a sequence of sequences of mode ordinals, as returned by
+            :func:`einsum_parser.parse_einsum`.
+        output: The output modes of the network as a sequence of mode ordinals.
+        size_dict: A map from mode ordinals to the extents.
+        paths: A sequence of P contraction paths in the :func:`numpy.einsum_path` format.
+        slices: The sliced modes as a sequence of ``(mode ordinal, sliced extent)`` pairs as in
+            :attr:`~cuquantum.OptimizerInfo.slices`, applied to all the paths. A mode of extent ``e`` with the sliced extent ``s``
+            is split into ``ceil(e / s)`` slices (``e // s`` for the slicing found by the library).
+        itemsize: The size in bytes of an element of the tensors.
+
+    Returns:
+        PathCosts: The costs of the paths.
+
+    Note:
+        The paths are evaluated together, one contraction step at a time, by tracking the modes of all the tensors of all the
+        paths as boolean masks. The memory required is therefore proportional to P times N times the number of modes.
+    """
+    num_operands, num_paths = len(inputs), len(paths)
+    num_steps = num_operands - 1
+    modes = sorted(size_dict)
+    index = {m: i for i, m in enumerate(modes)}
+
+    for p, path in enumerate(paths):
+        if len(path) != num_steps:
+            raise ValueError(f"The path {p} has {len(path)} contractions, while {num_steps} are required for {num_operands} operands.")
+
+    extents = np.array([size_dict[m] for m in modes], dtype=np.float64)
+    sliced = dict(slices)
+    sliced_extents = np.array([min(sliced.get(m, size_dict[m]), size_dict[m]) for m in modes], dtype=np.float64)
+    num_slices = int(np.prod([-(-size_dict[m] // e) for m, e in sliced.items()], dtype=np.int64))
+
+    # The masks of the modes of the operands (slots 0, ..., N-1) and the intermediates (slots N, ..., 2N-2) in SSA form.
+    masks = np.zeros((num_paths, num_operands + num_steps, len(modes)), dtype=bool)
+    for t, _input in enumerate(inputs):
+        masks[:, t, [index[m] for m in _input]] = True
+    output_mask = np.zeros(len(modes), dtype=bool)
+    output_mask[[index[m] for m in output]] = True
+
+    ssa_paths = np.array([path_utils.linear_to_ssa(path, num_operands) for path in paths], dtype=np.intp)
+    ssa_paths = ssa_paths.reshape(num_paths, num_steps, 2)
+
+    # The number of live tensors each mode appears in.
+    counts = masks[:, :num_operands].sum(axis=1)
+
+    sizes = np.zeros((num_paths, num_operands + num_steps))
+    # The operand sizes are computed from the modes rather than the masks, since a mode can be repeated in an operand.
+    sizes[:, :num_operands] = [np.prod([sliced_extents[index[m]] for m in _input]) for _input in inputs]
+    live = sizes[:, :num_operands].sum(axis=1)
+    peak = live.copy()
+
+    flop_count = np.zeros(num_paths)
+    unsliced_flop_count = np.zeros(num_paths)
+    rows = np.arange(num_paths)
+    for k in range(num_steps):
+        a, b = ssa_paths[:, k, 0], ssa_paths[:, k, 1]
+        mask_a, mask_b = masks[rows, a], masks[rows, b]
+        union = mask_a | mask_b
+        counts -= mask_a
+        counts -= mask_b
+
+        # The intermediate keeps the modes still needed by other tensors or the output.
+        new = union & ((counts > 0) | output_mask)
+        counts += new
+        masks[:, num_operands + k] = new
+
+        unsliced_flop_count += 2 * np.prod(np.where(union, extents, 1.), axis=-1)
+        flop_count += 2 * np.prod(np.where(union, sliced_extents, 1.), axis=-1)
+
+        size = np.prod(np.where(new, sliced_extents, 1.), axis=-1)
+        sizes[:, num_operands + k] = size
+        live += size
+        np.maximum(peak, live, out=peak)
+        live -= sizes[rows, a] + sizes[rows, b]
+
+    flop_count *= num_slices
+    intermediate_sizes = sizes[:, num_operands:]
+    largest_intermediate = intermediate_sizes.max(axis=1) if num_steps > 0 else np.zeros(num_paths)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slicing_overhead = np.where(unsliced_flop_count > 0, flop_count / unsliced_flop_count, 1.)
+
+    return PathCosts(num_slices, flop_count, unsliced_flop_count, slicing_overhead, intermediate_sizes,
+                     largest_intermediate, peak * itemsize)
+
+
+def evaluate_einsum_paths(*operands, paths, slices=()):
+    """
+    evaluate_einsum_paths(subscripts, *operands, paths, slices=())
+
+    Evaluate the cost of the candidate paths for the network specified in the subscript or interleaved format (see
+    :class:`~cuquantum.Network`) using :func:`evaluate_paths`. The sliced modes are specified with the user's mode labels, for
+    example as in :attr:`~cuquantum.OptimizerInfo.slices`. Only the shapes and the data type of the operands are used.
+    """
+    operands, inputs, output, size_dict, mode_map_user_to_ord, _, _ = einsum_parser.parse_einsum(*operands)
+    itemsize = np.dtype(operands[0].dtype).itemsize
+    slices = [(mode_map_user_to_ord[m], e) for m, e in slices]
+    return evaluate_paths(inputs, output, size_dict, paths, slices, itemsize=itemsize)
@@ -8,6 +8,7 @@ A collection of utility functions for decomposition.
 
 import logging
 
+import cupy as cp
 import numpy
 
 from . import einsum_parser
@@ -18,6 +19,12 @@ from . import utils
 from .. import cutensornet as cutn
 from .. import memory
 
+# Optional modules
+try:
+    import torch
+except ImportError:
+    torch = None
+
 
 DECOMPOSITION_DTYPE_NAMES = ('float32', 'float64', 'complex64', 'complex128')
 
@@ -390,3 +397,400 @@ def get_return_operand_data(tensor, target_location):
         return tensor.to('cpu')
     else: # already on device
         return tensor.tensor
+
+
+class InvalidDecompositionState(Exception):
+    pass
+
+
+class Workspace:
+    """
+    A device scratch workspace that grows to the largest size requested so far, so that it can be shared by several
+    decomposition objects on the same device. Each operation using the workspace is ordered after the previous one.
+    """
+    def __init__(self, allocator, device_id, logger):
+        self.allocator = allocator
+        self.device_id = device_id
+        self.logger = logger
+        self.ptr = None
+        self.size = 0
+        # The number of objects sharing the workspace.
+        self.users = 0
+
+        # Attributes to establish stream ordering.
+        self.stream = None
+        self.last_compute_event = None
+
+    def acquire(self, size, stream, stream_ctx, task_name=''):
+        """
+        Return the device pointer of the workspace, growing it to ``size`` bytes if needed.
+        """
+        # The workspace may still be in use by the previous operation.
+        if self.last_compute_event is not None:
+            stream.wait_event(self.last_compute_event)
+
+        if self.ptr is None or size > self.size:
+            self.release()
+            with utils.device_ctx(self.device_id), stream_ctx:
+                try:
+                    self.logger.debug(f"Allocating memory for {task_name}")
+                    self.ptr = self.allocator.memalloc(size)
+                except TypeError as e:
+                    message = "The method 'memalloc' in the allocator object must conform to the interface in the "\
+                            "'BaseCUDAMemoryManager' protocol."
+                    raise TypeError(message) from e
+            self.size = size
+            self.stream = stream
+            self.logger.debug(f"Finished allocating memory of size {formatters.MemoryStr(size)} for decomposition in the context of stream {stream}.")
+
+        return utils.get_ptr_from_memory_pointer(self.ptr)
+
+    def release(self):
+        """
+        Release the workspace memory.
+        """
+        if self.ptr is None:
+            return
+
+        # Future operations on the workspace stream should be ordered after the computation.
+        if self.last_compute_event is not None:
+            self.stream.wait_event(self.last_compute_event)
+        self.ptr = None
+        self.size = 0
+
+
+class DecompositionResources:
+    """
+    The tensor descriptors, SVD objects, workspace and output tensors shared by the stateful decomposition objects
+    (:class:`~cuquantum.cutensornet.tensor.Decomposer` and :class:`~cuquantum.cutensornet.experimental.GateSplitter`).
+
+    Subclasses parse the operands and options, call :meth:`_create_workspace` and :meth:`_create_operands_and_descriptors`,
+    compute the workspace sizes for their kernel and call :meth:`_query_workspace_size`. The name of the object used in the messages is given by
+    ``resource_name``.
+    """
+    resource_name = 'decomposer'
+
+    def _init_resources(self):
+        """
+        Set the placeholders for the resources, to help avoid resource leak.
+        """
+        self.input_descriptors = self.output_descriptors = []
+        self.workspace_desc = self.svd_config = self.svd_info = None
+        self.workspace = self.workspace_size = self.workspace_device_ptr = None
+
+        # Attributes to establish stream ordering.
+        self.last_compute_event = None
+
+        self.valid_state = True
+
+    def _create_workspace(self, shared_with=None):
+        """
+        Create the workspace, or share the one of another object of this class.
+        """
+        if shared_with is None:
+            self.workspace = Workspace(self.options.allocator, self.device_id, self.logger)
+        else:
+            shared_with._check_valid_state()
+            if shared_with.device_id != self.device_id:
+                raise ValueError(f"The workspace can only be shared with an object on the same device ({self.device_id}), "
+                                 f"found {shared_with.device_id}.")
+            self.workspace = shared_with.workspace
+        self.workspace.users += 1
+
+    def _create_operands_and_descriptors(self, wrapped_operands, method):
+        """
+        Create the tensor descriptors and the output tensors, in the context of the current stream so that the first
+        operation is ordered after their creation.
+        """
+        stream, stream_ctx, _ = utils.get_or_create_stream(self.device_id, None, self.package)
+        self.input_descriptors, self.output_operands, self.output_descriptors, self.s, _ = create_operands_and_descriptors(self.handle,
+                    wrapped_operands, self.size_dict, self.inputs, self.outputs, self.mid_extent, method, self.device_id, stream_ctx, self.logger)
+        with utils.device_ctx(self.device_id):
+            self.output_event = stream.record()
+
+        # Keep the output extents and data types for creating new output tensors.
+        self.output_extents = tuple(o.shape for o in self.output_operands)
+        self.data_type = wrapped_operands[0].dtype
+        self.s_data_type = None if self.s is None else self.s.dtype
+        # The SVD truncation updates the output tensor descriptors, which need to be recreated before the next operation.
+        self.outputs_truncated = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.free()
+
+    def _check_valid_state(self, *args, **kwargs):
+        """
+        """
+        if not self.valid_state:
+            raise InvalidDecompositionState(f"The {self.resource_name} cannot be used after resources are free'd")
+
+    def _query_workspace_size(self):
+        """
+        Query the (minimal) workspace size computed in the workspace descriptor.
+        """
+        self.workspace_size = cutn.workspace_get_memory_size(self.handle, self.workspace_desc,
+                    cutn.WorksizePref.MIN, cutn.Memspace.DEVICE, cutn.WorkspaceKind.SCRATCH)
+        self.logger.debug(f"The workspace size required is {formatters.MemoryStr(self.workspace_size)}.")
+
+    def _free_workspace_memory(self, exception=None):
+        """
+        Forget the workspace memory set in the workspace descriptor, so that it is set again before the next operation.
+        """
+        self.workspace_device_ptr = None
+
+        return True
+
+    @utils.precondition(_check_valid_state)
+    @utils.atomic(_free_workspace_memory, method=True)
+    def _allocate_workspace_memory_perhaps(self, stream, stream_ctx):
+        """
+        Set the workspace memory in the workspace descriptor, unless it is already set. This is needed again only if the
+        workspace is shared and has been grown by another object since.
+        """
+        device_ptr = self.workspace.acquire(self.workspace_size, stream, stream_ctx, task_name=self.resource_name)
+        if device_ptr == self.workspace_device_ptr:
+            return
+
+        cutn.workspace_set_memory(self.handle, self.workspace_desc, cutn.Memspace.DEVICE, cutn.WorkspaceKind.SCRATCH, device_ptr, self.workspace_size)
+        self.workspace_device_ptr = device_ptr
+        self.logger.debug(f"The workspace memory (device pointer = {device_ptr}) has been set in the workspace descriptor.")
+
+    def _record_compute_event(self):
+        """
+        Order the next operation using the (possibly shared) workspace after the computation.
+        """
+        self.workspace.last_compute_event = self.last_compute_event
+
+    def _create_output_operands_perhaps(self, stream, stream_ctx):
+        """
+        Create new output tensors if the previous ones have been returned to the user.
+        """
+        if self.output_operands is None:
+            self.logger.debug("Beginning output tensors creation...")
+            with utils.device_ctx(self.device_id):
+                self.output_operands = [utils.create_empty_tensor(self.output_class, extents, self.data_type, self.device_id, stream_ctx)
+                                        for extents in self.output_extents]
+                if self.s_data_type is not None:
+                    self.s = utils.create_empty_tensor(self.output_class, (self.mid_extent, ), self.s_data_type, self.device_id, stream_ctx)
+            self.logger.debug("The output tensors have been created.")
+        elif self.output_event is not None:
+            stream.wait_event(self.output_event)
+            self.output_event = None
+            self.logger.debug("Established ordering with output tensors creation event.")
+
+    def _reset_operands(self, operands, new_operands):
+        """
+        Check the new (wrapped) operands against the ones held, and return the operands to hold from now on.
+        """
+        utils.check_operands_match(operands, new_operands, 'dtype', "data type")
+        utils.check_operands_match(operands, new_operands, 'shape', 'shape')
+
+        device_id = utils.get_network_device_id(new_operands)
+        location = 'cpu' if device_id is None else 'cuda'
+        if location != self.operands_location:
+            raise ValueError(f"The new operands must be on the same device as the original operands ({self.operands_location}).")
+
+        if device_id is None:
+            # Copy to existing device pointers because the new operands are on the CPU.
+            tensor_wrapper.copy_(new_operands, operands)
+            return operands
+
+        utils.check_operands_match(operands, new_operands, 'strides', 'strides')
+        package = utils.get_operands_package(new_operands)
+        if self.package != package:
+            message = f"Library package mismatch: '{self.package}' => '{package}'"
+            raise TypeError(message)
+
+        if self.device_id != device_id:
+            raise ValueError(f"The new operands must be on the same device ({device_id}) as the original operands "
+                             f"({self.device_id}).")
+        return new_operands
+
+    def _prepare_output_operands(self, output_operands, s):
+        """
+        (Re)create the output tensor descriptors for the specified (wrapped) full-size output tensors if they have been
+        updated by the SVD truncation, and return new wrappers for the outputs.
+        """
+        if self.outputs_truncated:
+            self.logger.debug("Recreating the output tensor descriptors...")
+            output_descriptors, self.output_descriptors = self.output_descriptors, []
+            _destroy_tensor_descriptors(output_descriptors)
+            for o, modes in zip(output_operands, self.outputs):
+                self.output_descriptors.append(o.create_tensor_descriptor(self.handle, modes))
+            self.outputs_truncated = False
+
+        # Wrap the outputs again, since the views of the truncated results should not replace the full outputs that are retained.
+        output_operands = [tensor_wrapper.wrap_operand(o.tensor) for o in output_operands]
+        s = None if s is None else tensor_wrapper.wrap_operand(s.tensor)
+        return output_operands, s
+
+    def _truncate_output_operands(self, output_operands, s, reduced_extent):
+        """
+        Update the (wrapped) outputs in place to the reduced extent of the SVD.
+        """
+        for (wrapped_tensor, tensor_desc) in zip(output_operands, self.output_descriptors):
+            wrapped_tensor.reshape_to_match_tensor_descriptor(self.handle, tensor_desc)
+        if reduced_extent != self.mid_extent:
+            self.outputs_truncated = True
+            if s is not None:
+                s.tensor = s.tensor[:reduced_extent]
+
+    def _return_output_operands(self, output_operands, s):
+        """
+        Return the results as the output tensors followed by S (None for QR or partitioned SVD).
+        """
+        results = [get_return_operand_data(o, self.operands_location) for o in output_operands + [s, ]]
+
+        # The device outputs are retained for CPU operands, and new ones are created for the next operation otherwise.
+        if self.operands_location != 'cpu':
+            self.output_operands = self.s = None
+
+        return results
+
+    def free(self):
+        """
+        Free the resources, see the subclasses' documentation.
+        """
+        if not self.valid_state:
+            return
+
+        try:
+            self._free_workspace_memory()
+            if self.workspace is not None:
+                self.workspace.users -= 1
+                if self.workspace.users == 0:
+                    self.workspace.release()
+                self.workspace = None
+
+            _destroy_tensor_descriptors(self.input_descriptors)
+            _destroy_tensor_descriptors(self.output_descriptors)
+            self.input_descriptors = self.output_descriptors = []
+
+            if self.svd_config is not None:
+                cutn.destroy_tensor_svd_config(self.svd_config)
+                self.svd_config = None
+
+            if self.svd_info is not None:
+                cutn.destroy_tensor_svd_info(self.svd_info)
+                self.svd_info = None
+
+            if self.workspace_desc is not None:
+                cutn.destroy_workspace_descriptor(self.workspace_desc)
+                self.workspace_desc = None
+
+            if self.handle is not None and self.own_handle:
+                cutn.destroy(self.handle)
+                self.handle = None
+                self.own_handle = False
+        except Exception as e:
+            self.logger.critical(f"Internal error: only part of the {self.resource_name} resources have been released.")
+            self.logger.critical(str(e))
+            raise e
+        finally:
+            self.valid_state = False
+
+        self.logger.info(f"The {self.resource_name} resources have been released.")
+
+
+def _randomized_svd_matrix(xp, a, svd_method, logger):
+    """
+    Compute the truncated SVD of matrix ``a`` using the array module ``xp`` (NumPy or CuPy) with a randomized range finder.
+    """
+    m, n = a.shape
+    full_extent = min(m, n)
+    num_vectors = min(svd_method.max_extent + svd_method.gesvdr_oversampling, full_extent)
+    logger.debug(f"Sampling the range of the {m}x{n} matrix with {num_vectors} random vectors and {svd_method.gesvdr_niters} power iterations...")
+
+    # A fixed seed keeps the decomposition of the same operand reproducible.
+    g = numpy.random.default_rng(0).standard_normal((n, num_vectors))
+    g = xp.asarray(g).astype(a.dtype, copy=False)
+    q, _ = xp.linalg.qr(a @ g)
+    for _ in range(svd_method.gesvdr_niters):
+        # Orthonormalize after each application of the operand to retain the accuracy of the small singular values.
+        q, _ = xp.linalg.qr(a.conj().T @ q)
+        q, _ = xp.linalg.qr(a @ q)
+
+    # Only the projection of the operand onto the sampled range is decomposed exactly.
+    u, s, v = xp.linalg.svd(q.conj().T @ a, full_matrices=False)
+    u = q @ u
+
+    # Truncation, following the semantics of the SVDConfig attributes.
+    s_host = s.get() if xp is not numpy else s
+    cutoff = max(svd_method.abs_cutoff, svd_method.rel_cutoff * s_host[0])
+    reduced_extent = max(min(svd_method.max_extent, int((s_host > cutoff).sum())), 1)
+    discarded_weight = 0.
+    if reduced_extent != full_extent:
+        total_weight = float(xp.linalg.norm(a)) ** 2
+        if total_weight > 0:
+            discarded_weight = max(1 - float((s_host[:reduced_extent] ** 2).sum()) / total_weight, 0.)
+    u, s, v = u[:, :reduced_extent], s[:reduced_extent], v[:reduced_extent]
+
+    if svd_method.normalization == 'L1':
+        s = s / s.sum()
+    elif svd_method.normalization == 'L2':
+        s = s / xp.linalg.norm(s)
+    elif svd_method.normalization == 'LInf':
+        s = s / s[0]
+
+    if svd_method.partition == 'U':
+        u, s = u * s, None
+    elif svd_method.partition == 'V':
+        v, s = v * s[:, None], None
+    elif svd_method.partition == 'UV':
+        s_sqrt = xp.sqrt(s)
+        u, v, s = u * s_sqrt, v * s_sqrt[:, None], None
+
+    info = {'full_extent': full_extent, 'reduced_extent': reduced_extent, 'discarded_weight': discarded_weight}
+    return u, s, v, info
+
+
+def randomized_svd(wrapped_operand, inputs, outputs, size_dict, svd_method, stream, logger):
+    """
+    Perform the truncated SVD of the (wrapped) operand using a randomized range finder, instead of computing the full SVD
+    of the matricized operand before truncation.
+
+    The computation uses NumPy for CPU operands and CuPy on the specified stream for GPU operands, and is blocking.
+
+    Returns the output tensors U, S and V of the same package and on the same device as the operand, along with the SVD
+    information as a dict.
+    """
+    if svd_method.partition not in PARTITION_MAP:
+        raise ValueError(f"partition {svd_method.partition} not supported")
+    if svd_method.normalization not in NORMALIZATION_MAP:
+        raise ValueError(f"normalization {svd_method.normalization} not supported")
+
+    # Group the modes of the operand onto the rows and columns of the matrix according to the outputs.
+    shared_mode = (set(outputs[0]) & set(outputs[1])).pop()
+    left_modes = [mode for mode in outputs[0] if mode != shared_mode]
+    right_modes = [mode for mode in outputs[1] if mode != shared_mode]
+    left_extents = tuple(size_dict[mode] for mode in left_modes)
+    right_extents = tuple(size_dict[mode] for mode in right_modes)
+    axes = [inputs[0].index(mode) for mode in left_modes + right_modes]
+    shape = (compute_combined_size(size_dict, left_modes), compute_combined_size(size_dict, right_modes))
+
+    def to_outputs(xp, u, s, v):
+        u = u.reshape(left_extents + (-1, )).transpose([(left_modes + [shared_mode]).index(mode) for mode in outputs[0]])
+        v = v.reshape((-1, ) + right_extents).transpose([([shared_mode] + right_modes).index(mode) for mode in outputs[1]])
+        return [None if o is None else xp.ascontiguousarray(o) for o in (u, s, v)]
+
+    package = utils.infer_object_package(wrapped_operand.tensor)
+    device_id = wrapped_operand.device_id
+    logger.info("Starting randomized SVD of the tensor...")
+    if device_id is None:
+        a = numpy.asarray(wrapped_operand.tensor).transpose(axes).reshape(shape)
+        u, s, v, info = _randomized_svd_matrix(numpy, a, svd_method, logger)
+        results = to_outputs(numpy, u, s, v)
+    else:
+        stream, _, _ = utils.get_or_create_stream(device_id, stream, package)
+        with utils.device_ctx(device_id), stream:
+            a = cp.asarray(wrapped_operand.tensor).transpose(axes).reshape(shape)
+            u, s, v, info = _randomized_svd_matrix(cp, a, svd_method, logger)
+            results = to_outputs(cp, u, s, v)
+    logger.info(f"The randomized SVD is completed with {info['reduced_extent']} out of {info['full_extent']} singular values retained.")
+
+    if package == 'torch':
+        results = [None if o is None else torch.as_tensor(o, device=wrapped_operand.tensor.device) for o in results]
+    return (*results, info)
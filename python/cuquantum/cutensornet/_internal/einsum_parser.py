@@ -207,6 +207,57 @@ The specified output modes {output_modes} contain the extra modes: {extra}"""
     return inputs, output, mode_map_user_to_ord, mode_map_ord_to_user, label_end
 
 
+def is_integer_interleaved(user_inputs, user_output):
+    """
+    Check if the mode labels of the inputs and the output (if present) are all one-dimensional integer arrays, as generated by
+    :class:`~cuquantum.CircuitToEinsum` in the interleaved format.
+    """
+    is_integer_array = lambda modes: isinstance(modes, np.ndarray) and modes.ndim == 1 and modes.dtype.kind in 'iu'
+    return all(is_integer_array(modes) for modes in user_inputs) and (user_output is None or is_integer_array(user_output))
+
+
+def map_integer_modes(user_inputs, user_output, morpher):
+    """
+    Map integer modes in user-defined inputs and output to ordinals, vectorized over all the mode labels. The result is the
+    same as that of `map_modes` without ellipsis.
+
+    Args:
+        user_inputs: A sequence of one-dimensional integer arrays holding the mode labels of each input.
+        user_output: The output mode labels as a one-dimensional integer array or None.
+        morpher: A callable that transforms a term in neutral format (sequence) to string or interleaved format.
+
+    Returns:
+        tuple:  A 5-tuple containing (mapped input, mapped output, forward map, reverse map, largest label).
+    """
+    labels = np.concatenate(user_inputs)
+    unique_labels, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+
+    # Number the modes in the order of their first appearance, as in map_modes().
+    order = np.argsort(first, kind='stable')
+    ordinals = np.empty(len(unique_labels), dtype=np.int64)
+    ordinals[order] = np.arange(len(unique_labels))
+
+    mapped = ordinals[inverse.reshape(-1)].tolist()
+    offsets = np.cumsum([len(modes) for modes in user_inputs]).tolist()
+    inputs = [tuple(mapped[start:end]) for start, end in zip([0] + offsets, offsets)]
+
+    user_labels = unique_labels[order].tolist()
+    mode_map_ord_to_user = dict(enumerate(user_labels))
+    mode_map_user_to_ord = {v : k for k, v in mode_map_ord_to_user.items()}
+
+    output = None
+    if user_output is not None:
+        extra = set(user_output[~np.isin(user_output, unique_labels)].tolist())
+        if extra:
+            output_modes = morpher(user_output.tolist())
+            message = f"""Extra modes in output.
+The specified output modes {output_modes} contain the extra modes: {extra}"""
+            raise ValueError(message)
+        output = tuple(ordinals[np.searchsorted(unique_labels, user_output)].tolist())
+
+    return inputs, output, mode_map_user_to_ord, mode_map_ord_to_user, len(unique_labels)
+
+
 def create_size_dict(inputs, operands):
     """
     Create size dictionary (mode label to extent map) capturing the extent of each mode.
@@ -363,8 +414,11 @@ The output term {morpher(output)} contains ellipsis while none of the input term
     # Calculate the maximum number of extra mode labels that will be needed.
     num_extra_labels = max(len(o.shape) for o in operands) if ellipses else 0
 
-    # Map data to ordinals for cutensornet.
-    inputs, output, mode_map_user_to_ord, mode_map_ord_to_user, label_end = map_modes(inputs, output, num_extra_labels, morpher)
+    # Map data to ordinals for cutensornet, vectorized for the integer mode label arrays of the interleaved format.
+    if interleaved and not ellipses and is_integer_interleaved(inputs, output):
+        inputs, output, mode_map_user_to_ord, mode_map_ord_to_user, label_end = map_integer_modes(inputs, output, morpher)
+    else:
+        inputs, output, mode_map_user_to_ord, mode_map_ord_to_user, label_end = map_modes(inputs, output, num_extra_labels, morpher)
 
     mapper = ModeLabelMapper(mode_map_ord_to_user)
     mapping_morpher = select_morpher(interleaved, mapper)
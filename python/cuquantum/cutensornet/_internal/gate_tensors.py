@@ -0,0 +1,74 @@
+# Copyright (c) 2023, NVIDIA CORPORATION & AFFILIATES
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Interning of gate tensors and packing them into a single device buffer.
+"""
+
+import numpy as np
+
+from .tensor_wrapper import _get_backend_asarray_func, wrap_operand
+
+def create_gate_tensors(gate_specs, dtype, backend, cache=None):
+    """
+    Create the gate tensors, interning identical gates and uploading all new distinct gate matrices in a single transfer.
+
+    Args:
+        gate_specs: A sequence of 3-tuples (``key``, ``get_matrix``, ``qubits``), where ``get_matrix`` returns the (host)
+            unitary matrix of the gate and ``key`` is a hashable object identifying it (for example, the gate type and
+            parameters). If ``key`` is None, the gate is identified by its matrix.
+        dtype: Data type for the tensor operands.
+        backend: The package the tensor operands belong to.
+        cache: An optional dictionary mapping the keys to the gate tensors already created, which is updated with the new
+            gate tensors.
+
+    Returns:
+        A sequence of 2-tuples (``tensor``, ``qubits``). Gates with the same key share the same tensor, and all the new gate
+        tensors are views into one contiguous buffer.
+    """
+    if cache is None:
+        cache = dict()
+
+    keys = []
+    new_matrices = dict()
+    for key, get_matrix, _ in gate_specs:
+        matrix = None
+        if key is None:
+            matrix = np.asarray(get_matrix())
+            key = ('matrix', matrix.shape, matrix.tobytes())
+        if key not in cache and key not in new_matrices:
+            new_matrices[key] = np.asarray(get_matrix()) if matrix is None else matrix
+        keys.append(key)
+
+    if new_matrices:
+        # Pack the new matrices into one host buffer and upload it at once; the gate tensors are views into it.
+        asarray = _get_backend_asarray_func(backend)
+        buffer = asarray(np.concatenate([m.ravel() for m in new_matrices.values()]), dtype=dtype)
+        offset = 0
+        for key, matrix in new_matrices.items():
+            num_qubits = int(np.log2(matrix.size)) // 2
+            cache[key] = buffer[offset:offset+matrix.size].reshape((2, 2) * num_qubits)
+            offset += matrix.size
+
+    return [(cache[key], gate_qubits) for key, (_, _, gate_qubits) in zip(keys, gate_specs)]
+
+def update_gate_tensors(tensors, matrices, dtype, backend):
+    """
+    Update the gate tensors in place with new (host) unitary matrices, uploading all the matrices in a single transfer.
+
+    Args:
+        tensors: A sequence of gate tensors, for example as created by :func:`create_gate_tensors`.
+        matrices: A sequence of the new matrices of the gates, of the same sizes as the gate tensors.
+        dtype: Data type for the tensor operands.
+        backend: The package the tensor operands belong to.
+    """
+    if not tensors:
+        return
+    asarray = _get_backend_asarray_func(backend)
+    buffer = asarray(np.concatenate([np.asarray(m).ravel() for m in matrices]), dtype=dtype)
+    offset = 0
+    for tensor, matrix in zip(tensors, matrices):
+        size = np.asarray(matrix).size
+        wrap_operand(tensor).copy_(buffer[offset:offset+size].reshape(tensor.shape))
+        offset += size
@@ -0,0 +1,47 @@
+# Copyright (c) 2023, NVIDIA CORPORATION & AFFILIATES
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+A collection of functions for converting contraction paths between formats.
+"""
+
+import bisect
+
+
+def linear_to_ssa(path, num_operands):
+    """
+    Convert a contraction path in the linear (:func:`numpy.einsum_path`) format to the static single assignment (SSA)
+    format, where the input operands are numbered 0, ..., N-1 and the k-th intermediate is numbered N+k.
+    """
+    ids = list(range(num_operands))
+    ssa_path = []
+    next_id = num_operands
+    for i, j in path:
+        ssa_path.append((ids[i], ids[j]))
+        for k in sorted((i, j), reverse=True):
+            del ids[k]
+        ids.append(next_id)
+        next_id += 1
+
+    return ssa_path
+
+
+def ssa_to_linear(ssa_path, num_operands):
+    """
+    Convert a contraction path in the static single assignment (SSA) format to the linear (:func:`numpy.einsum_path`)
+    format.
+    """
+    # The remaining ids are always sorted, since every new intermediate receives the largest id so far.
+    ids = list(range(num_operands))
+    path = []
+    next_id = num_operands
+    for a, b in ssa_path:
+        i, j = bisect.bisect_left(ids, a), bisect.bisect_left(ids, b)
+        path.append((i, j))
+        for k in sorted((i, j), reverse=True):
+            del ids[k]
+        ids.append(next_id)
+        next_id += 1
+
+    return path
@@ -0,0 +1,171 @@
+# Copyright (c) 2023, NVIDIA CORPORATION & AFFILIATES
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+A NumPy reference engine that executes contraction paths and slicing on the CPU, for validating and benchmarking plans
+without a GPU.
+"""
+
+__all__ = ['EngineStats', 'contract', 'einsum']
+
+import concurrent.futures
+import dataclasses
+import itertools
+import threading
+
+import numpy as np
+
+from . import einsum_parser
+
+
+@dataclasses.dataclass
+class EngineStats:
+    """
+    Statistics of a contraction executed by the reference engine.
+
+    Attributes:
+        num_slices: The number of slices of the network.
+        largest_intermediate: The number of elements of the largest intermediate tensor of a slice.
+        peak_memory: The largest total size in bytes of the tensors alive at the same time while contracting a slice
+            (operands included).
+    """
+    num_slices: int
+    largest_intermediate: int
+    peak_memory: int
+
+
+def _pairwise(a, modes_a, b, modes_b, keep):
+    """
+    Contract two tensors, keeping the modes in ``keep``. Return the result and its modes.
+    """
+    shared = set(modes_a) & set(modes_b)
+    contracted = [m for m in modes_a if m in shared and m not in keep]
+    free_a = [m for m in modes_a if m not in shared]
+    free_b = [m for m in modes_b if m not in shared]
+
+    # Use BLAS through tensordot when no batch mode is shared and no mode has to be summed over (or traced) in one tensor only.
+    repeated = len(set(modes_a)) != len(modes_a) or len(set(modes_b)) != len(modes_b)
+    if not repeated and len(contracted) == len(shared) and all(m in keep for m in free_a + free_b):
+        axes = ([modes_a.index(m) for m in contracted], [modes_b.index(m) for m in contracted])
+        return np.tensordot(a, b, axes=axes), free_a + free_b
+
+    modes_out = [m for m in itertools.chain(modes_a, free_b) if m in keep]
+    modes_out = list(dict.fromkeys(modes_out))
+    labels = {m: i for i, m in enumerate(dict.fromkeys(modes_a + modes_b))}
+    result = np.einsum(a, [labels[m] for m in modes_a], b, [labels[m] for m in modes_b], [labels[m] for m in modes_out], optimize=True)
+    return result, modes_out
+
+
+def _finalize(tensor, modes, output):
+    """
+    Sum over the remaining modes that are not in the output, and permute the modes to the output order.
+    """
+    if list(modes) == list(output):
+        return tensor
+    labels = {m: i for i, m in enumerate(dict.fromkeys(modes))}
+    return np.einsum(tensor, [labels[m] for m in modes], [labels[m] for m in output])
+
+
+def _contract_slice(tensors, inputs, output, path):
+    """
+    Contract the (sliced) operands following the path in the :func:`numpy.einsum_path` format. Return the result together
+    with the largest intermediate size and the peak memory in bytes.
+    """
+    tensors, inputs = list(tensors), [list(_input) for _input in inputs]
+    live_bytes = sum(t.nbytes for t in tensors)
+    peak_memory, largest_intermediate = live_bytes, 0
+
+    for i, j in path:
+        a, b = tensors[i], tensors[j]
+        modes_a, modes_b = inputs[i], inputs[j]
+        for k in sorted((i, j), reverse=True):
+            del tensors[k], inputs[k]
+
+        keep = set(output).union(*inputs)
+        result, modes = _pairwise(a, modes_a, b, modes_b, keep)
+
+        live_bytes += result.nbytes
+        peak_memory = max(peak_memory, live_bytes)
+        live_bytes -= a.nbytes + b.nbytes
+        largest_intermediate = max(largest_intermediate, result.size)
+
+        tensors.append(result)
+        inputs.append(modes)
+
+    assert len(tensors) == 1, "Internal error."
+    return _finalize(tensors[0], inputs[0], output), largest_intermediate, peak_memory
+
+
+def _slice_index(modes, slice_ranges):
+    """
+    The index selecting a slice of a tensor with the specified modes.
+    """
+    return tuple(slice_ranges.get(m, slice(None)) for m in modes)
+
+
+def contract(operands, inputs, output, size_dict, path, slices=(), *, slice_ids=None, num_threads=None):
+    """
+    Contract the network following the path, one slice at a time.
+
+    Args:
+        operands: A sequence of NumPy ndarrays.
+        inputs: The input modes of the network as a sequence of sequences of mode ordinals, as returned by
+            :func:`einsum_parser.parse_einsum`.
+        output: The output modes of the network as a sequence of mode ordinals.
+        size_dict: A map from mode ordinals to the extents.
+        path: The contraction path in the :func:`numpy.einsum_path` format.
+        slices: The sliced modes as a sequence of ``(mode ordinal, sliced extent)`` pairs, as in
+            :attr:`~cuquantum.OptimizerInfo.slices`. Each sliced mode is split into contiguous ranges of the sliced extent (the
+            last range is shorter if the sliced extent does not divide the extent of the mode).
+        slice_ids: The IDs of the slices to contract as a sequence, all the slices if not specified. The ID enumerates the
+            combinations of the ranges of the sliced modes, with the last sliced mode varying the fastest.
+        num_threads: The number of threads contracting slices concurrently, the number of CPUs if not specified.
+
+    Returns:
+        tuple: A 2-tuple consisting of the result as a NumPy ndarray and an :class:`EngineStats` object.
+    """
+    slices = [(m, int(e)) for m, e in slices]
+    ranges = []
+    for m, e in slices:
+        ranges.append([slice(k, min(k + e, size_dict[m])) for k in range(0, size_dict[m], e)])
+    num_slices = int(np.prod([len(mode_ranges) for mode_ranges in ranges], dtype=np.int64))
+    slice_ids = range(num_slices) if slice_ids is None else slice_ids
+
+    dtype = np.result_type(*operands)
+    result = np.zeros(tuple(size_dict[m] for m in output), dtype=dtype)
+    lock = threading.Lock()
+
+    def contract_one(slice_id):
+        slice_ranges = {}
+        for (m, _), mode_ranges in zip(reversed(slices), reversed(ranges)):
+            slice_id, k = divmod(slice_id, len(mode_ranges))
+            slice_ranges[m] = mode_ranges[k]
+        tensors = [o[_slice_index(_input, slice_ranges)] for o, _input in zip(operands, inputs)]
+        partial, largest_intermediate, peak_memory = _contract_slice(tensors, inputs, output, path)
+        with lock:
+            result[_slice_index(output, slice_ranges)] += partial
+        return largest_intermediate, peak_memory
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
+        stats = list(executor.map(contract_one, slice_ids))
+
+    largest_intermediate = max((s[0] for s in stats), default=0)
+    peak_memory = max((s[1] for s in stats), default=0)
+    return result, EngineStats(num_slices, largest_intermediate, peak_memory)
+
+
+def einsum(*operands, path=None, slices=(), slice_ids=None, num_threads=None):
+    """
+    einsum(subscripts, *operands, path=None, slices=(), slice_ids=None, num_threads=None)
+
+    Contract the network specified in the subscript or interleaved format (see :class:`~cuquantum.Network`) on the CPU using
+    :func:`contract`. The sliced modes are specified with the user's mode labels, for example as in
+    :attr:`~cuquantum.OptimizerInfo.slices`, and the path ``[(0, 1), (0, 1), ...]`` is used if none is provided.
+    """
+    operands, inputs, output, size_dict, mode_map_user_to_ord, _, _ = einsum_parser.parse_einsum(*operands)
+    operands = [np.asarray(o.tensor if o.device_id is None else o.to('cpu')) for o in operands]
+    if path is None:
+        path = [(0, 1)] * (len(operands) - 1)
+    slices = [(mode_map_user_to_ord[m], e) for m, e in slices]
+    return contract(operands, inputs, output, size_dict, path, slices, slice_ids=slice_ids, num_threads=num_threads)
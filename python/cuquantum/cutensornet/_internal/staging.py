@@ -0,0 +1,111 @@
+# Copyright (c) 2023, NVIDIA CORPORATION & AFFILIATES
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Asynchronous host-device transfers through page-locked (pinned) staging buffers.
+"""
+
+__all__ = ['is_dense', 'empty_pinned', 'empty_host', 'StagingBuffers', 'download', 'to_host_tensor', 'from_host_tensor']
+
+import cupy as cp
+import numpy as np
+
+
+def is_dense(shape, strides):
+    """
+    Check if a tensor with the specified shape and strides (in elements) occupies a contiguous block of memory, in any
+    mode order.
+    """
+    expected = 1
+    for stride, extent in sorted((s, e) for s, e in zip(strides, shape) if e != 1):
+        if stride != expected:
+            return False
+        expected *= extent
+    return True
+
+
+def empty_pinned(shape, dtype, strides):
+    """
+    Create an empty NumPy ndarray of the specified shape, data type name and strides (in elements), backed by pinned memory
+    drawn from CuPy's pinned memory pool. The memory is returned to the pool when the ndarray is garbage collected.
+    """
+    dtype = np.dtype(dtype)
+    size = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+    memory = cp.cuda.alloc_pinned_memory(size)
+    return np.ndarray(shape, dtype=dtype, buffer=memory, strides=tuple(s * dtype.itemsize for s in strides))
+
+
+def empty_host(shape, dtype, strides, pinned=False):
+    """
+    Create an empty NumPy ndarray of the specified shape, data type name and strides (in elements), backed by pinned memory
+    if requested or by pageable memory otherwise.
+    """
+    if pinned:
+        return empty_pinned(shape, dtype, strides)
+    dtype = np.dtype(dtype)
+    size = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+    memory = np.empty(size, dtype=np.uint8)
+    return np.ndarray(shape, dtype=dtype, buffer=memory, strides=tuple(s * dtype.itemsize for s in strides))
+
+
+class StagingBuffers:
+    """
+    Pinned host buffers used to copy operands to the device asynchronously. The buffers are reused across transfers, and
+    each of the ``num_slots`` sets of buffers can have a transfer in flight.
+    """
+
+    def __init__(self, num_slots=1):
+        self.slots = [(None, None)] * num_slots
+
+    def upload(self, src, dest, stream, slot=0):
+        """
+        Copy the wrapped host tensors in src to the corresponding (dense) wrapped device tensors in dest on the specified
+        stream (a CuPy stream object), and return the event marking the completion of the transfer.
+        """
+        buffers, event = self.slots[slot]
+
+        # The previous transfer from this slot may still be reading the buffers.
+        if event is not None:
+            event.synchronize()
+
+        if buffers is None:
+            buffers = tuple(empty_pinned(d.shape, d.dtype, d.strides) for d in dest)
+
+        for s, b, d in zip(src, buffers, dest):
+            np.copyto(b, np.asarray(s.tensor))
+            cp.cuda.runtime.memcpyAsync(d.data_ptr, b.ctypes.data, b.nbytes, cp.cuda.runtime.memcpyHostToDevice, stream.ptr)
+
+        event = stream.record()
+        self.slots[slot] = buffers, event
+        return event
+
+
+def download(src, stream, out=None):
+    """
+    Copy the wrapped (dense) device tensor src into a pinned NumPy ndarray of the same layout on the specified stream (a
+    CuPy stream object), and return the latter. A new ndarray is created unless one is provided as out. The caller is
+    responsible for synchronizing the stream before accessing the result.
+    """
+    dest = empty_pinned(src.shape, src.dtype, src.strides) if out is None else out
+    cp.cuda.runtime.memcpyAsync(dest.ctypes.data, src.data_ptr, dest.nbytes, cp.cuda.runtime.memcpyDeviceToHost, stream.ptr)
+    return dest
+
+
+def to_host_tensor(array, package):
+    """
+    Return the NumPy ndarray as a CPU tensor of the specified package, without copying.
+    """
+    if package == 'torch':
+        import torch
+        return torch.from_numpy(array)
+    return array
+
+
+def from_host_tensor(tensor, package):
+    """
+    Return the CPU tensor of the specified package as a NumPy ndarray, without copying.
+    """
+    if package == 'torch':
+        return tensor.numpy()
+    return tensor
@@ -80,6 +80,13 @@ class NumpyTensor(Tensor):
 
         return tensor_device
 
+    def copy_(self, src):
+        """
+        Inplace copy of src (copy the data from src into self).
+        """
+
+        numpy.copyto(self.tensor, src)
+
     def istensor(self):
         """
         Check if the object is ndarray-like.
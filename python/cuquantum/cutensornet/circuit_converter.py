@@ -15,6 +15,8 @@ import warnings
 import numpy as np
 
 from ._internal import circuit_converter_utils as circ_utils
+from ._internal import tensor_wrapper
+from ._internal.gate_tensors import update_gate_tensors
 
 EMPTY_DICT = circ_utils.EMPTY_DICT
 
@@ -22,18 +24,51 @@ class CircuitToEinsum:
     """
     Create a converter object that can generate Einstein summation expressions and tensor operands for a given circuit.
 
-    The supported circuit types include :class:`cirq.Circuit` and :class:`qiskit.QuantumCircuit`. The input circuit must 
-    be fully parameterized and can not contain operations that are not well-defined in tensor network simulation, for instance, 
-    resetting the quantum state or performing any intermediate measurement. 
+    The supported circuit types include :class:`cirq.Circuit`, :class:`qiskit.QuantumCircuit` and :class:`NativeCircuit`, which
+    does not require either package. The input circuit must 
+    be fully parameterized (unless the values of its parameters are provided with ``params``) and can not contain operations that
+    are not well-defined in tensor network simulation, for instance, resetting the quantum state or performing any intermediate
+    measurement. 
 
     Args:
-        circuit : A fully parameterized :class:`cirq.Circuit` or :class:`qiskit.QuantumCircuit` object.
+        circuit : A fully parameterized :class:`cirq.Circuit`, :class:`qiskit.QuantumCircuit` or :class:`NativeCircuit` object,
+            or a :class:`cirq.Circuit` or :class:`qiskit.QuantumCircuit` object with unbound parameters if ``params`` is specified.
         dtype : The datatype for the output tensor operands. If not specified, double complex is used. 
         backend: The backend for the output tensor operands. If not specified, ``cupy`` is used.
+        fusion: Optional, the largest number of qubits of a fused gate for the gate fusion pre-pass. If specified, consecutive
+            gates are fused into gates acting on at most ``fusion`` qubits (absorbing runs of single-qubit gates into their
+            neighbors and merging the gates acting on the same qubits), which reduces the number of tensors in all the generated
+            networks. If not specified, the gates are not fused.
+        hyperedges: Whether to encode the gates according to their structure. If `True`, the qubits a gate is diagonal on (all
+            the qubits of diagonal gates such as CZ, RZ or CPhase, and the control qubits of controlled gates) share the same
+            mode for the input and the output of the gate, and the corresponding modes are dropped from the gate tensor. This
+            reduces the size of the gate operands and the number of modes of the networks, which then contain hyperedges
+            (modes shared by more than two tensors). The default is `False`, where each gate tensor has an input and an output
+            mode for each qubit.
+        params: The values of the unbound parameters of a parameterized circuit (the :class:`sympy.Symbol` objects of a
+            :class:`cirq.Circuit` or the :class:`qiskit.circuit.Parameter` objects of a :class:`qiskit.QuantumCircuit`), as a
+            mapping from the parameters (or their names) to their values, or as a sequence of values in the order of
+            :attr:`parameters`. It is required if and only if the circuit has unbound parameters. The values can be updated later
+            with :meth:`rebind`.
+        interleaved: Whether to generate the Einstein summation expressions in the interleaved format. If `True`, all the
+            methods return, in place of the expression string, a 2-tuple of a list of integer arrays holding the mode labels of
+            each operand and an integer array holding the output mode labels. These are consumed directly by
+            :class:`~cuquantum.Network` and :func:`~cuquantum.contract` (see the examples), which avoids building the
+            expression string and parsing it back, and is faster for circuits with a very large number of modes. The default
+            is `False`.
+        cache_size: The maximal number of queries (method calls with distinct arguments) whose expressions and operands are
+            memoized, so that repeating a query returns them without generating the network again. The least recently used
+            queries are evicted beyond this size, and ``0`` disables the memoization. The default is 128.
     
     Notes:
 
       - For :class:`qiskit.QuantumCircuit`, composite gates will be decomposed into either Qiskit standard gates or customized unitary gates.
+      - Identical gates share the same tensor operand, and the distinct gate tensors are views into a single buffer created with one
+        transfer. The gate operands should therefore not be modified in place, other than by :meth:`rebind`. Likewise, the
+        tensor operands for the basis states and the Pauli operators are shared by all the networks generated by the
+        converter, and a repeated query returns the same operands (in a new list) as the first one.
+      - The gates depending on unbound parameters are neither fused nor encoded with hyperedges, so that their tensors keep the
+        same shape for all the values of the parameters.
 
     Examples:
 
@@ -81,8 +116,16 @@ class CircuitToEinsum:
         >>> print(rdm.shape)
         (2, 2, 2, 2)
 
+        Generate the expression for the state vector in the interleaved format, with integer mode labels, and contract it:
+
+        >>> import itertools
+        >>> converter = CircuitToEinsum(qc, backend='cupy', interleaved=True)
+        >>> (inputs, output), operands = converter.state_vector()
+        >>> sv = contract(*itertools.chain.from_iterable(zip(operands, inputs)), output)
+
     """
-    def __init__(self, circuit, dtype='complex128', backend='cupy'):
+    def __init__(self, circuit, dtype='complex128', backend='cupy', fusion=None, hyperedges=False, params=None, interleaved=False,
+                 cache_size=128):
         # infer library-specific parser
         self.parser = circ_utils.infer_parser(circuit)
 
@@ -99,10 +142,47 @@ class CircuitToEinsum:
                 dtype = getattr(backend, np.dtype(dtype).name)
         self.dtype = dtype
 
-        # unfold circuit metadata
-        self._qubits, self._gates = self.parser.unfold_circuit(circuit, dtype=self.dtype, backend=self.backend)
+        # the values of the unbound parameters, referenced by the functions computing the matrices of the parametric gates
+        self._parameters = self.parser.get_circuit_parameters(circuit)
+        self._param_values = dict()
+        self._parametric_gates = dict()
+        unfold_kwargs = dict()
+        if self._parameters:
+            if params is None:
+                raise ValueError(f"the values of the circuit parameters {self._parameters} must be provided with params")
+            self._param_values.update(self._parse_params(params))
+            unfold_kwargs = dict(param_values=self._param_values, parametric_gates=self._parametric_gates)
+        elif params is not None and len(params) > 0:
+            raise ValueError("the circuit does not have unbound parameters, params must not be specified")
+
+        # unfold circuit metadata, interning identical gate tensors across all (lightcone and inverse) circuits
+        self._gate_cache = dict()
+        self._qubits, self._gates = self.parser.unfold_circuit(circuit, dtype=self.dtype, backend=self.backend, gate_cache=self._gate_cache,
+                                                               **unfold_kwargs)
+        # ids of the tensors of the parametric gates and their inverses, which are updated in place by rebind()
+        self._parametric_tensor_ids = set(id(self._gate_cache[key]) for key in self._parametric_gates)
+        self._fusion_stats = None
+        if fusion is not None:
+            self._gates, self._fusion_stats = circ_utils.fuse_gates(self._gates, fusion, dtype=self.dtype, backend=self.backend,
+                                                                    exclude=self._parametric_tensor_ids)
         self.n_qubits = len(self.qubits)
         self._metadata = None
+        self._lightcone_index = None
+        self._inverse_tensors = dict()
+        self._reduced_tensors = dict()
+        self._reduce_gate = self._get_reduced_tensor if hyperedges else None
+        if interleaved:
+            self._convert_mode_labels = circ_utils.convert_mode_labels_to_interleaved
+        else:
+            self._convert_mode_labels = circ_utils.convert_mode_labels_to_expression
+
+        # the basis state and Pauli tensors shared by all the networks, and the memoized networks of the recent queries
+        self._basis_map = circ_utils.get_basis_tensors(dtype=self.dtype, backend=self.backend)
+        self._pauli_map = circ_utils.get_pauli_tensors(dtype=self.dtype, backend=self.backend)
+        if cache_size < 0:
+            raise ValueError(f"the cache size must be non-negative, got {cache_size}")
+        self._cache_size = cache_size
+        self._network_cache = collections.OrderedDict()
     
     @property
     def qubits(self):
@@ -121,8 +201,74 @@ class CircuitToEinsum:
                   The modes of the operands are ordered as ``AB...ab...``, where ``AB...`` denotes all output modes and
                   ``ab...`` denotes all input modes.
                 - ``qubits``: A list of arrays corresponding to all the qubits and gate tensor operands.
+
+        .. note:: If gate fusion is enabled, these are the fused gates.
         """
         return self._gates
+
+    @property
+    def fusion_stats(self):
+        """
+        The statistics of the gate fusion pre-pass, with the attributes ``max_qubits``, ``num_gates`` (before fusion),
+        ``num_fused_gates`` (after fusion) and ``num_tensors_removed``, or None if gate fusion is not enabled.
+        """
+        return self._fusion_stats
+
+    @property
+    def parameters(self):
+        """A sequence of the unbound parameters of the circuit, in the order in which their values can be specified."""
+        return self._parameters
+
+    def rebind(self, params):
+        """
+        Update the values of the unbound parameters of the circuit, without converting it again.
+
+        Only the tensors of the gates depending on the updated parameters are recomputed, and all the new matrices are uploaded
+        in a single transfer. The tensors are updated in place, so that the operands generated before by this converter (for
+        any of the supported computations) reflect the new values, while the expressions and the network topologies do not
+        change.
+
+        Args:
+            params: The new values of the parameters, as a mapping from (a subset of) the parameters or their names to their
+                values, or as a sequence of values for all the parameters in the order of :attr:`parameters`.
+
+        .. note:: A :class:`~cuquantum.Network` object created from the operands on the GPU computes the result for the new
+            values of the parameters, reusing the contraction path and plan. For operands on the CPU, the network must be
+            informed of the update with :meth:`~cuquantum.Network.reset_operands` called with the same operands.
+
+        Examples:
+
+            >>> import qiskit
+            >>> from cuquantum import CircuitToEinsum, Network
+            >>> theta = qiskit.circuit.Parameter('theta')
+            >>> qc = qiskit.QuantumCircuit(2)
+            >>> qc.h(0)
+            >>> qc.rx(theta, 1)
+            >>> qc.cx(0, 1)
+            >>> converter = CircuitToEinsum(qc, params=[0.1])
+            >>> expression, operands = converter.expectation('ZZ')
+            >>> with Network(expression, *operands) as network:
+            ...     path, info = network.contract_path()
+            ...     network.autotune()
+            ...     for value in (0.1, 0.2, 0.3):
+            ...         converter.rebind({theta: value})
+            ...         result = network.contract()
+        """
+        values = self._parse_params(params, partial=True)
+        updated = set(p for p, value in values.items() if self._param_values[p] != value)
+        self._param_values.update(values)
+        keys = [key for key, (_, parameters) in self._parametric_gates.items() if parameters & updated]
+        if not keys:
+            return
+
+        tensors = [self._gate_cache[key] for key in keys]
+        matrices = [self._parametric_gates[key][0]() for key in keys]
+        update_gate_tensors(tensors, matrices, self.dtype, self.backend)
+        # update the cached tensors of the inverse gates in place
+        for tensor in tensors:
+            inverse = self._inverse_tensors.get(id(tensor))
+            if inverse is not None:
+                tensor_wrapper.wrap_operand(inverse[0]).copy_(circ_utils.get_inverse_gate_tensor(tensor, backend=self.backend))
         
     def state_vector(self):
         """
@@ -132,6 +278,7 @@ class CircuitToEinsum:
             The Einstein summation expression and a list of tensor operands. The order of the output mode labels is consistent with :attr:`CircuitToEinsum.qubits`.
             For :class:`cirq.Circuit`, this order corresponds to all qubits in the circuit sorted in ascending order. 
             For :class:`qiskit.QuantumCircuit`, this order is the same as :attr:`qiskit.QuantumCircuit.qubits`.
+            For :class:`NativeCircuit`, the qubits are the integers ``0, 1, ..., num_qubits-1``.
         """
         return self.batched_amplitudes(dict())
 
@@ -146,20 +293,25 @@ class CircuitToEinsum:
             The Einstein summation expression and a list of tensor operands. The order of the output mode labels is consistent with :attr:`CircuitToEinsum.qubits`.
             For :class:`cirq.Circuit`, this order corresponds to all qubits in the circuit sorted in ascending order. 
             For :class:`qiskit.QuantumCircuit`, this order is the same as :attr:`qiskit.QuantumCircuit.qubits`.
+            For :class:`NativeCircuit`, the qubits are the integers ``0, 1, ..., num_qubits-1``.
         """
         if not isinstance(fixed, collections.abc.Mapping):
             raise TypeError('fixed must be a dictionary')
+        key = ('batched_amplitudes', tuple(fixed.items()))
+        networks = self._get_cached_networks(key)
+        if networks is not None:
+            return networks[0]
         input_mode_labels, input_operands, qubits_frontier = self._get_inputs()
         
         fixed_qubits, fixed_bitstring = circ_utils.parse_fixed_qubits(fixed)
         fixed_mode_labels = [[qubits_frontier[q]] for q in fixed_qubits]    
         mode_labels = input_mode_labels + fixed_mode_labels
         
-        operands = input_operands + circ_utils.get_bitstring_tensors(fixed_bitstring, dtype=self.dtype, backend=self.backend)
+        operands = input_operands + circ_utils.get_bitstring_tensors(fixed_bitstring, dtype=self.dtype, backend=self.backend, basis_map=self._basis_map)
         output_mode_labels = [qubits_frontier[q] for q in self.qubits if q not in fixed]
 
-        expression = circ_utils.convert_mode_labels_to_expression(mode_labels, output_mode_labels)
-        return expression, operands 
+        expression = self._convert_mode_labels(mode_labels, output_mode_labels)
+        return self._cache_networks(key, [(expression, operands)])[0]
     
     def amplitude(self, bitstring):
         """Generate the Einstein summation expression and tensor operands to compute the probability amplitude of
@@ -170,18 +322,23 @@ class CircuitToEinsum:
                 The order of the bitstring is expected to be consistent with :attr:`CircuitToEinsum.qubits`.
                 For :class:`cirq.Circuit`, this order corresponds to all qubits in the circuit sorted in ascending order. 
                 For :class:`qiskit.QuantumCircuit`, this order is the same as :attr:`qiskit.QuantumCircuit.qubits`.
+                For :class:`NativeCircuit`, the qubits are the integers ``0, 1, ..., num_qubits-1``.
 
         Returns:
             The Einstein summation expression and a list of tensor operands
         """
         bitstring = circ_utils.parse_bitstring(bitstring, n_qubits=self.n_qubits)
+        key = ('amplitude', bitstring)
+        networks = self._get_cached_networks(key)
+        if networks is not None:
+            return networks[0]
         input_mode_labels, input_operands, qubits_frontier = self._get_inputs()
         mode_labels = input_mode_labels + [[qubits_frontier[q]] for q in self.qubits]
         output_mode_labels = []
 
-        expression = circ_utils.convert_mode_labels_to_expression(mode_labels, output_mode_labels)
-        operands = input_operands + circ_utils.get_bitstring_tensors(bitstring, dtype=self.dtype, backend=self.backend)
-        return expression, operands 
+        expression = self._convert_mode_labels(mode_labels, output_mode_labels)
+        operands = input_operands + circ_utils.get_bitstring_tensors(bitstring, dtype=self.dtype, backend=self.backend, basis_map=self._basis_map)
+        return self._cache_networks(key, [(expression, operands)])[0]
     
     def reduced_density_matrix(self, where, fixed=EMPTY_DICT, lightcone=True):
         r"""
@@ -207,13 +364,17 @@ class CircuitToEinsum:
         
         .. seealso:: `unitary reverse lightcone cancellation <https://quimb.readthedocs.io/en/latest/tensor-circuit.html#Unitary-Reverse-Lightcone-Cancellation>`_
         """
+        key = ('reduced_density_matrix', tuple(where), tuple(fixed.items()), bool(lightcone))
+        networks = self._get_cached_networks(key)
+        if networks is not None:
+            return networks[0]
         n_qubits = self.n_qubits
         coned_qubits = list(where) + list(fixed.keys())
         input_mode_labels, input_operands, qubits_frontier, next_frontier, inverse_gates = self._get_forward_inverse_metadata(lightcone, coned_qubits)
 
         # handle tensors/mode labels for qubits with fixed state
         fixed_qubits, fixed_bitstring = circ_utils.parse_fixed_qubits(fixed)
-        fixed_operands = circ_utils.get_bitstring_tensors(fixed_bitstring, dtype=self.dtype, backend=self.backend)
+        fixed_operands = circ_utils.get_bitstring_tensors(fixed_bitstring, dtype=self.dtype, backend=self.backend, basis_map=self._basis_map)
 
         mode_labels = input_mode_labels + [[qubits_frontier[ix]] for ix in fixed_qubits]
         for iqubit in fixed_qubits:
@@ -230,7 +391,8 @@ class CircuitToEinsum:
 
         igate_mode_labels, igate_operands = circ_utils.parse_gates_to_mode_labels_operands(inverse_gates, 
                                                                                  qubits_frontier, 
-                                                                                 next_frontier)
+                                                                                 next_frontier,
+                                                                                 reduce_gate=self._reduce_gate)
         mode_labels += igate_mode_labels
         operands += igate_operands
         
@@ -243,8 +405,8 @@ class CircuitToEinsum:
             output_left_mode_labels.append(left_mode_labels)
             output_right_mode_labels.append(right_mode_labels)
         output_mode_labels = output_left_mode_labels + output_right_mode_labels
-        expression = circ_utils.convert_mode_labels_to_expression(mode_labels, output_mode_labels)
-        return expression, operands
+        expression = self._convert_mode_labels(mode_labels, output_mode_labels)
+        return self._cache_networks(key, [(expression, operands)])[0]
     
     def expectation(self, pauli_string, lightcone=True):
         """
@@ -276,13 +438,11 @@ class CircuitToEinsum:
         
         .. seealso:: `unitary reverse lightcone cancellation <https://quimb.readthedocs.io/en/latest/tensor-circuit.html#Unitary-Reverse-Lightcone-Cancellation>`_
         """
-        if isinstance(pauli_string, collections.abc.Sequence):
-            if len(pauli_string) != self.n_qubits:
-                raise ValueError('pauli_string must be of equal size as the number of qubits in the circuit')
-            pauli_string = dict(zip(self.qubits, pauli_string))
-        else:
-            if not isinstance(pauli_string, collections.abc.Mapping):
-                raise TypeError('pauli_string must be either a sequence of pauli characters or a dictionary')
+        pauli_string = self._parse_pauli_string(pauli_string)
+        key = ('expectation', tuple(pauli_string.items()), bool(lightcone))
+        networks = self._get_cached_networks(key)
+        if networks is not None:
+            return networks[0]
         
         n_qubits = self.n_qubits
         if lightcone:
@@ -292,19 +452,127 @@ class CircuitToEinsum:
         coned_qubits = pauli_map.keys()
         input_mode_labels, input_operands, qubits_frontier, next_frontier, inverse_gates = self._get_forward_inverse_metadata(lightcone, coned_qubits)
 
-        pauli_gates = circ_utils.get_pauli_gates(pauli_map, dtype=self.dtype, backend=self.backend)
+        pauli_gates = circ_utils.get_pauli_gates(pauli_map, dtype=self.dtype, backend=self.backend, operand_map=self._pauli_map)
         gates = pauli_gates + inverse_gates
 
         gate_mode_labels, gate_operands = circ_utils.parse_gates_to_mode_labels_operands(gates, 
                                                                                          qubits_frontier, 
-                                                                                         next_frontier)
+                                                                                         next_frontier,
+                                                                                         reduce_gate=self._reduce_gate)
         
         mode_labels = input_mode_labels + gate_mode_labels + [[qubits_frontier[ix]] for ix in self.qubits]
         operands = input_operands + gate_operands + input_operands[:n_qubits]
 
         output_mode_labels = []
-        expression = circ_utils.convert_mode_labels_to_expression(mode_labels, output_mode_labels)
-        return expression, operands
+        expression = self._convert_mode_labels(mode_labels, output_mode_labels)
+        return self._cache_networks(key, [(expression, operands)])[0]
+
+    def expectation_batch(self, pauli_strings, lightcone=True):
+        """
+        Generate the Einstein summation expressions and tensor operands to compute the expectation values of many Pauli
+        strings for the input circuit, with one network per group of Pauli strings sharing the same network topology.
+
+        The Pauli strings are grouped by the qubits they act on non-trivially when ``lightcone=True`` (as these qubits
+        determine the lightcone), and form a single group when ``lightcone=False``. Within a group, the Pauli operators
+        acting on each qubit are stacked along an additional batch mode shared by all of them, which is the only output mode
+        of the network, so that a single contraction path and plan serve the whole group.
+
+        Args:
+            pauli_strings: A sequence of Pauli strings, each of which can be given in any form accepted by :meth:`expectation`.
+            lightcone: Whether to apply the unitary reverse lightcone cancellation technique to reduce the number of tensors in expectation value computation.
+
+        Returns:
+            A list of 3-tuples (``expression``, ``operands``, ``indices``), one per group. Contracting the Einstein summation
+            expression with the tensor operands produces a vector whose k-th element is the expectation value of
+            ``pauli_strings[indices[k]]``.
+
+        .. seealso:: :meth:`expectation`
+        """
+        pauli_strings = [self._parse_pauli_string(pauli_string) for pauli_string in pauli_strings]
+        key = ('expectation_batch', tuple(tuple(pauli_string.items()) for pauli_string in pauli_strings), bool(lightcone))
+        networks = self._get_cached_networks(key)
+        if networks is not None:
+            return networks
+
+        groups = dict()
+        for index, pauli_string in enumerate(pauli_strings):
+            if lightcone:
+                group_key = tuple(q for q in self.qubits if pauli_string.get(q, 'I') != 'I')
+            else:
+                group_key = tuple(self.qubits)
+            groups.setdefault(group_key, []).append((index, pauli_string))
+
+        networks = []
+        for coned_qubits, terms in groups.items():
+            indices, pauli_maps = zip(*terms)
+            input_mode_labels, input_operands, qubits_frontier, next_frontier, inverse_gates = self._get_forward_inverse_metadata(lightcone, coned_qubits)
+
+            pauli_gates = circ_utils.get_batched_pauli_gates(pauli_maps, coned_qubits, dtype=self.dtype, backend=self.backend)
+            gate_mode_labels, gate_operands = circ_utils.parse_gates_to_mode_labels_operands(pauli_gates + inverse_gates,
+                                                                                             qubits_frontier,
+                                                                                             next_frontier,
+                                                                                             reduce_gate=self._reduce_gate)
+            batch_mode_label = max(qubits_frontier.values()) + 1
+            for labels in gate_mode_labels[:len(pauli_gates)]:
+                labels.insert(0, batch_mode_label)
+
+            mode_labels = input_mode_labels + gate_mode_labels + [[qubits_frontier[ix]] for ix in self.qubits]
+            operands = input_operands + gate_operands + input_operands[:self.n_qubits]
+            if not pauli_gates:
+                # all the Pauli strings are identities, the batch mode is carried by a vector of ones
+                mode_labels.append([batch_mode_label])
+                operands.append(circ_utils.get_ones_tensor(len(indices), dtype=self.dtype, backend=self.backend))
+
+            expression = self._convert_mode_labels(mode_labels, [batch_mode_label])
+            networks.append((expression, operands, indices))
+        return self._cache_networks(key, networks)
+
+    def _get_cached_networks(self, key):
+        """Return the memoized networks of a query (with new lists of operands), or None."""
+        networks = self._network_cache.get(key)
+        if networks is None:
+            return None
+        self._network_cache.move_to_end(key)
+        return [(expression, list(operands), *rest) for expression, operands, *rest in networks]
+
+    def _cache_networks(self, key, networks):
+        """Memoize the networks of a query, evicting the least recently used queries beyond the cache size."""
+        if self._cache_size > 0:
+            self._network_cache[key] = [(expression, tuple(operands), *rest) for expression, operands, *rest in networks]
+            while len(self._network_cache) > self._cache_size:
+                self._network_cache.popitem(last=False)
+        return networks
+
+    def _parse_params(self, params, partial=False):
+        """Return a dictionary mapping the parameters to their values, given as a mapping or a sequence."""
+        if isinstance(params, collections.abc.Mapping):
+            names = {str(p): p for p in self._parameters}
+            values = dict()
+            for p, value in params.items():
+                p = names.get(p, p) if isinstance(p, str) else p
+                if p not in self._parameters:
+                    raise ValueError(f"{p} is not a parameter of the circuit")
+                values[p] = value
+            if not partial and len(values) != len(self._parameters):
+                missing = [p for p in self._parameters if p not in values]
+                raise ValueError(f"the values of the circuit parameters {missing} must be provided")
+        else:
+            params = list(params)
+            if len(params) != len(self._parameters):
+                raise ValueError(f"expecting {len(self._parameters)} parameter values, got {len(params)}")
+            values = dict(zip(self._parameters, params))
+        return values
+
+    def _parse_pauli_string(self, pauli_string):
+        """Return the Pauli string as a dictionary mapping qubits to Pauli characters."""
+        if isinstance(pauli_string, collections.abc.Sequence):
+            if len(pauli_string) != self.n_qubits:
+                raise ValueError('pauli_string must be of equal size as the number of qubits in the circuit')
+            pauli_string = dict(zip(self.qubits, pauli_string))
+        else:
+            if not isinstance(pauli_string, collections.abc.Mapping):
+                raise TypeError('pauli_string must be either a sequence of pauli characters or a dictionary')
+        return pauli_string
 
     def _get_inputs(self):
         """transform the qubits and gates in the circuit to a prelimary Einsum form.
@@ -317,7 +585,8 @@ class CircuitToEinsum:
                 - ``qubits_frontier`` : A dictionary that maps all qubits to their current mode labels.
         """
         if self._metadata is None:
-            self._metadata = circ_utils.parse_inputs(self.qubits, self._gates, self.dtype, self.backend)
+            self._metadata = circ_utils.parse_inputs(self.qubits, self._gates, self.dtype, self.backend, reduce_gate=self._reduce_gate,
+                                                     basis_map=self._basis_map)
         return self._metadata
     
     def _get_forward_inverse_metadata(self, lightcone, coned_qubits):
@@ -336,21 +605,49 @@ class CircuitToEinsum:
                 - ``next_frontier``: The next mode label to use.
                 - ``inverse_gates``: A sequence of (operand, qubits) for the inverse circuit.
         """
-        parser = self.parser
         if lightcone:
-            circuit = parser.get_lightcone_circuit(self.circuit, coned_qubits)
-            _, gates = parser.unfold_circuit(circuit, dtype=self.dtype, backend=self.backend)
+            if self._lightcone_index is None:
+                self._lightcone_index = circ_utils.LightconeIndex(self._gates)
+            gates = self._lightcone_index.get_lightcone_gates(coned_qubits)
             # in cirq, the lightcone circuit may only contain a subset of the original qubits
             # It's imperative to use qubits=self.qubits to generate the input tensors
-            input_mode_labels, input_operands, qubits_frontier = circ_utils.parse_inputs(self.qubits, gates, self.dtype, self.backend)
+            input_mode_labels, input_operands, qubits_frontier = circ_utils.parse_inputs(self.qubits, gates, self.dtype, self.backend,
+                                                                                         reduce_gate=self._reduce_gate, basis_map=self._basis_map)
         else:
-            circuit = self.circuit
+            gates = self._gates
             input_mode_labels, input_operands, qubits_frontier = self._get_inputs()
             # avoid inplace modification on metadata
             qubits_frontier = qubits_frontier.copy()
         
         next_frontier = max(qubits_frontier.values()) + 1
-        # inverse circuit
-        inverse_circuit  = parser.get_inverse_circuit(circuit)
-        _, inverse_gates = parser.unfold_circuit(inverse_circuit, dtype=self.dtype, backend=self.backend)
+        # inverse circuit, reusing the conjugate transposes of the (interned) gate tensors
+        inverse_gates = [(self._get_inverse_tensor(tensor), gate_qubits) for tensor, gate_qubits in reversed(gates)]
         return input_mode_labels, input_operands, qubits_frontier, next_frontier, inverse_gates
+
+    def _get_inverse_tensor(self, tensor):
+        """Return the (cached) tensor of the inverse of a gate."""
+        inverse = self._inverse_tensors.get(id(tensor))
+        if inverse is None:
+            inverse = circ_utils.get_inverse_gate_tensor(tensor, backend=self.backend)
+            # keep a reference to the gate tensor so that its id is not reused
+            self._inverse_tensors[id(tensor)] = inverse, tensor
+            if id(tensor) in self._parametric_tensor_ids:
+                self._parametric_tensor_ids.add(id(inverse))
+        else:
+            inverse, _ = inverse
+        return inverse
+
+    def _get_reduced_tensor(self, tensor):
+        """Return the (cached) reduced tensor of a gate and the qubits it is diagonal on."""
+        reduced = self._reduced_tensors.get(id(tensor))
+        if reduced is None:
+            if id(tensor) in self._parametric_tensor_ids:
+                # the structure of a parametric gate may depend on the values of its parameters
+                reduced = tensor, (False,) * (tensor.ndim // 2)
+            else:
+                reduced = circ_utils.reduce_gate_tensor(tensor, backend=self.backend)
+            # keep a reference to the gate tensor so that its id is not reused
+            self._reduced_tensors[id(tensor)] = reduced, tensor
+        else:
+            reduced, _ = reduced
+        return reduced
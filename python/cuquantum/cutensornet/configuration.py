@@ -21,6 +21,7 @@ from ._internal import enum_utils
 from ._internal import formatters
 from ._internal.mem_limit import MEM_LIMIT_RE_PCT, MEM_LIMIT_RE_VAL, MEM_LIMIT_DOC
 from .memory import BaseCUDAMemoryManager
+from .path_cache import PathCache
 
 
 @dataclass
@@ -42,6 +43,13 @@ class NetworkOptions(object):
         allocator: An object that supports the :class:`BaseCUDAMemoryManager` protocol, used to draw device memory. If an
             allocator is not provided, a memory allocator from the library package will be used
             (:func:`torch.cuda.caching_allocator_alloc` for PyTorch operands, :func:`cupy.cuda.alloc` otherwise).
+        host_staging: A flag specifying whether operands and results on the CPU are transferred through page-locked (pinned)
+            staging buffers drawn from CuPy's pinned memory pool. The transfers are then asynchronous, which allows them to
+            overlap with the contraction in :meth:`Network.contract_batch`. The default is ``False``.
+        output_ring_size: The number of output tensors that :meth:`Network.contract` allocates once and then recycles in
+            round-robin order for operands on the GPU, instead of allocating a new output tensor for each call. The result of a call
+            remains valid only until ``output_ring_size`` further calls. If not specified, a new output tensor is allocated
+            for each call.
     """
     compute_type : Optional[int] = None
     device_id : Optional[int] = None
@@ -50,6 +58,8 @@ class NetworkOptions(object):
     memory_limit : Optional[Union[int, str]] = r'80%'
     blocking : Literal[True, "auto"] = True
     allocator : Optional[BaseCUDAMemoryManager] = None
+    host_staging : bool = False
+    output_ring_size : Optional[int] = None
 
     def __post_init__(self):
         #  Defer creating handle as well as computing the memory limit till we know the device the network is on.
@@ -76,6 +86,12 @@ class NetworkOptions(object):
         if self.allocator is not None and not isinstance(self.allocator, BaseCUDAMemoryManager):
             raise TypeError("The allocator must be an object of type that fulfils the BaseCUDAMemoryManager protocol.")
 
+        if not isinstance(self.host_staging, bool):
+            raise ValueError("The value specified for host_staging must be either True or False.")
+
+        if self.output_ring_size is not None and (not isinstance(self.output_ring_size, int) or self.output_ring_size < 1):
+            raise ValueError("The output ring size must be a positive integer.")
+
 # Generate the options dataclasses from ContractionOptimizerConfigAttributes.
 
 _create_options = enum_utils.create_options_class_from_enum
@@ -115,6 +131,8 @@ class OptimizerOptions(object):
         seed: Optional seed for the random number generator. See `CUTENSORNET_CONTRACTION_OPTIMIZER_CONFIG_SEED`.
         cost_function: The objective function to use for finding the optimal contraction path.
             See `CUTENSORNET_CONTRACTION_OPTIMIZER_CONFIG_COST_FUNCTION_OBJECTIVE`.
+        cache: A :class:`~cuquantum.PathCache` object to look up the path and slicing from before running the path finder,
+            and to store the result in afterwards. No caching is performed if not specified.
     """
     samples : Optional[int] = None
     threads : Optional[int] = None
@@ -123,6 +141,7 @@ class OptimizerOptions(object):
     reconfiguration : Optional[ReconfigOptions] = None
     seed : Optional[int] = None
     cost_function: Optional[int] = None
+    cache: Optional[PathCache] = None
 
     def _check_option(self, option, option_class, checker=None):
         if isinstance(option, option_class):
@@ -174,6 +193,8 @@ class OptimizerOptions(object):
         self._check_int(self.seed, "seed")
         if self.cost_function is not None:
             self.cost_function = cuquantum.cutensornet.OptimizerCost(self.cost_function)
+        if self.cache is not None and not isinstance(self.cache, PathCache):
+            raise TypeError("The path cache must be provided as a PathCache object.")
 
 
 @dataclass
@@ -2,5 +2,9 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+from .checkpoint import *
+from .circuit_sampler import *
 from .configuration import *
-from .tensor_network import *
\ No newline at end of file
+from .mps import *
+from .slice_scheduler import *
+from .tensor_network import *
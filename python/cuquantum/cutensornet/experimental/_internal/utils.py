@@ -18,6 +18,9 @@ def is_gate_split(inputs, outputs, algo):
     if algo.svd_method is False: # contract QR decompose
         return False
 
+    if algo.svd_method.algorithm == 'gesvdr': # randomized SVD not supported by the GateSplit kernel
+        return False
+
     if infer_output_mode_labels(inputs) != infer_output_mode_labels(outputs):
         return False
     
@@ -0,0 +1,200 @@
+# Copyright (c) 2023, NVIDIA CORPORATION & AFFILIATES
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Sliced tensor network contraction with checkpoint and resume.
+"""
+
+__all__ = ['contract_checkpointed']
+
+import dataclasses
+import json
+import logging
+import os
+import time
+
+import numpy as np
+
+from .configuration import CheckpointOptions
+from ..configuration import NetworkOptions
+from ..tensor_network import Network
+from .._internal import staging
+from .._internal import tensor_wrapper
+from .._internal import utils
+
+
+CHECKPOINT_VERSION = 1
+
+
+def _network_metadata(network):
+    """
+    Describe the network in terms of mode ordinals, which do not depend on the types of the user's mode labels.
+    """
+    return {
+        'inputs': [[int(m) for m in _input] for _input in network.inputs],
+        'output': [int(m) for m in network.output],
+        'extents': sorted([int(m), int(e)] for m, e in network.size_dict.items()),
+        'dtype': network.data_type
+    }
+
+
+def _save_checkpoint(file, metadata, partial, completed):
+    """
+    Write the checkpoint to a temporary file first and then move it in place, so that an interruption never leaves a
+    truncated checkpoint behind.
+    """
+    partial = tensor_wrapper.wrap_operand(partial)
+    partial = partial.tensor if partial.device_id is None else partial.to('cpu')
+    tmp_file = f"{os.fspath(file)}.tmp"
+    with open(tmp_file, 'wb') as f:
+        np.savez(f, metadata=np.array(json.dumps(metadata)), partial=np.asarray(partial),
+                 completed=np.fromiter(sorted(completed), dtype=np.int64, count=len(completed)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, file)
+
+
+def _load_checkpoint(file, network):
+    """
+    Load the checkpoint and check that it belongs to the network. Return the metadata, the partial result (as a tensor of the
+    same type and on the same device as the operands) and the set of completed slice IDs.
+    """
+    with np.load(file, allow_pickle=False) as data:
+        metadata = json.loads(str(data['metadata']))
+        partial, completed = data['partial'], data['completed']
+
+        if metadata.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"The checkpoint version {metadata.get('version')} is not supported (expected {CHECKPOINT_VERSION}).")
+
+        expected = _network_metadata(network)
+        mismatch = [k for k in expected if metadata[k] != expected[k]]
+        if mismatch:
+            raise ValueError(f"The checkpoint '{file}' does not match the network: the {', '.join(mismatch)} differ.")
+
+        partial = staging.to_host_tensor(partial, network.package)
+        if network.network_location != 'cpu':
+            partial = tensor_wrapper.wrap_operand(partial).to(network.device_id)
+
+        return metadata, partial, set(completed.tolist())
+
+
+def _chunks(slice_ids, chunk_size):
+    """
+    Split the sorted slice IDs into chunks, represented as ranges when contiguous.
+    """
+    for i in range(0, len(slice_ids), chunk_size):
+        chunk = slice_ids[i:i+chunk_size]
+        if chunk[-1] - chunk[0] + 1 == len(chunk):
+            chunk = range(chunk[0], chunk[-1] + 1)
+        yield chunk
+
+
+def contract_checkpointed(*operands, checkpoint, qualifiers=None, options=None, optimize=None, return_info=False):
+    r"""
+    contract_checkpointed(subscripts, *operands, checkpoint, options=None, optimize=None, return_info=False)
+
+    Evaluate the Einstein summation convention on the operands slice by slice, periodically persisting the progress to a
+    checkpoint file from which an interrupted contraction can be resumed.
+
+    The slices are contracted in chunks using :meth:`Network.contract`, and the accumulated partial result is written
+    together with the IDs of the completed slices, the contraction path and the slicing. If the checkpoint file already
+    exists, the network is rebuilt from the saved path and slicing (skipping path finding), and only the remaining slices are
+    contracted.
+
+    Args:
+        subscripts : The modes (subscripts) defining the contraction as a comma-separated sequence of characters. See
+            :func:`~cuquantum.contract` for details.
+        operands : A sequence of tensors (ndarray-like objects). The currently supported types are :class:`numpy.ndarray`,
+            :class:`cupy.ndarray`, and :class:`torch.Tensor`.
+        checkpoint : Specify the checkpoint file and frequency as a :class:`CheckpointOptions` object. Alternatively, a `dict`
+            containing the parameters for the ``CheckpointOptions`` constructor can also be provided.
+        qualifiers: Specify the tensor qualifiers as a :class:`numpy.ndarray` of :class:`~cuquantum.tensor_qualifiers_dtype`
+            objects of length equal to the number of operands.
+        options : Specify options for the tensor network as a :class:`~cuquantum.NetworkOptions` object. Alternatively, a `dict`
+            containing the parameters for the ``NetworkOptions`` constructor can also be provided. If not specified,
+            the value will be set to the default-constructed ``NetworkOptions`` object.
+        optimize :  This parameter specifies options for path optimization as an :class:`~cuquantum.OptimizerOptions` object.
+            Alternatively, a dictionary containing the parameters for the ``OptimizerOptions`` constructor can also be provided.
+            If not specified, the value will be set to the default-constructed ``OptimizerOptions`` object. It is ignored when
+            resuming from a checkpoint.
+        return_info : If true, information about the best contraction order will also be returned.
+
+    Returns:
+        If ``return_info`` is `False`, the output tensor (ndarray-like object) of the same type and on the same device
+        as the operands containing the result of the contraction; otherwise, a 2-tuple consisting of the output tensor and an
+        :class:`~cuquantum.OptimizerInfo` object that contains information about the best contraction order etc.
+
+    Notes:
+
+        - The checkpoint records the structure, extents and data type of the network, which are checked on resume, but not
+          the values of the operands. It is the caller's responsibility to resume with the same operands.
+        - A checkpoint is also written if the contraction is interrupted by an exception (including :class:`KeyboardInterrupt`).
+          Unless ``keep`` is set in ``checkpoint``, the checkpoint file is removed once the contraction is complete.
+
+    Examples:
+
+        >>> from cuquantum.cutensornet.experimental import contract_checkpointed
+        >>> import numpy as np
+        >>> a = np.random.rand(8, 8, 8)
+        >>> b = np.random.rand(8, 8, 8)
+
+        Contract the network in 16 slices, 4 slices at a time, writing a checkpoint at most once per second. Calling the
+        function again after an interruption resumes the contraction:
+
+        >>> r = contract_checkpointed('ijk,jkl->il', a, b, optimize={'slicing': {'min_slices': 16}},
+        ...                           checkpoint={'file': 'ijk_jkl.ckpt', 'interval': 1, 'chunk_size': 4})
+    """
+    checkpoint = utils.check_or_create_options(CheckpointOptions, checkpoint, "checkpoint options")
+    options = utils.check_or_create_options(NetworkOptions, options, "network options")
+    # The partial result is accumulated in the tensors returned by the network, so they must not be recycled.
+    options = dataclasses.replace(options, output_ring_size=None)
+    logger = options.logger if options.logger is not None else logging.getLogger()
+
+    with Network(*operands, qualifiers=qualifiers, options=options) as network:
+        partial, completed = None, set()
+        if os.path.exists(checkpoint.file):
+            metadata, partial, completed = _load_checkpoint(checkpoint.file, network)
+            slicing = [(network.mode_map_ord_to_user[m], e) for m, e in metadata['slices']]
+            path, info = network.contract_path(optimize={'path': metadata['path'], 'slicing': slicing})
+            logger.info(f"Resuming from the checkpoint '{checkpoint.file}' with {len(completed)} of {info.num_slices} slices completed.")
+        else:
+            path, info = network.contract_path(optimize=optimize)
+            metadata = _network_metadata(network)
+            metadata.update(version=CHECKPOINT_VERSION, path=[[int(i) for i in pair] for pair in path],
+                            slices=[[network.mode_map_user_to_ord[m], int(e)] for m, e in info.slices])
+
+        remaining = [s for s in range(info.num_slices) if s not in completed]
+        chunk_size = checkpoint.chunk_size if checkpoint.chunk_size is not None else max(1, info.num_slices // 100)
+
+        # The partial result and the completed slices are updated together with a single assignment, so that the checkpoint
+        # written upon an interruption is always consistent.
+        state = saved_state = (partial, frozenset(completed))
+        last_checkpoint = time.perf_counter()
+        try:
+            for chunk in _chunks(remaining, chunk_size):
+                result = network.contract(slices=chunk)
+                partial, completed = state
+                state = (result if partial is None else partial + result, completed.union(chunk))
+
+                if time.perf_counter() - last_checkpoint >= checkpoint.interval:
+                    _save_checkpoint(checkpoint.file, metadata, *state)
+                    logger.info(f"A checkpoint has been written with {len(state[1])} of {info.num_slices} slices completed.")
+                    last_checkpoint, saved_state = time.perf_counter(), state
+        except BaseException:
+            if state is not saved_state:
+                _save_checkpoint(checkpoint.file, metadata, *state)
+                logger.info(f"The contraction was interrupted; a checkpoint has been written with {len(state[1])} of {info.num_slices} slices completed.")
+            raise
+
+    partial, completed = state
+    if checkpoint.keep:
+        if state is not saved_state:
+            _save_checkpoint(checkpoint.file, metadata, partial, completed)
+    elif os.path.exists(checkpoint.file):
+        os.remove(checkpoint.file)
+
+    if return_info:
+        return partial, info
+
+    return partial
@@ -0,0 +1,128 @@
+# Copyright (c) 2023, NVIDIA CORPORATION & AFFILIATES
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Bitstring sampling from quantum circuits using qubit-by-qubit conditional marginals.
+"""
+
+__all__ = ['sample_circuit']
+
+import dataclasses
+import logging
+
+import numpy as np
+
+from ..configuration import NetworkOptions, OptimizerOptions
+from ..path_cache import PathCache
+from ..tensor_network import Network
+from .._internal import circuit_converter_utils as circ_utils
+from .._internal import tensor_wrapper
+from .._internal import utils
+
+
+def _conditional_probabilities(converter, qubit, prefix_qubits, prefixes, lightcone, options, optimize):
+    """
+    Compute the unnormalized probabilities of measuring the qubit in state 0 and 1 conditioned on each prefix (the states of
+    the prefix qubits), with one batched contraction of the reduced density matrix network.
+
+    Returns a NumPy array of shape (len(prefixes), 2).
+    """
+    expression, operand_sets = None, []
+    for prefix in prefixes:
+        # The fixed states only change the values of the operands, not the topology of the network.
+        expression, operands = converter.reduced_density_matrix((qubit,), fixed=dict(zip(prefix_qubits, prefix)), lightcone=lightcone)
+        operand_sets.append(operands)
+
+    with Network(*circ_utils.get_contraction_operands(expression, operand_sets[0]), options=options) as network:
+        network.contract_path(optimize=optimize)
+        rdms = network.contract_batch(operand_sets)
+    rdms = tensor_wrapper.wrap_operand(rdms)
+    rdms = np.asarray(rdms.tensor if rdms.device_id is None else rdms.to('cpu'))
+
+    probabilities = np.stack((rdms[:, 0, 0].real, rdms[:, 1, 1].real), axis=1)
+    # Remove the small negative values due to round-off errors.
+    return np.maximum(probabilities, 0)
+
+
+def sample_circuit(converter, nshots, *, qubits=None, lightcone=True, seed=None, options=None, optimize=None):
+    """
+    Draw bitstring samples from the final state of the circuit of a :class:`~cuquantum.CircuitToEinsum` object.
+
+    The qubits are sampled one at a time from their marginal distribution conditioned on the states drawn for the qubits
+    sampled before them. The shots sharing the same prefix (the states of the qubits sampled so far) are drawn together from
+    a single conditional distribution, so that the number of contractions grows with the number of distinct prefixes and
+    not with the number of shots. The conditional distributions of all the prefixes of the same length are computed from the
+    diagonals of the reduced density matrix networks (see :meth:`~cuquantum.CircuitToEinsum.reduced_density_matrix`), which
+    share the same topology and are therefore contracted with a single path and plan using
+    :meth:`~cuquantum.Network.contract_batch`. The paths are looked up in a :class:`~cuquantum.PathCache` shared by all
+    the qubits, so that the path finder only runs for the networks that differ from the ones seen before (up to the mode
+    labels and the order of the operands).
+
+    Args:
+        converter: A :class:`~cuquantum.CircuitToEinsum` object.
+        nshots: The number of samples to draw.
+        qubits: The sequence of qubits to sample, in the order in which the bits appear in the bitstrings. If not specified,
+            all the qubits of the circuit (:attr:`~cuquantum.CircuitToEinsum.qubits`) are sampled.
+        lightcone: Whether to apply the unitary reverse lightcone cancellation technique to reduce the size of the reduced
+            density matrix networks.
+        seed: The seed for the random number generator, as accepted by :func:`numpy.random.default_rng`.
+        options : Specify options for the tensor networks as a :class:`~cuquantum.NetworkOptions` object. Alternatively, a
+            `dict` containing the parameters for the ``NetworkOptions`` constructor can also be provided. If not specified,
+            the value will be set to the default-constructed ``NetworkOptions`` object.
+        optimize :  This parameter specifies options for path optimization as an :class:`~cuquantum.OptimizerOptions` object.
+            Alternatively, a dictionary containing the parameters for the ``OptimizerOptions`` constructor can also be
+            provided. If not specified, the value will be set to the default-constructed ``OptimizerOptions`` object.
+            If no :attr:`~cuquantum.OptimizerOptions.cache` is specified, an in-memory cache is created for this call;
+            provide one to also reuse the paths across calls (for example, with different numbers of shots or seeds).
+
+    Returns:
+        dict: A dictionary mapping each sampled bitstring (a string of 0/1 characters in the order of ``qubits``) to the
+        number of times it has been drawn.
+
+    Examples:
+
+        >>> import qiskit.circuit.random
+        >>> from cuquantum import CircuitToEinsum
+        >>> from cuquantum.cutensornet.experimental import sample_circuit
+        >>> qc = qiskit.circuit.random.random_circuit(num_qubits=8, depth=7)
+        >>> converter = CircuitToEinsum(qc, backend='cupy')
+
+        Draw 1000 samples of all the qubits:
+
+        >>> counts = sample_circuit(converter, 1000, seed=0)
+        >>> sum(counts.values())
+        1000
+    """
+    if nshots < 0:
+        raise ValueError(f"The number of shots must be non-negative, got {nshots}.")
+    options = utils.check_or_create_options(NetworkOptions, options, "network options")
+    logger = options.logger if options.logger is not None else logging.getLogger()
+    optimize = utils.check_or_create_options(OptimizerOptions, optimize, "path optimizer options")
+    if optimize.cache is None:
+        optimize = dataclasses.replace(optimize, cache=PathCache())
+    qubits = converter.qubits if qubits is None else list(qubits)
+    rng = np.random.default_rng(seed)
+
+    counts = {'': nshots} if nshots > 0 else {}
+    for k, qubit in enumerate(qubits):
+        if not counts:
+            break
+        prefixes = list(counts)
+        probabilities = _conditional_probabilities(converter, qubit, qubits[:k], prefixes, lightcone, options, optimize)
+        logger.info(f"Sampled qubit {k+1} of {len(qubits)} with {len(prefixes)} distinct prefixes.")
+
+        total = probabilities.sum(axis=1)
+        probability_0 = np.divide(probabilities[:, 0], total, out=np.full(len(prefixes), 0.5), where=total > 0)
+        shots_0 = rng.binomial([counts[prefix] for prefix in prefixes], probability_0)
+
+        next_counts = dict()
+        for prefix, n0 in zip(prefixes, shots_0.tolist()):
+            n1 = counts[prefix] - n0
+            if n0 > 0:
+                next_counts[prefix + '0'] = n0
+            if n1 > 0:
+                next_counts[prefix + '1'] = n1
+        counts = next_counts
+
+    return counts
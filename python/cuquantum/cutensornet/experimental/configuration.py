@@ -6,11 +6,13 @@
 Configuration for tensor network contraction and decomposition.
 """
 
-__all__ = ['ContractDecomposeAlgorithm', 'ContractDecomposeInfo']
+__all__ = ['CheckpointOptions', 'ContractDecomposeAlgorithm', 'ContractDecomposeInfo', 'SliceSchedulerOptions']
 
 import dataclasses
+import operator
+import os
 import re
-from typing import Dict, Optional, Union, Literal
+from typing import Any, Callable, Dict, Optional, Union, Literal
 
 from .. import configuration
 from ..tensor import QRMethod, SVDMethod, SVDInfo
@@ -95,3 +97,79 @@ class ContractDecomposeInfo:
             repr += f"""
     {svd_info}"""
         return repr
+
+
+@dataclasses.dataclass
+class SliceSchedulerOptions:
+
+    """A data class for specifying how the slices of a contraction are distributed by
+    :func:`~cuquantum.cutensornet.experimental.contract_sliced`.
+
+    Attributes:
+        backend: The kind of workers to distribute the slices across, either ``"multiprocessing"`` (local processes, default)
+            or ``"mpi"`` (the ranks of an MPI communicator, requires ``mpi4py``).
+        num_workers: The number of worker processes for the ``"multiprocessing"`` backend. The number of devices is used if
+            not specified.
+        comm: The MPI communicator (:class:`mpi4py.MPI.Comm` object) for the ``"mpi"`` backend. ``MPI.COMM_WORLD`` is used if
+            not specified.
+        chunk_size: The number of slices contracted by a worker in one step. A smaller chunk size allows for finer load
+            balancing at the expense of more scheduling overhead. If not specified, each worker's initial share is split into 8
+            chunks.
+        reduction: A binary function combining two partial results into one. The partial results are summed if not specified.
+    """
+
+    backend: Literal['multiprocessing', 'mpi'] = 'multiprocessing'
+    num_workers: Optional[int] = None
+    comm: Optional[Any] = None
+    chunk_size: Optional[int] = None
+    reduction: Callable = operator.add
+
+    def __post_init__(self):
+        if self.backend not in ('multiprocessing', 'mpi'):
+            raise ValueError(f"The backend must be either 'multiprocessing' or 'mpi', not '{self.backend}'.")
+
+        if self.num_workers is not None and (not isinstance(self.num_workers, int) or self.num_workers < 1):
+            raise ValueError("The number of workers must be a positive integer.")
+
+        if self.chunk_size is not None and (not isinstance(self.chunk_size, int) or self.chunk_size < 1):
+            raise ValueError("The chunk size must be a positive integer.")
+
+        if self.comm is not None and self.backend != 'mpi':
+            raise ValueError("An MPI communicator can only be specified for the 'mpi' backend.")
+
+        if not callable(self.reduction):
+            raise TypeError("The reduction must be a callable object.")
+
+
+@dataclasses.dataclass
+class CheckpointOptions:
+
+    """A data class for specifying how the progress of
+    :func:`~cuquantum.cutensornet.experimental.contract_checkpointed` is persisted.
+
+    Attributes:
+        file: The path of the checkpoint file. If the file exists, the contraction is resumed from it.
+        interval: The minimal time in seconds between two checkpoints, which must be at least 1. A checkpoint is written after
+            the first chunk of slices that completes once the interval has elapsed.
+        chunk_size: The number of slices contracted in one step, which is the granularity of the checkpoints. If not specified,
+            the slices are split into 100 chunks.
+        keep: Whether to keep the checkpoint file once the contraction is complete.
+    """
+
+    file: str
+    interval: float = 600.
+    chunk_size: Optional[int] = None
+    keep: bool = False
+
+    def __post_init__(self):
+        if not isinstance(self.file, (str, os.PathLike)):
+            raise TypeError("The checkpoint file must be specified as a path.")
+
+        if self.interval < 1:
+            raise ValueError("The checkpoint interval must be at least 1 second.")
+
+        if self.chunk_size is not None and (not isinstance(self.chunk_size, int) or self.chunk_size < 1):
+            raise ValueError("The chunk size must be a positive integer.")
+
+        if not isinstance(self.keep, bool):
+            raise ValueError("The value specified for keep must be a Python bool.")
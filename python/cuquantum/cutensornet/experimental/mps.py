@@ -0,0 +1,362 @@
+# Copyright (c) 2023, NVIDIA CORPORATION & AFFILIATES
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Matrix product state (MPS) simulation of quantum circuits based on the gate split operation.
+"""
+
+__all__ = ['MPSState']
+
+import collections
+import dataclasses
+import importlib
+import logging
+
+import numpy as np
+
+from .configuration import ContractDecomposeAlgorithm
+from .tensor_network import GateSplitter
+from .. import cutensornet as cutn
+from ..circuit_converter import CircuitToEinsum
+from ..configuration import NetworkOptions
+from ..tensor import InvalidDecompositionState
+from ..tensor_network import contract
+from .._internal import circuit_converter_utils as circ_utils
+from .._internal import tensor_wrapper
+from .._internal import utils
+from .._internal.tensor_wrapper import _get_backend_asarray_func
+
+# The gate split expression for a two-qubit gate acting on adjacent sites, with the modes of the gate ordered as output
+# qubits followed by input qubits. The second form applies the gate with its qubits in the reversed order.
+_GATE_SPLIT_EXPRESSIONS = ('ipj,jqk,rspq->irj,jsk', 'ipj,jqk,srqp->irj,jsk')
+
+_SWAP = np.eye(4)[[0, 2, 1, 3]].reshape(2, 2, 2, 2)
+
+# The maximal number of gate splitters (one for each combination of operand shapes) kept by an MPS.
+_MAX_SPLITTERS = 64
+
+
+class MPSState:
+    """
+    MPSState(num_qubits, *, dtype='complex128', backend='cupy', algorithm=None, options=None)
+
+    Create a matrix product state (MPS) in the state :math:`|00...0\\rangle`, for the simulation of quantum circuits.
+
+    The MPS is a list of rank-3 tensors, one for each qubit, whose modes are the bond (virtual) mode shared with the previous
+    tensor, the physical mode of the qubit and the bond mode shared with the next tensor. Single-qubit gates are absorbed in
+    the tensor of the qubit, and two-qubit gates are applied to adjacent tensors with the gate split operation (see
+    :class:`GateSplitter`), in which the result is decomposed with a (possibly truncated) SVD. Gates acting on non-adjacent
+    qubits are applied by moving the qubits next to each other with SWAP gates, and moving them back afterwards. The
+    discarded weights of all the truncations are accumulated in :attr:`truncation_error`. Amplitudes, expectation values and
+    the state vector are computed by contracting the MPS.
+
+    The gate splitters for the most recently used operand shapes are kept for reuse, and all of them share a single device
+    workspace sized to the largest requirement so far. A reference state vector computed on the CPU with NumPy, independent
+    of cuTensorNet, is available with ``state_vector(reference=True)`` for testing.
+
+    Args:
+        num_qubits: The number of qubits.
+        dtype: The data type of the tensors. If not specified, double complex is used.
+        backend: The package of the tensors, as a module or its name (``'cupy'``, ``'numpy'`` or ``'torch'``). If not
+            specified, ``cupy`` is used. With ``numpy``, the tensors reside on the host while all the computations are
+            performed on the GPU.
+        algorithm: The algorithm for the gate split operations as a :class:`ContractDecomposeAlgorithm` object, or a `dict`
+            containing the parameters for its constructor. The ``svd_method`` attribute controls the truncation of the bond
+            dimensions (for example, with :attr:`~cuquantum.cutensornet.tensor.SVDMethod.max_extent` and the cutoffs) and
+            must specify a partition of the singular values. If not specified, the singular values are partitioned equally
+            onto the two tensors without truncation.
+        options : Specify options for the tensor network operations as a :class:`~cuquantum.NetworkOptions` object.
+            Alternatively, a `dict` containing the parameters for the ``NetworkOptions`` constructor can also be provided. If
+            not specified, the value will be set to the default-constructed ``NetworkOptions`` object. A library handle is
+            created (and owned by the MPS) if it is not provided, and shared by all the operations.
+
+    Examples:
+
+        >>> import cirq
+        >>> from cuquantum.cutensornet.experimental import MPSState
+
+        Simulate a circuit keeping at most 16 singular values for each bond:
+
+        >>> qubits = cirq.LineQubit.range(4)
+        >>> circuit = cirq.Circuit(cirq.H(qubits[0]), [cirq.CNOT(qubits[0], q) for q in qubits[1:]])
+        >>> algorithm = {'qr_method': False, 'svd_method': {'partition': 'UV', 'max_extent': 16}}
+        >>> with MPSState(4, algorithm=algorithm) as mps:
+        ...     mps.apply_circuit(circuit)
+        ...     amplitude = mps.amplitude('1111')
+        ...     zz = mps.expectation('ZIIZ')
+        ...     print(mps.truncation_error)
+    """
+
+    def __init__(self, num_qubits, *, dtype='complex128', backend='cupy', algorithm=None, options=None):
+        """
+        __init__(num_qubits, *, dtype='complex128', backend='cupy', algorithm=None, options=None)
+        """
+        if num_qubits < 1:
+            raise ValueError(f"The number of qubits must be positive, got {num_qubits}.")
+        self.num_qubits = num_qubits
+
+        if isinstance(backend, str):
+            backend = importlib.import_module(backend)
+        self.backend = backend
+
+        if isinstance(dtype, str):
+            try:
+                dtype = getattr(backend, dtype)
+            except AttributeError:
+                dtype = getattr(backend, np.dtype(dtype).name)
+        self.dtype = dtype
+
+        if algorithm is None:
+            algorithm = {'qr_method': False, 'svd_method': {'partition': 'UV'}}
+        self.algorithm = utils.check_or_create_options(ContractDecomposeAlgorithm, algorithm, "Contract Decompose Algorithm")
+        if self.algorithm.svd_method is False or self.algorithm.svd_method.partition is None:
+            raise ValueError("The gate split algorithm must specify an SVD method with a partition of the singular values.")
+
+        options = utils.check_or_create_options(NetworkOptions, options, "Network Options")
+        self.logger = logging.getLogger() if options.logger is None else options.logger
+
+        # Create/set handle, shared by all the operations.
+        if options.handle is not None:
+            self.own_handle = False
+            self.handle = options.handle
+        else:
+            self.own_handle = True
+            with utils.device_ctx(options.device_id):
+                self.handle = cutn.create()
+        self.options = dataclasses.replace(options, handle=self.handle)
+
+        self._basis_map = circ_utils.get_basis_tensors(dtype=self.dtype, backend=self.backend)
+        self._pauli_map = circ_utils.get_pauli_tensors(dtype=self.dtype, backend=self.backend)
+        self._swap = _get_backend_asarray_func(self.backend)(_SWAP, dtype=self.dtype)
+
+        state_0 = self._basis_map['0'].reshape(1, 2, 1)
+        self.tensors = [state_0] * num_qubits
+
+        # The gate splitters reused for the gate split operations with the same operand shapes, in the LRU order.
+        self._splitters = collections.OrderedDict()
+        self._fidelity = 1.0
+
+        # Mode labels for the contraction of the MPS (bra) and its conjugate (ket), in the interleaved format.
+        self._bra_modes = [(2*i, 2*i+1, 2*i+2) for i in range(num_qubits)]
+        offset = 2*num_qubits + 1
+        self._ket_modes = [(i+offset, 2*i+1, i+1+offset) for i in range(num_qubits)]
+
+        self.valid_state = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.free()
+
+    def _check_valid_state(self, *args, **kwargs):
+        """
+        """
+        if not self.valid_state:
+            raise InvalidDecompositionState("The MPS cannot be used after resources are free'd")
+
+    @property
+    def bond_dimensions(self):
+        """The extents of the bond modes between adjacent tensors."""
+        return tuple(t.shape[2] for t in self.tensors[:-1])
+
+    @property
+    def truncation_error(self):
+        """
+        The estimated error from all the truncations, :math:`1 - \\prod_k (1 - w_k)` where :math:`w_k` are the discarded
+        weights (see :class:`~cuquantum.cutensornet.tensor.SVDInfo`) of the gate split operations so far.
+        """
+        return 1 - self._fidelity
+
+    def _split(self, a, b, gate, reversed_qubits=False):
+        """
+        Apply the two-qubit gate to the adjacent tensors with the gate split operation, reusing the gate splitter for the
+        same operand shapes and strides (the tensors resulting from a truncation are views into the untruncated outputs).
+        The least recently used gate splitter is freed when more than ``_MAX_SPLITTERS`` of them would be kept.
+        """
+        key = tuple((o.shape, o.strides) for o in tensor_wrapper.wrap_operands((a, b, gate))) + (reversed_qubits, )
+        splitter = self._splitters.get(key)
+        if splitter is None:
+            # Share the workspace of the gate splitters created so far, if any.
+            shared_with = next(iter(self._splitters.values()), None)
+            splitter = GateSplitter(_GATE_SPLIT_EXPRESSIONS[reversed_qubits], a, b, gate,
+                                    algorithm=self.algorithm, options=self.options, shared_with=shared_with)
+            self._splitters[key] = splitter
+            if len(self._splitters) > _MAX_SPLITTERS:
+                _, evicted = self._splitters.popitem(last=False)
+                evicted.free()
+        else:
+            self._splitters.move_to_end(key)
+            splitter.reset_operands(a, b, gate)
+        a, _, b, info = splitter.split(return_info=True)
+        self._fidelity *= 1 - info.svd_info.discarded_weight
+        return a, b
+
+    def _swap_sites(self, i):
+        """
+        Swap the qubits of the adjacent sites i and i+1.
+        """
+        self.tensors[i:i+2] = self._split(*self.tensors[i:i+2], self._swap)
+
+    @utils.precondition(_check_valid_state)
+    def apply_gate(self, gate, qubits):
+        """
+        Apply a one- or two-qubit gate to the MPS.
+
+        Args:
+            gate: A ndarray-like tensor object of the same package as the MPS tensors. The modes of the gate are the output
+                qubits followed by the input qubits, for example ``ABab`` for a two-qubit gate, as for the gates of
+                :attr:`~cuquantum.CircuitToEinsum.gates`.
+            qubits: A sequence of the indices of the qubits the gate acts on.
+        """
+        qubits = tuple(qubits)
+        if any(q < 0 or q >= self.num_qubits for q in qubits) or len(set(qubits)) != len(qubits):
+            raise ValueError(f"Invalid qubits {qubits} for an MPS of {self.num_qubits} qubits.")
+
+        if len(qubits) == 1:
+            i, = qubits
+            self.tensors[i] = contract('ipj,qp->iqj', self.tensors[i], gate, options=self.options)
+        elif len(qubits) == 2:
+            i, j = sorted(qubits)
+            reversed_qubits = qubits[0] > qubits[1]
+            # Move the qubit j next to the qubit i, apply the gate, and move it back.
+            for k in range(j-1, i, -1):
+                self._swap_sites(k)
+            self.tensors[i:i+2] = self._split(self.tensors[i], self.tensors[i+1], gate, reversed_qubits=reversed_qubits)
+            for k in range(i+1, j):
+                self._swap_sites(k)
+        else:
+            raise NotImplementedError("Only one- and two-qubit gates are supported.")
+
+    @utils.precondition(_check_valid_state)
+    def apply_circuit(self, circuit):
+        """
+        Apply all the gates of a circuit to the MPS.
+
+        Args:
+            circuit: A fully parameterized :class:`cirq.Circuit`, :class:`qiskit.QuantumCircuit` or
+                :class:`~cuquantum.NativeCircuit` object with the same number of qubits as the MPS. The qubits are mapped to
+                the MPS sites in the order of :attr:`~cuquantum.CircuitToEinsum.qubits`.
+        """
+        converter = CircuitToEinsum(circuit, dtype=self.dtype, backend=self.backend)
+        if len(converter.qubits) != self.num_qubits:
+            raise ValueError(f"The circuit has {len(converter.qubits)} qubits, while the MPS has {self.num_qubits} qubits.")
+        qubit_map = dict(zip(converter.qubits, range(self.num_qubits)))
+        for gate, qubits in converter.gates:
+            self.apply_gate(gate, [qubit_map[q] for q in qubits])
+
+    def _contract(self, *operands):
+        return contract(*operands, options=self.options)
+
+    @utils.precondition(_check_valid_state)
+    def state_vector(self, *, reference=False):
+        """
+        Compute the state vector of the MPS by contraction.
+
+        Args:
+            reference: If true, the tensors are contracted one after another on the CPU with :func:`numpy.tensordot` instead
+                of cuTensorNet, as an independent reference for testing.
+
+        Returns:
+            A ndarray-like object of shape ``(2,) * num_qubits`` of the same package as the MPS tensors, or a
+            :class:`numpy.ndarray` if ``reference`` is true.
+        """
+        if reference:
+            state = None
+            for t in self.tensors:
+                operand = tensor_wrapper.wrap_operand(t)
+                t = np.asarray(t if operand.device_id is None else operand.to('cpu'))
+                state = t if state is None else np.tensordot(state, t, axes=1)
+            return state.reshape(state.shape[1:-1])
+
+        operands = []
+        for t, modes in zip(self.tensors, self._bra_modes):
+            operands.extend([t, modes])
+        operands.append([modes[1] for modes in self._bra_modes])
+        return self._contract(*operands)
+
+    @utils.precondition(_check_valid_state)
+    def amplitude(self, bitstring):
+        """
+        Compute the probability amplitude of a bitstring by contraction.
+
+        Args:
+            bitstring: A sequence of 0/1 specifying the state of each qubit.
+
+        Returns:
+            The amplitude as a scalar ndarray-like object of the same package as the MPS tensors.
+        """
+        bitstring = ''.join(str(int(b)) for b in bitstring)
+        if len(bitstring) != self.num_qubits:
+            raise ValueError(f"The bitstring must have {self.num_qubits} bits, got {len(bitstring)}.")
+        operands = []
+        for t, modes, b in zip(self.tensors, self._bra_modes, bitstring):
+            operands.extend([t, modes, self._basis_map[b], (modes[1],)])
+        operands.append([])
+        return self._contract(*operands)
+
+    @utils.precondition(_check_valid_state)
+    def norm(self):
+        """
+        Compute the squared norm :math:`\\langle \\psi | \\psi \\rangle` of the MPS by contraction, which is smaller than 1 if
+        the singular values are truncated without normalization.
+        """
+        operands = []
+        for t, bra_modes, ket_modes in zip(self.tensors, self._bra_modes, self._ket_modes):
+            operands.extend([t, bra_modes, t.conj(), ket_modes])
+        operands.append([])
+        return self._contract(*operands).real
+
+    @utils.precondition(_check_valid_state)
+    def expectation(self, pauli_string):
+        """
+        Compute the expectation value :math:`\\langle \\psi | P | \\psi \\rangle / \\langle \\psi | \\psi \\rangle` of a Pauli
+        string by contraction.
+
+        Args:
+            pauli_string: The Pauli string as a string of characters 'I', 'X', 'Y' and 'Z' for each qubit, or as a dictionary
+                mapping the qubit indices to the Pauli operators (with the identity on all the other qubits).
+
+        Returns:
+            The expectation value as a scalar ndarray-like object of the same package as the MPS tensors.
+        """
+        if isinstance(pauli_string, str):
+            if len(pauli_string) != self.num_qubits:
+                raise ValueError(f"The Pauli string must have {self.num_qubits} characters, got {len(pauli_string)}.")
+            pauli_string = dict(enumerate(pauli_string))
+        operands = []
+        extra_mode = 3 * self.num_qubits + 2
+        for i, (t, bra_modes, ket_modes) in enumerate(zip(self.tensors, self._bra_modes, self._ket_modes)):
+            operands.extend([t, bra_modes])
+            pauli = pauli_string.get(i, 'I')
+            if pauli != 'I':
+                ket_modes = (ket_modes[0], extra_mode, ket_modes[2])
+                operands.extend([self._pauli_map[pauli], (extra_mode, bra_modes[1])])
+                extra_mode += 1
+            operands.extend([t.conj(), ket_modes])
+        operands.append([])
+        return self._contract(*operands) / self.norm()
+
+    def free(self):
+        """Free the MPS resources (the gate splitters and the library handle, if owned).
+
+        It is recommended that the :class:`MPSState` object be used within a context, but if it is not possible then this
+        method must be called explicitly to ensure that the resources are properly cleaned up.
+        """
+        if not self.valid_state:
+            return
+
+        try:
+            for splitter in self._splitters.values():
+                splitter.free()
+            self._splitters.clear()
+
+            if self.handle is not None and self.own_handle:
+                cutn.destroy(self.handle)
+                self.handle = None
+                self.own_handle = False
+        finally:
+            self.valid_state = False
+
+        self.logger.info("The MPS resources have been released.")
@@ -0,0 +1,362 @@
+# Copyright (c) 2023, NVIDIA CORPORATION & AFFILIATES
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Slice-parallel tensor network contraction across processes or MPI ranks.
+"""
+
+__all__ = ['contract_sliced']
+
+import dataclasses
+import logging
+import multiprocessing
+from queue import Empty
+
+import cupy as cp
+import numpy as np
+
+from .configuration import SliceSchedulerOptions
+from ..configuration import NetworkOptions, OptimizerOptions
+from ..tensor_network import Network
+from .._internal import tensor_wrapper
+from .._internal import utils
+
+
+def _next_chunk(bounds, worker, chunk_size):
+    """
+    Take the next chunk of at most ``chunk_size`` slices from the range owned by the worker. If the range is exhausted, steal
+    the upper half of the largest remaining range of another worker first.
+
+    ``bounds`` is a mutable sequence holding the ``[start, stop)`` range of slice IDs owned by each worker, flattened.
+    Returns a :class:`range` of slice IDs, or None if no slices are left.
+    """
+    start, stop = bounds[2*worker], bounds[2*worker+1]
+    if start >= stop:
+        num_workers = len(bounds) // 2
+        victim = max(range(num_workers), key=lambda w: bounds[2*w+1] - bounds[2*w])
+        remaining = bounds[2*victim+1] - bounds[2*victim]
+        if remaining <= 0:
+            return None
+        start, stop = bounds[2*victim+1] - (remaining + 1) // 2, bounds[2*victim+1]
+        bounds[2*victim+1] = start
+
+    chunk_stop = min(start + chunk_size, stop)
+    bounds[2*worker], bounds[2*worker+1] = chunk_stop, stop
+    return range(start, chunk_stop)
+
+
+def _initial_bounds(num_slices, num_workers):
+    """
+    Partition the slice IDs evenly into contiguous ranges, one per worker.
+    """
+    bounds = []
+    for w in range(num_workers):
+        bounds += [w * num_slices // num_workers, (w + 1) * num_slices // num_workers]
+    return bounds
+
+
+class _SharedBounds:
+    """
+    Slice ranges shared among local processes.
+    """
+    def __init__(self, context, bounds):
+        self.bounds = context.Array('q', bounds, lock=True)
+
+    def next_chunk(self, worker, chunk_size):
+        with self.bounds.get_lock():
+            return _next_chunk(self.bounds, worker, chunk_size)
+
+    def free(self):
+        pass
+
+
+class _MPIBounds:
+    """
+    Slice ranges shared among MPI ranks, held in a one-sided communication window on rank 0.
+    """
+    def __init__(self, comm, bounds):
+        from mpi4py import MPI
+        self.MPI = MPI
+        self.num_items = len(bounds)
+        self.local = np.asarray(bounds, dtype=np.int64) if comm.Get_rank() == 0 else np.empty(0, dtype=np.int64)
+        self.win = MPI.Win.Create(self.local, disp_unit=self.local.itemsize, comm=comm)
+        comm.Barrier()
+
+    def next_chunk(self, worker, chunk_size):
+        bounds = np.empty(self.num_items, dtype=np.int64)
+        self.win.Lock(0, self.MPI.LOCK_EXCLUSIVE)
+        try:
+            self.win.Get(bounds, 0)
+            self.win.Flush(0)
+            chunk = _next_chunk(bounds, worker, chunk_size)
+            self.win.Put(bounds, 0)
+        finally:
+            self.win.Unlock(0)
+        return chunk
+
+    def free(self):
+        self.win.Free()
+
+
+def _contract_chunks(network, bounds, worker, chunk_size, reduction):
+    """
+    Contract chunks of slices until none are left, and return the reduced partial result together with the number of slices
+    contracted.
+    """
+    partial, count = None, 0
+    while True:
+        chunk = bounds.next_chunk(worker, chunk_size)
+        if chunk is None:
+            return partial, count
+        result = network.contract(slices=chunk)
+        partial = result if partial is None else reduction(partial, result)
+        count += len(chunk)
+
+
+def _reduce(partials, reduction):
+    result = None
+    for partial in partials:
+        if partial is None:
+            continue
+        result = partial if result is None else reduction(result, partial)
+    return result
+
+
+def _tensor_positions(operands):
+    """
+    Return the positions of the tensors in the arguments of the expression, as opposed to the subscripts or mode labels
+    (see :func:`einsum_parser.parse_einsum`).
+    """
+    if isinstance(operands[0], str):
+        return range(1, len(operands))
+    # Interleaved format, with an optional output sublist at the end.
+    return range(0, len(operands) - len(operands) % 2, 2)
+
+
+def _to_host(operands):
+    """
+    Copy the tensors in the expression to the CPU, leaving the subscripts or mode labels untouched.
+    """
+    operands = list(operands)
+    for i in _tensor_positions(operands):
+        operand = tensor_wrapper.wrap_operand(operands[i])
+        if operand.device_id is not None:
+            operands[i] = operand.to('cpu')
+    return tuple(operands)
+
+
+def _process_main(worker, operands, qualifiers, options, optimize, bounds, chunk_size, reduction, queue):
+    """
+    Entry point of the worker processes of the multiprocessing backend.
+    """
+    try:
+        device_id = worker % cp.cuda.runtime.getDeviceCount()
+        options = dataclasses.replace(options, device_id=device_id)
+        with Network(*operands, qualifiers=qualifiers, options=options) as network:
+            network.contract_path(optimize=optimize)
+            partial, count = _contract_chunks(network, bounds, worker, chunk_size, reduction)
+        queue.put((worker, partial, count, None))
+    except BaseException as e:
+        queue.put((worker, None, 0, repr(e)))
+
+
+def _collect_results(queue, processes, timeout=1):
+    """
+    Collect the result reported by each worker process from the queue. The liveness of the workers is checked whenever no
+    result arrives within ``timeout`` seconds, so that a worker exiting without reporting (for example, killed by a signal)
+    raises an error instead of blocking forever.
+    """
+    results = dict()
+    while len(results) < len(processes):
+        try:
+            result = queue.get(timeout=timeout)
+            results[result[0]] = result
+            continue
+        except Empty:
+            pass
+
+        dead = [w for w, p in enumerate(processes) if w not in results and not p.is_alive()]
+        if not dead:
+            continue
+        # The results put by the workers right before exiting may still be in transit.
+        try:
+            while len(results) < len(processes):
+                result = queue.get(timeout=timeout)
+                results[result[0]] = result
+        except Empty:
+            pass
+        lost = [w for w in dead if w not in results]
+        if lost:
+            exitcodes = [processes[w].exitcode for w in lost]
+            raise RuntimeError(f"The worker processes {lost} exited without reporting a result (exit codes = {exitcodes}).")
+
+    return [results[w] for w in sorted(results)]
+
+
+def _default_chunk_size(num_slices, num_workers):
+    return max(1, num_slices // (8 * num_workers))
+
+
+def contract_sliced(*operands, qualifiers=None, options=None, optimize=None, scheduler=None, return_info=False):
+    r"""
+    contract_sliced(subscripts, *operands, options=None, optimize=None, scheduler=None, return_info=False)
+
+    Evaluate the Einstein summation convention on the operands, distributing the slices of the contraction across multiple
+    workers (local processes or MPI ranks).
+
+    The contraction path and slicing are found once, then the slice IDs ``range(num_slices)`` are partitioned evenly among the
+    workers. Each worker repeatedly contracts chunks of slices from its own range using :meth:`Network.contract` and, once its
+    range is exhausted, steals the upper half of the largest remaining range of another worker, so that the load is balanced
+    dynamically. The partial results of the workers are finally combined with the reduction specified in ``scheduler``.
+
+    Args:
+        subscripts : The modes (subscripts) defining the contraction as a comma-separated sequence of characters. See
+            :func:`~cuquantum.contract` for details.
+        operands : A sequence of tensors (ndarray-like objects). The currently supported types are :class:`numpy.ndarray`,
+            :class:`cupy.ndarray`, and :class:`torch.Tensor`.
+        qualifiers: Specify the tensor qualifiers as a :class:`numpy.ndarray` of :class:`~cuquantum.tensor_qualifiers_dtype`
+            objects of length equal to the number of operands.
+        options : Specify options for the tensor network as a :class:`~cuquantum.NetworkOptions` object. Alternatively, a `dict`
+            containing the parameters for the ``NetworkOptions`` constructor can also be provided. If not specified,
+            the value will be set to the default-constructed ``NetworkOptions`` object.
+        optimize :  This parameter specifies options for path optimization as an :class:`~cuquantum.OptimizerOptions` object.
+            Alternatively, a dictionary containing the parameters for the ``OptimizerOptions`` constructor can also be provided.
+            If not specified, the value will be set to the default-constructed ``OptimizerOptions`` object.
+        scheduler : Specify the backend, number of workers, chunk size and reduction as a :class:`SliceSchedulerOptions`
+            object. Alternatively, a `dict` containing the parameters for the ``SliceSchedulerOptions`` constructor can also be
+            provided. If not specified, the value will be set to the default-constructed ``SliceSchedulerOptions`` object.
+        return_info : If true, information about the best contraction order will also be returned.
+
+    Returns:
+        If ``return_info`` is `False`, the output tensor (ndarray-like object) of the same type and on the same device
+        as the operands containing the result of the contraction; otherwise, a 2-tuple consisting of the output tensor and an
+        :class:`~cuquantum.OptimizerInfo` object that contains information about the best contraction order etc.
+
+    Notes:
+
+        - With the ``"multiprocessing"`` backend, the operands are copied to the CPU and sent to worker processes started with
+          the ``"spawn"`` method, each of which uses device ``worker % num_devices``. The options and the reduction must
+          therefore be picklable, and the library handle in ``options`` (if any) is only used to find the path.
+        - With the ``"mpi"`` backend, this function must be called collectively by all the ranks of the communicator, each
+          providing the same network. The path and slicing are found on rank 0 and broadcast, and all ranks return the result.
+
+    Examples:
+
+        >>> from cuquantum.cutensornet.experimental import contract_sliced
+        >>> import numpy as np
+        >>> a = np.random.rand(8, 8, 8)
+        >>> b = np.random.rand(8, 8, 8)
+
+        Contract the network on two local processes, forcing at least 16 slices:
+
+        >>> r = contract_sliced('ijk,jkl->il', a, b, optimize={'slicing': {'min_slices': 16}},
+        ...                     scheduler={'num_workers': 2})
+    """
+    options = utils.check_or_create_options(NetworkOptions, options, "network options")
+    optimize = utils.check_or_create_options(OptimizerOptions, optimize, "path optimizer options")
+    scheduler = utils.check_or_create_options(SliceSchedulerOptions, scheduler, "slice scheduler options")
+    logger = options.logger if options.logger is not None else logging.getLogger()
+
+    if scheduler.backend == 'mpi':
+        return _contract_sliced_mpi(operands, qualifiers, options, optimize, scheduler, logger, return_info)
+
+    # Find the path and slicing in this process.
+    with Network(*operands, qualifiers=qualifiers, options=options) as network:
+        path, info = network.contract_path(optimize=optimize)
+        network_location, device_id = network.network_location, network.device_id
+    num_slices = info.num_slices
+
+    num_workers = scheduler.num_workers if scheduler.num_workers is not None else cp.cuda.runtime.getDeviceCount()
+    num_workers = min(num_workers, num_slices)
+    chunk_size = scheduler.chunk_size if scheduler.chunk_size is not None else _default_chunk_size(num_slices, num_workers)
+    logger.info(f"Distributing {num_slices} slices across {num_workers} worker processes in chunks of {chunk_size} slices.")
+
+    # The workers reuse the path and slicing, so that the slice IDs are consistent across them.
+    worker_optimize = OptimizerOptions(path=path, slicing=info.slices)
+    host_operands = _to_host(operands)
+    # The library handle and the allocator cannot be shared with other processes.
+    worker_options = dataclasses.replace(options, handle=None, allocator=None)
+
+    context = multiprocessing.get_context('spawn')
+    bounds = _SharedBounds(context, _initial_bounds(num_slices, num_workers))
+    queue = context.Queue()
+    processes = [context.Process(target=_process_main,
+                                 args=(w, host_operands, qualifiers, worker_options, worker_optimize, bounds, chunk_size, scheduler.reduction, queue))
+                 for w in range(num_workers)]
+    for p in processes:
+        p.start()
+
+    try:
+        results = _collect_results(queue, processes)
+    except:
+        for p in processes:
+            p.terminate()
+        raise
+    finally:
+        for p in processes:
+            p.join()
+
+    errors = [f"worker {w}: {error}" for w, _, _, error in results if error is not None]
+    if errors:
+        raise RuntimeError("The sliced contraction failed on some of the workers:\n" + "\n".join(errors))
+
+    logger.info(f"The number of slices contracted by each worker is {[count for _, _, count, _ in results]}.")
+    result = _reduce([partial for _, partial, _, _ in results], scheduler.reduction)
+
+    # Return the result on the device the operands are located.
+    if network_location != 'cpu':
+        result = tensor_wrapper.wrap_operand(result).to(device_id)
+
+    if return_info:
+        return result, info
+
+    return result
+
+
+def _contract_sliced_mpi(operands, qualifiers, options, optimize, scheduler, logger, return_info):
+    """
+    The MPI backend of :func:`contract_sliced`.
+    """
+    from mpi4py import MPI
+
+    comm = scheduler.comm if scheduler.comm is not None else MPI.COMM_WORLD
+    rank, size = comm.Get_rank(), comm.Get_size()
+
+    # Spread the ranks across the devices if the operands are on the CPU.
+    tensors = tensor_wrapper.wrap_operands([operands[i] for i in _tensor_positions(operands)])
+    if utils.get_network_device_id(tensors) is None:
+        options = dataclasses.replace(options, device_id=rank % cp.cuda.runtime.getDeviceCount())
+
+    with Network(*operands, qualifiers=qualifiers, options=options) as network:
+        # Find the path and slicing on the root, and share them with the other ranks.
+        if rank == 0:
+            path, info = network.contract_path(optimize=optimize)
+            plan = (path, info.slices)
+        else:
+            plan = None
+        path, slices = comm.bcast(plan, root=0)
+        if rank != 0:
+            path, info = network.contract_path(optimize={'path': path, 'slicing': slices})
+        num_slices = info.num_slices
+
+        chunk_size = scheduler.chunk_size if scheduler.chunk_size is not None else _default_chunk_size(num_slices, size)
+        if rank == 0:
+            logger.info(f"Distributing {num_slices} slices across {size} ranks in chunks of {chunk_size} slices.")
+
+        bounds = _MPIBounds(comm, _initial_bounds(num_slices, size))
+        try:
+            partial, count = _contract_chunks(network, bounds, rank, chunk_size, scheduler.reduction)
+            comm.Barrier()
+        finally:
+            bounds.free()
+
+    counts = comm.gather(count, root=0)
+    if rank == 0:
+        logger.info(f"The number of slices contracted by each rank is {counts}.")
+    result = _reduce(comm.allgather(partial), scheduler.reduction)
+
+    if return_info:
+        return result, info
+
+    return result
@@ -6,7 +6,7 @@
 Tensor network contraction and decomposition.
 """
 
-__all__ = ['contract_decompose']
+__all__ = ['contract_decompose', 'GateSplitter']
 
 import dataclasses
 import logging
@@ -18,132 +18,234 @@ from ..configuration import NetworkOptions
 from ..tensor import decompose, SVDInfo
 from ..tensor_network import contract
 from .._internal import decomposition_utils
+from .._internal.decomposition_utils import DecompositionResources
 from .._internal import einsum_parser
 from .._internal import tensor_wrapper
 from .._internal import utils 
 
 
 
-def _gate_split(wrapped_operands, inputs, outputs, size_dict, max_mid_extent, algorithm, options, stream, return_info):
+class GateSplitter(DecompositionResources):
     """
-    perform gate split operation by calling ``cutensornetGateSplit``
+    GateSplitter(subscripts, a, b, gate, *, algorithm=None, options=None, shared_with=None)
+
+    Create a stateful object that encapsulates a gate split problem, namely the contraction of two tensors ``a`` and ``b``
+    with a ``gate`` tensor followed by the SVD decomposition of the result, performed by the dedicated kernel
+    ``cutensornetGateSplit``. The tensor descriptors, the SVD configuration and the workspace are created once and reused for
+    all the gate split operations on operands of the same shapes, data type and strides, so that the overhead of applying
+    a gate (for example, along a matrix product state) is essentially the kernel launch.
+
+    Gate splitters for operands of different shapes (for example, for the varying bond dimensions along a matrix product
+    state) can share a single device workspace with ``shared_with``. The shared workspace is grown to the largest size needed
+    by the gate splitters so far, instead of each of them holding its own workspace.
 
     Args:
-        wrapped_operands : Thin wrapped tensors given the original input operands (not copied to device yet for Numpy ndarrays).
-        inputs : A sequence of modes for input tensors in "neutral format" (sequence of sequences).
-        outputs : A sequence of modes for output tensors in "neutral format" (sequence of sequences).
-        size_dict : A dictionary mapping the modes to the extent.
-        algorithm : A ``ContractDecomposeAlgorithm`` object specifying the algorithm for the gate split operation.
-        options : Specify options for the operation as a :class:`~cuquantum.NetworkOptions` object.
-        max_mid_extent : The maximal mid extent (reduced) expected for the output of the operation.
-        stream : Provide the CUDA stream to use for the autotuning operation. Acceptable inputs include ``cudaStream_t``
-            (as Python :class:`int`), :class:`cupy.cuda.Stream`, and :class:`torch.cuda.Stream`. If a stream is not provided,
-            the current stream will be used.
-        return_info : If true, information about the contraction and decomposition will also be returned as a ::class:`ContractDecomposeInfo` object.
+        subscripts : The mode labels (subscripts) defining the gate split operation. See :func:`contract_decompose`.
+        a, b, gate : The ndarray-like input tensors. The currently supported types are :class:`numpy.ndarray`,
+            :class:`cupy.ndarray`, and :class:`torch.Tensor`.
+        algorithm : Specify the algorithm as a :class:`cuquantum.cutensornet.experimental.ContractDecomposeAlgorithm` object
+            or a `dict` containing the parameters for its constructor. The ``svd_method`` attribute must not be `False`,
+            and the QR-assisted (reduced) gate split algorithm is used if ``qr_method`` is not `False`.
+        options : Specify options for the operation as a :class:`~cuquantum.NetworkOptions` object. Alternatively, a `dict`
+            containing the parameters for the ``NetworkOptions`` constructor can also be provided. If not specified, the value
+            will be set to the default-constructed ``NetworkOptions`` object.
+        shared_with : A :class:`GateSplitter` on the same device to share the workspace with. The operations of the gate
+            splitters sharing a workspace are ordered one after another on the device. The workspace is released when all
+            of them have been freed.
+
+    See Also:
+        :meth:`~GateSplitter.reset_operands`, :meth:`~GateSplitter.split`, :func:`contract_decompose`
+
+    Examples:
+
+        >>> from cuquantum.cutensornet.experimental import GateSplitter
+        >>> import cupy as cp
+
+        Apply the same two-qubit gate to successive pairs of tensors of the same shapes:
+
+        >>> a, b = cp.random.random((4,2,4)), cp.random.random((4,2,4))
+        >>> gate = cp.random.random((2,2,2,2))
+        >>> algorithm = {'qr_method': False, 'svd_method': {'max_extent': 4}}
+        >>> with GateSplitter('ijk,klm,jlpq->ipk,kqm', a, b, gate, algorithm=algorithm) as splitter:
+        ...     u, s, v = splitter.split()
+        ...     splitter.reset_operands(cp.random.random((4,2,4)), cp.random.random((4,2,4)), gate)
+        ...     u, s, v = splitter.split()
+
+        Share the workspace with a gate splitter for tensors of larger bond dimensions:
+
+        >>> c, d = cp.random.random((8,2,8)), cp.random.random((8,2,8))
+        >>> splitter = GateSplitter('ijk,klm,jlpq->ipk,kqm', a, b, gate, algorithm=algorithm)
+        >>> other = GateSplitter('ijk,klm,jlpq->ipk,kqm', c, d, gate, algorithm=algorithm, shared_with=splitter)
+        >>> u, s, v = splitter.split()
+        >>> u, s, v = other.split()
+        >>> other.free()
+        >>> splitter.free()
     """
-    # placeholder to help avoid resource leak
-    handle = workspace_desc = svd_config = svd_info = None
-    input_tensor_descriptors = output_tensor_descriptors = []
-    try:
-        # Options converted to an internal option
-        wrapped_operands, options, own_handle, operands_location = decomposition_utils.parse_decompose_operands_options(
-                                        options, wrapped_operands, allowed_dtype_names=decomposition_utils.DECOMPOSITION_DTYPE_NAMES)
-        
-        mid_extent = max_mid_extent if algorithm.svd_method.max_extent is None else min(max_mid_extent, algorithm.svd_method.max_extent)
 
-        handle = options.handle
+    resource_name = 'gate splitter'
 
-        package = utils.infer_object_package(wrapped_operands[0].tensor)
-        stream, stream_ctx, stream_ptr = utils.get_or_create_stream(options.device_id, stream, package)
+    def __init__(self, subscripts, a, b, gate, *, algorithm=None, options=None, shared_with=None):
+        """
+        __init__(subscripts, a, b, gate, *, algorithm=None, options=None, shared_with=None)
+        """
+        self._setup(subscripts, decomposition_utils.parse_decomposition(subscripts, a, b, gate), algorithm, options, shared_with)
 
-        options.logger.info("Calling specicialized kernel `cutensornetGateSplit` for contraction and decomposition.")
-        
-        # Create input/output tensor descriptors and empty output operands 
-        input_tensor_descriptors, output_operands, output_tensor_descriptors, s, s_ptr = decomposition_utils.create_operands_and_descriptors(
-                                    handle, wrapped_operands, size_dict, inputs, outputs, 
-                                    mid_extent, algorithm.svd_method, options.device_id, stream_ctx, options.logger)
+    @classmethod
+    def _from_parsed_decomposition(cls, subscripts, parsed_decomposition, *, algorithm=None, options=None):
+        """
+        Create a gate splitter from the result of ``decomposition_utils.parse_decomposition`` for the subscripts and the
+        operands, to avoid parsing them again.
+        """
+        splitter = cls.__new__(cls)
+        splitter._setup(subscripts, parsed_decomposition, algorithm, options, None)
+        return splitter
 
-        # Parse SVDConfig
-        svd_config = cutn.create_tensor_svd_config(handle)
-        decomposition_utils.parse_svd_config(handle, svd_config, algorithm.svd_method, options.logger)
+    def _setup(self, subscripts, parsed_decomposition, algorithm, options, shared_with):
+        """
+        Parse the algorithm and options, and create the resources for the parsed gate split problem.
+        """
+        self.algorithm = utils.check_or_create_options(ContractDecomposeAlgorithm, algorithm, "Contract Decompose Algorithm")
+        options = utils.check_or_create_options(NetworkOptions, options, "Network Options")
 
-        # Infer GateSplitAlgorithm
-        gate_algorithm = cutn.GateSplitAlgo.DIRECT if algorithm.qr_method is False else cutn.GateSplitAlgo.REDUCED
+        self.logger = logging.getLogger() if options.logger is None else options.logger
+        self.logger.info(f"CUDA runtime version = {cutn.get_cudart_version()}")
+        self.logger.info(f"cuTensorNet version = {cutn.MAJOR_VER}.{cutn.MINOR_VER}.{cutn.PATCH_VER}")
 
-        # Create workspace descriptor
-        workspace_desc = cutn.create_workspace_descriptor(handle)
-        workspace_ptr = None
+        wrapped_operands, self.inputs, self.outputs, self.size_dict, self.mode_map_user_to_ord, self.mode_map_ord_to_user, max_mid_extent = parsed_decomposition
 
-        options.logger.debug("Querying workspace size...")
+        if not is_gate_split(self.inputs, self.outputs, self.algorithm):
+            raise ValueError(f"The expression {subscripts} and the algorithm do not specify a gate split operation.")
 
-        cutn.workspace_compute_gate_split_sizes(handle, 
-            *input_tensor_descriptors, *output_tensor_descriptors, 
-            gate_algorithm, svd_config, options.compute_type, workspace_desc)
-            
-        # Allocate and set workspace
-        workspace_ptr = decomposition_utils.allocate_and_set_workspace(handle, options.allocator, workspace_desc, 
-                    cutn.WorksizePref.MIN, cutn.Memspace.DEVICE, cutn.WorkspaceKind.SCRATCH, options.device_id, 
-                    stream, stream_ctx, options.logger, task_name='contract decomposition')
-
-        options.logger.info("Starting contract-decompose (gate split)...")
-        timing =  bool(options.logger and options.logger.handlers)
-        if options.blocking:
-            options.logger.info("This call is blocking and will return only after the operation is complete.")
+        # Options converted to an internal option
+        self.operands, self.options, self.own_handle, self.operands_location = decomposition_utils.parse_decompose_operands_options(
+                                        options, wrapped_operands, allowed_dtype_names=decomposition_utils.DECOMPOSITION_DTYPE_NAMES)
+        self.handle = self.options.handle
+        self.device_id = self.options.device_id
+        self.blocking = self.options.blocking
+        self.package = utils.infer_object_package(self.operands[0].tensor)
+        self.output_class = self.operands[0].__class__
+
+        svd_method = self.algorithm.svd_method
+        self.mid_extent = max_mid_extent if svd_method.max_extent is None else min(max_mid_extent, svd_method.max_extent)
+
+        # Infer GateSplitAlgorithm
+        self.gate_algorithm = cutn.GateSplitAlgo.DIRECT if self.algorithm.qr_method is False else cutn.GateSplitAlgo.REDUCED
+
+        self._init_resources()
+
+        try:
+            self._create_workspace(shared_with)
+            self._create_operands_and_descriptors(self.operands, svd_method)
+
+            # Parse SVDConfig
+            self.svd_config = cutn.create_tensor_svd_config(self.handle)
+            decomposition_utils.parse_svd_config(self.handle, self.svd_config, svd_method, self.logger)
+            self.svd_info = cutn.create_tensor_svd_info(self.handle)
+
+            # Create workspace descriptor
+            self.workspace_desc = cutn.create_workspace_descriptor(self.handle)
+            self.logger.debug("Querying workspace size...")
+            cutn.workspace_compute_gate_split_sizes(self.handle,
+                *self.input_descriptors, *self.output_descriptors,
+                self.gate_algorithm, self.svd_config, self.options.compute_type, self.workspace_desc)
+            self._query_workspace_size()
+        except:
+            self.free()
+            raise
+
+        self.logger.info("The gate splitter has been created.")
+
+    @utils.precondition(DecompositionResources._check_valid_state)
+    def reset_operands(self, a, b, gate):
+        """Reset the operands held by this :class:`GateSplitter` instance.
+
+        This method is not needed when the operands reside on the GPU and in-place operations are used to update
+        the operand values.
+
+        This method will perform various checks on the new operands to make sure:
+
+            - The shapes, strides, datatypes match those of the old ones.
+            - The packages that the operands belong to match those of the old ones.
+            - If input tensors are on GPU, the library package and device must match.
+
+        Args:
+            a, b, gate: See :class:`GateSplitter`'s documentation.
+        """
+        self.logger.info("Resetting operands...")
+        self.operands = self._reset_operands(self.operands, tensor_wrapper.wrap_operands((a, b, gate)))
+        self.logger.info("The operands have been reset.")
+
+    @utils.precondition(DecompositionResources._check_valid_state)
+    def split(self, *, stream=None, return_info=False):
+        """Perform the gate split operation and return the results.
+
+        Args:
+            stream : Provide the CUDA stream to use for the operation. Acceptable inputs include ``cudaStream_t``
+                (as Python :class:`int`), :class:`cupy.cuda.Stream`, and :class:`torch.cuda.Stream`. If a stream is not provided,
+                the current stream will be used.
+            return_info : If true, information about the contraction and decomposition will also be returned as a
+                :class:`ContractDecomposeInfo` object.
+
+        Returns:
+            The output tensors U, S and V (and the information if ``return_info`` is `True`), as for :func:`contract_decompose`
+            with SVD decomposition.
+        """
+        stream, stream_ctx, stream_ptr = utils.get_or_create_stream(self.device_id, stream, self.package)
+
+        # Allocate the workspace once, and the outputs as needed.
+        self._allocate_workspace_memory_perhaps(stream, stream_ctx)
+        self._create_output_operands_perhaps(stream, stream_ctx)
+        output_operands, s = self._prepare_output_operands(self.output_operands, self.s)
+        s_ptr = 0 if s is None else s.data_ptr
+
+        self.logger.info("Starting contract-decompose (gate split)...")
+        timing =  bool(self.logger and self.logger.handlers)
+        if self.blocking:
+            self.logger.info("This call is blocking and will return only after the operation is complete.")
         else:
-            options.logger.info("This call is non-blocking and will return immediately after the operation is launched on the device.")
-
-        svd_info = cutn.create_tensor_svd_info(handle)
-        with utils.device_ctx(options.device_id), utils.cuda_call_ctx(stream, options.blocking, timing) as (last_compute_event, elapsed):
-            cutn.gate_split(handle, 
-                input_tensor_descriptors[0], wrapped_operands[0].data_ptr, 
-                input_tensor_descriptors[1], wrapped_operands[1].data_ptr, 
-                input_tensor_descriptors[2], wrapped_operands[2].data_ptr, 
-                output_tensor_descriptors[0], output_operands[0].data_ptr,
+            self.logger.info("This call is non-blocking and will return immediately after the operation is launched on the device.")
+
+        with utils.device_ctx(self.device_id), utils.cuda_call_ctx(stream, self.blocking, timing) as (self.last_compute_event, elapsed):
+            cutn.gate_split(self.handle,
+                self.input_descriptors[0], self.operands[0].data_ptr,
+                self.input_descriptors[1], self.operands[1].data_ptr,
+                self.input_descriptors[2], self.operands[2].data_ptr,
+                self.output_descriptors[0], output_operands[0].data_ptr,
                 s_ptr,
-                output_tensor_descriptors[1], output_operands[1].data_ptr,
-                gate_algorithm, 
-                svd_config, 
-                options.compute_type, 
-                svd_info, 
-                workspace_desc, 
+                self.output_descriptors[1], output_operands[1].data_ptr,
+                self.gate_algorithm,
+                self.svd_config,
+                self.options.compute_type,
+                self.svd_info,
+                self.workspace_desc,
                 stream_ptr)
+        self._record_compute_event()
 
         if elapsed.data is not None:
-            options.logger.info(f"The contract-decompose (gate split) operation took {elapsed.data:.3f} ms to complete.")
-            
-        svd_info_obj = SVDInfo(**decomposition_utils.get_svd_info_dict(handle, svd_info))
+            self.logger.info(f"The contract-decompose (gate split) operation took {elapsed.data:.3f} ms to complete.")
+
+        svd_info_obj = SVDInfo(**decomposition_utils.get_svd_info_dict(self.handle, self.svd_info))
 
         # Update the operand to reduced_extent if needed
-        for (wrapped_tensor, tensor_desc) in zip(output_operands, output_tensor_descriptors):
-            wrapped_tensor.reshape_to_match_tensor_descriptor(handle, tensor_desc)
-            
-        reduced_extent = svd_info_obj.reduced_extent
-        if s is not None:
-            if reduced_extent != mid_extent:
-                s.tensor = s.tensor[:reduced_extent]
-    finally:
-        # Free resources
-        decomposition_utils._destroy_tensor_descriptors(input_tensor_descriptors)
-        decomposition_utils._destroy_tensor_descriptors(output_tensor_descriptors)
-        if svd_config is not None:
-            cutn.destroy_tensor_svd_config(svd_config)
-        if svd_info is not None:
-            cutn.destroy_tensor_svd_info(svd_info)
-        if workspace_desc is not None:
-            cutn.destroy_workspace_descriptor(workspace_desc)
-
-        if own_handle and handle is not None:
-            cutn.destroy(handle)
+        self._truncate_output_operands(output_operands, s, svd_info_obj.reduced_extent)
 
-    u, v, s = [decomposition_utils.get_return_operand_data(t, operands_location) for t in output_operands + [s, ]]
-    
-    if return_info:
-        info = ContractDecomposeInfo(qr_method=algorithm.qr_method,
-                                    svd_method=algorithm.svd_method,
-                                    svd_info=svd_info_obj)
-        return u, s, v, info
-    else:
-        return u, s, v
+        u, v, s = self._return_output_operands(output_operands, s)
+
+        if return_info:
+            info = ContractDecomposeInfo(qr_method=self.algorithm.qr_method,
+                                        svd_method=self.algorithm.svd_method,
+                                        svd_info=svd_info_obj)
+            return u, s, v, info
+        else:
+            return u, s, v
+
+    def free(self):
+        """Free gate splitter resources.
+
+        It is recommended that the :class:`GateSplitter` object be used within a context, but if it is not possible then this
+        method must be called explicitly to ensure that the gate splitter resources are properly cleaned up.
+        """
+        super().free()
 
 
 def contract_decompose(subscripts, *operands, algorithm=None, options=None, optimize=None, stream=None, return_info=False):
@@ -236,6 +338,10 @@ def contract_decompose(subscripts, *operands, algorithm=None, options=None, opti
 
         >>> a, _, b = contract_decompose('ipj,jqk,pqPQ->iPx,xQk', a, b, gate, algorithm={'qr_method':{}, 'svd_method':{}})
 
+    Each call creates and frees its own :class:`GateSplitter`, so the tensor descriptors, the SVD configuration and the
+    workspace are *not* reused across calls. To apply gates repeatedly to operands of the same shapes, create a
+    :class:`GateSplitter` (or use :class:`MPSState`) and call :meth:`GateSplitter.split` instead.
+
     **Broadcasting** is supported for certain cases via ellipsis notation. 
     One may add ellipses in the input modes to represent all the modes that are not explicitly specified in the labels. 
     In such case, an ellipsis is allowed to appear in at most one of the output modes. If an ellipsis appears in one of the output modes, 
@@ -288,11 +394,14 @@ def contract_decompose(subscripts, *operands, algorithm=None, options=None, opti
     logger.info("Beginning operands parsing...")
     
     # Parse subscipts and operands
-    wrapped_operands, inputs, outputs, size_dict, mode_map_user_to_ord, mode_map_ord_to_user, max_mid_extent = decomposition_utils.parse_decomposition(subscripts, *operands)
+    parsed_decomposition = decomposition_utils.parse_decomposition(subscripts, *operands)
+    wrapped_operands, inputs, outputs, size_dict, mode_map_user_to_ord, mode_map_ord_to_user, max_mid_extent = parsed_decomposition
 
     if is_gate_split(inputs, outputs, algorithm):
         # dedicated kernel for GateSplit problem
-        return _gate_split(wrapped_operands, inputs, outputs, size_dict, max_mid_extent, algorithm, options, stream, return_info)
+        logger.info("Calling specicialized kernel `cutensornetGateSplit` for contraction and decomposition.")
+        with GateSplitter._from_parsed_decomposition(subscripts, parsed_decomposition, algorithm=algorithm, options=options) as splitter:
+            return splitter.split(stream=stream, return_info=return_info)
     
     try:
         # contraction followed by decomposition
@@ -346,8 +455,8 @@ def contract_decompose(subscripts, *operands, algorithm=None, options=None, opti
             results = maybe_truncate_qr_output_operands(results, outputs, max_mid_extent)
             if operands_location == 'cpu':
                 results = [tensor_wrapper.wrap_operand(o).to('cpu') for o in results]
-        elif algorithm.svd_method and algorithm.qr_method is False:
-            # contract and SVD decompose
+        elif algorithm.svd_method and (algorithm.qr_method is False or algorithm.svd_method.algorithm == 'gesvdr'):
+            # contract and SVD decompose (the randomized SVD does not need the QR reduction)
             
             use_max_mid_extent = algorithm.svd_method.max_extent is None
             if use_max_mid_extent:
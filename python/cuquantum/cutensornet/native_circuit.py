@@ -0,0 +1,203 @@
+# Copyright (c) 2023, NVIDIA CORPORATION & AFFILIATES
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+A lightweight, array-backed quantum circuit representation that can be converted by :class:`CircuitToEinsum` without Qiskit
+or Cirq.
+"""
+
+__all__ = ['NativeCircuit']
+
+import numpy as np
+
+
+# The supported gates as (name, number of qubits, number of parameters). The number of qubits of a unitary gate is given by its
+# matrix.
+GATE_SPECS = (
+    ('i', 1, 0), ('x', 1, 0), ('y', 1, 0), ('z', 1, 0), ('h', 1, 0), ('s', 1, 0), ('sdg', 1, 0), ('t', 1, 0), ('tdg', 1, 0),
+    ('sx', 1, 0), ('sxdg', 1, 0), ('rx', 1, 1), ('ry', 1, 1), ('rz', 1, 1), ('p', 1, 1), ('u', 1, 3),
+    ('cx', 2, 0), ('cy', 2, 0), ('cz', 2, 0), ('swap', 2, 0), ('crx', 2, 1), ('cry', 2, 1), ('crz', 2, 1), ('cp', 2, 1),
+    ('rxx', 2, 1), ('ryy', 2, 1), ('rzz', 2, 1),
+    ('ccx', 3, 0), ('cswap', 3, 0),
+    ('unitary', 0, 1),
+)
+
+OPCODES = {name: opcode for opcode, (name, _, _) in enumerate(GATE_SPECS)}
+UNITARY = OPCODES['unitary']
+GATE_NUM_QUBITS = np.array([num_qubits for _, num_qubits, _ in GATE_SPECS])
+GATE_NUM_PARAMS = np.array([num_params for _, _, num_params in GATE_SPECS])
+MAX_NUM_PARAMS = int(GATE_NUM_PARAMS.max())
+
+
+def _readonly(array):
+    array.flags.writeable = False
+    return array
+
+
+class NativeCircuit:
+    r"""
+    NativeCircuit(num_qubits, opcodes, qubits, params=None, unitaries=None)
+
+    A quantum circuit of N gates acting on qubits ``0, 1, ..., num_qubits-1``, represented by arrays of gate opcodes, qubit
+    indices and parameters. It can be passed to :class:`CircuitToEinsum` like a :class:`cirq.Circuit` or a
+    :class:`qiskit.QuantumCircuit`, without importing either package, and is converted with vectorized operations.
+
+    The supported gates and their opcodes are given by :attr:`NativeCircuit.OPCODES`. The gates are defined as in
+    Qiskit's standard gates (for example, ``u`` takes the parameters ``(theta, phi, lambda)`` and ``rzz`` is
+    :math:`\exp(-i \theta Z \otimes Z / 2)`), except that the first qubit of a gate is the most significant one in its
+    matrix. For controlled gates, the control qubits therefore come first. The ``unitary`` gate applies the matrix
+    ``unitaries[params[k, 0]]``, whose size determines the number of qubits.
+
+    Args:
+        num_qubits: The number of qubits in the circuit.
+        opcodes: The opcodes (as integers) or the names of the gates, as an array-like object of shape (N,).
+        qubits: The qubits each gate acts on, as an integer array-like object of shape (N, K), where K is at least the largest
+            number of qubits of a gate. Unused entries must be set to -1.
+        params: The parameters of the gates, as a real array-like object of shape (N, P) with P at most 3. Unused entries are
+            ignored. If not specified, all the gates must be non-parametric.
+        unitaries: A sequence of unitary matrices used by the ``unitary`` gates.
+
+    Examples:
+
+        >>> from cuquantum import CircuitToEinsum, NativeCircuit
+        >>> circuit = NativeCircuit.from_gates(3, [('h', (0,)), ('cx', (0, 1)), ('rz', (2,), (0.5,))])
+        >>> converter = CircuitToEinsum(circuit)
+    """
+
+    OPCODES = OPCODES
+
+    def __init__(self, num_qubits, opcodes, qubits, params=None, unitaries=None):
+        num_qubits = int(num_qubits)
+        if num_qubits < 1:
+            raise ValueError(f"The number of qubits must be positive, got {num_qubits}.")
+
+        opcodes = np.asarray(opcodes)
+        if opcodes.dtype.kind in 'UO':
+            try:
+                opcodes = np.array([OPCODES[name] for name in opcodes.tolist()], dtype=np.int64)
+            except KeyError as e:
+                raise ValueError(f"The gate {e} is not supported. The supported gates are {tuple(OPCODES)}.") from None
+        opcodes = np.array(opcodes, dtype=np.int64).reshape(-1)
+        num_gates = len(opcodes)
+        if np.any((opcodes < 0) | (opcodes >= len(GATE_SPECS))):
+            raise ValueError(f"The opcodes must be in the range [0, {len(GATE_SPECS)}).")
+
+        unitaries = [np.asarray(u) for u in unitaries] if unitaries is not None else []
+        for u in unitaries:
+            if u.ndim != 2 or u.shape[0] != u.shape[1] or u.shape[0] < 2 or u.shape[0] & (u.shape[0] - 1):
+                raise ValueError(f"The unitary matrices must be square with a power of 2 size, got shape {u.shape}.")
+
+        if params is None:
+            params = np.zeros((num_gates, 0))
+        params = np.asarray(params, dtype=np.float64)
+        if params.ndim != 2 or len(params) != num_gates:
+            raise ValueError(f"The params array must be of shape ({num_gates}, P), got {params.shape}.")
+        if params.shape[1] > MAX_NUM_PARAMS:
+            raise ValueError(f"The gates take at most {MAX_NUM_PARAMS} parameters, got {params.shape[1]} per gate.")
+        params = np.pad(params, ((0, 0), (0, MAX_NUM_PARAMS - params.shape[1])))
+        num_params = GATE_NUM_PARAMS[opcodes]
+        # Clear the unused parameters, so that identical gates have identical rows.
+        params = np.where(np.arange(MAX_NUM_PARAMS) < num_params[:, None], params, 0.)
+        if not np.all(np.isfinite(params)):
+            raise ValueError("The gate parameters must be finite.")
+
+        is_unitary = opcodes == UNITARY
+        unitary_ids = params[is_unitary, 0]
+        if np.any((unitary_ids != np.round(unitary_ids)) | (unitary_ids < 0) | (unitary_ids >= len(unitaries))):
+            raise ValueError(f"The unitary gates must refer to one of the {len(unitaries)} unitary matrices.")
+        arity = GATE_NUM_QUBITS[opcodes]
+        if len(unitaries):
+            unitary_num_qubits = np.array([u.shape[0].bit_length() - 1 for u in unitaries])
+            arity[is_unitary] = unitary_num_qubits[unitary_ids.astype(np.int64)]
+
+        qubits = np.array(qubits, dtype=np.int64)
+        if qubits.ndim != 2 or len(qubits) != num_gates:
+            raise ValueError(f"The qubits array must be of shape ({num_gates}, K), got {qubits.shape}.")
+        max_arity = int(arity.max(initial=1))
+        if qubits.shape[1] < max_arity:
+            raise ValueError(f"The qubits array must have at least {max_arity} columns, got {qubits.shape[1]}.")
+        used = np.arange(qubits.shape[1]) < arity[:, None]
+        if not np.all(np.where(used, (qubits >= 0) & (qubits < num_qubits), qubits == -1)):
+            raise ValueError(f"The gates must act on qubits in the range [0, {num_qubits}), with the unused entries set to -1.")
+        qubits = qubits[:, :max_arity]
+        for i in range(max_arity):
+            for j in range(i+1, max_arity):
+                if np.any(used[:, j] & (qubits[:, i] == qubits[:, j])):
+                    raise ValueError("The qubits of a gate must be distinct.")
+
+        self._num_qubits = num_qubits
+        self._opcodes = _readonly(opcodes)
+        self._qubits = _readonly(qubits)
+        self._params = _readonly(params)
+        self._arity = _readonly(arity)
+        self._unitaries = tuple(_readonly(u.copy()) for u in unitaries)
+
+    @classmethod
+    def from_gates(cls, num_qubits, gates):
+        """
+        Create a circuit from a sequence of gates.
+
+        Args:
+            num_qubits: The number of qubits in the circuit.
+            gates: A sequence of 2-tuples ``(name, qubits)`` or 3-tuples ``(name, qubits, params)``. For the ``unitary``
+                gate, ``params`` is the unitary matrix.
+
+        Returns:
+            A :class:`NativeCircuit` object.
+        """
+        opcodes, params, unitaries = [], [], []
+        max_arity = max((len(gate[1]) for gate in gates), default=1)
+        qubits = np.full((len(gates), max_arity), -1, dtype=np.int64)
+        for k, (name, gate_qubits, *gate_params) in enumerate(gates):
+            qubits[k, :len(gate_qubits)] = gate_qubits
+            opcodes.append(name)
+            gate_params = gate_params[0] if gate_params else ()
+            if name == 'unitary':
+                unitaries.append(gate_params)
+                gate_params = (len(unitaries) - 1,)
+            params.append(tuple(gate_params) + (0.,) * (MAX_NUM_PARAMS - len(gate_params)))
+        return cls(num_qubits, np.array(opcodes, dtype=object), qubits, np.array(params).reshape(len(gates), MAX_NUM_PARAMS), unitaries)
+
+    def __len__(self):
+        return len(self._opcodes)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} with {self._num_qubits} qubits and {len(self)} gates>"
+
+    @property
+    def num_qubits(self):
+        """The number of qubits in the circuit."""
+        return self._num_qubits
+
+    @property
+    def opcodes(self):
+        """The opcodes of the gates as a read-only array of shape (N,)."""
+        return self._opcodes
+
+    @property
+    def qubits(self):
+        """The qubits of the gates as a read-only array of shape (N, K), padded with -1."""
+        return self._qubits
+
+    @property
+    def params(self):
+        """The parameters of the gates as a read-only array of shape (N, 3), padded with zeros."""
+        return self._params
+
+    @property
+    def unitaries(self):
+        """The unitary matrices used by the ``unitary`` gates."""
+        return self._unitaries
+
+    @property
+    def num_gate_qubits(self):
+        """The number of qubits of each gate as a read-only array of shape (N,)."""
+        return self._arity
+
+    def select(self, indices):
+        """
+        Return the circuit formed by a subset of the gates, specified by their indices (or a boolean mask).
+        """
+        return NativeCircuit(self._num_qubits, self._opcodes[indices], self._qubits[indices], self._params[indices],
+                             self._unitaries)
@@ -0,0 +1,265 @@
+# Copyright (c) 2023, NVIDIA CORPORATION & AFFILIATES
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+A content-addressed cache for contraction paths and slicing configurations.
+"""
+
+__all__ = ['PathCache']
+
+import collections
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+
+_CACHE_FORMAT_VERSION = 1
+_ENTRY_SUFFIX = '.json'
+
+PathCacheEntry = collections.namedtuple('PathCacheEntry', ['path', 'slices'])
+
+
+def _default_serializer(obj):
+    """
+    Serialize objects that are not natively supported by JSON (enums, Ellipsis, user-defined mode labels etc).
+    """
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    return repr(obj)
+
+
+class PathCache:
+    """
+    PathCache(directory=None, capacity=1024)
+
+    A cache of contraction paths and slicing configurations, addressed by the content of the tensor network (topology,
+    extents, data type and memory limit) as well as the path optimizer options. The network is brought into a canonical
+    form first, so that networks which only differ in the mode labels or the order of the operands (for example, the
+    amplitudes of a circuit for different bitstrings) share the same entry, with the path and slicing mapped accordingly.
+
+    When a :class:`PathCache` object is provided to :class:`~cuquantum.OptimizerOptions`, :meth:`Network.contract_path`
+    first looks up the network in the cache. On a hit, the cached path and slicing are set directly and the path finder is
+    skipped entirely. On a miss, the path is computed as usual and the result is stored in the cache for later use.
+
+    Args:
+        directory: The directory for the on-disk store. Each entry is saved as a separate file, so that the cache persists
+            across processes and can be shared among them. If not specified, the cache only resides in memory.
+        capacity: The maximal number of entries kept in the cache. The least recently used entries are evicted (both in
+            memory and on disk) once the capacity is exceeded.
+
+    Attributes:
+        hits: The number of lookups that found an entry in the cache.
+        misses: The number of lookups that did not find an entry in the cache.
+        evictions: The number of entries evicted from the cache.
+
+    Examples:
+
+        >>> from cuquantum import contract, PathCache
+        >>> import numpy as np
+        >>> a = np.random.rand(8, 8)
+        >>> cache = PathCache('/tmp/cuquantum_path_cache')
+        >>> for _ in range(3):
+        ...     r = contract('ij,jk,kl->il', a, a, a, optimize={'cache': cache})
+        >>> print(cache.hits, cache.misses)
+        2 1
+    """
+
+    def __init__(self, directory=None, capacity=1024):
+        if not isinstance(capacity, int) or capacity < 1:
+            raise ValueError(f"The capacity of the path cache must be a positive integer, not '{capacity}'.")
+
+        self.directory = directory
+        self.capacity = capacity
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.RLock()
+        # Map from key to the entry (or None if the entry is on disk but not loaded yet), in least-to-most recently used order.
+        self._entries = collections.OrderedDict()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._scan_directory()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __str__(self):
+        s = f"""Path Cache:
+    Location = {'memory' if self.directory is None else self.directory}
+    Number of entries = {len(self)} (capacity = {self.capacity})
+    Hits = {self.hits}, misses = {self.misses}, evictions = {self.evictions}"""
+        return s
+
+    def _entry_file(self, key):
+        return os.path.join(self.directory, key + _ENTRY_SUFFIX)
+
+    def _scan_directory(self):
+        """
+        Register the entries already present on disk in least-to-most recently used order, without loading them.
+        """
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(_ENTRY_SUFFIX):
+                continue
+            try:
+                files.append((os.path.getmtime(os.path.join(self.directory, name)), name[:-len(_ENTRY_SUFFIX)]))
+            except OSError:
+                continue    # The file has been removed concurrently.
+
+        for _, key in sorted(files):
+            self._entries[key] = None
+        self._evict_perhaps()
+
+    def _load(self, key):
+        """
+        Load an entry from disk, returning None if it's missing, corrupted or written in an incompatible format.
+        """
+        try:
+            with open(self._entry_file(key)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get('version') != _CACHE_FORMAT_VERSION:
+            return None
+
+        return PathCacheEntry(tuple(map(tuple, data['path'])), tuple(map(tuple, data['slices'])))
+
+    def _store(self, key, entry):
+        """
+        Atomically write an entry to disk.
+        """
+        data = {'version': _CACHE_FORMAT_VERSION, 'path': entry.path, 'slices': entry.slices}
+        fd, name = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, default=int)
+            os.replace(name, self._entry_file(key))
+        except BaseException:
+            if os.path.exists(name):
+                os.remove(name)
+            raise
+
+    def _touch(self, key):
+        """
+        Record the access time on disk so that the LRU order is shared with other processes.
+        """
+        try:
+            os.utime(self._entry_file(key))
+        except OSError:
+            pass
+
+    def _evict_perhaps(self):
+        while len(self._entries) > self.capacity:
+            key, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            if self.directory is not None:
+                try:
+                    os.remove(self._entry_file(key))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def compute_key(fingerprint, data_type, memory_limit, optimize):
+        """
+        Compute the key for a tensor network.
+
+        Args:
+            fingerprint: The fingerprint of the canonical form of the network (topology and extents), which is shared by
+                networks that only differ in the mode labels or the order of the operands.
+            data_type: The name of the data type of the network operands.
+            memory_limit: The memory limit in bytes.
+            optimize: The :class:`~cuquantum.OptimizerOptions` object used for path finding.
+
+        Returns:
+            str: A hexadecimal digest identifying the network and the path finding settings.
+        """
+        # Options that do not affect the path found (the cache itself, the number of threads) are not part of the key.
+        settings = {f.name: getattr(optimize, f.name) for f in dataclasses.fields(optimize) if f.name not in ('cache', 'threads')}
+        content = {
+            'network': fingerprint,
+            'data_type': data_type,
+            'memory_limit': int(memory_limit),
+            'optimize': settings
+        }
+        content = json.dumps(content, sort_keys=True, default=_default_serializer)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get(self, key):
+        """
+        Look up an entry in the cache.
+
+        Args:
+            key: The key computed using :meth:`compute_key`.
+
+        Returns:
+            A ``(path, slices)`` named tuple where ``path`` is in the :func:`numpy.einsum_path` format and ``slices`` is a
+            sequence of ``(sliced mode ordinal, sliced extent)`` pairs, both referring to the canonical form of the
+            network, or `None` if the key is not found.
+        """
+        with self._lock:
+            if key not in self._entries and self.directory is not None and os.path.exists(self._entry_file(key)):
+                # The entry has been added by another process.
+                self._entries[key] = None
+
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+            entry = self._entries[key]
+            if entry is None:
+                entry = self._load(key)
+                if entry is None:
+                    del self._entries[key]
+                    self.misses += 1
+                    return None
+                self._entries[key] = entry
+
+            self._entries.move_to_end(key)
+            if self.directory is not None:
+                self._touch(key)
+            self._evict_perhaps()
+            self.hits += 1
+
+            return entry
+
+    def put(self, key, path, slices=()):
+        """
+        Add an entry to the cache, evicting the least recently used entries if the capacity is exceeded.
+
+        Args:
+            key: The key computed using :meth:`compute_key`.
+            path: The contraction path in the :func:`numpy.einsum_path` format for the canonical form of the network.
+            slices: A sequence of ``(sliced mode ordinal, sliced extent)`` pairs for the canonical form of the network.
+        """
+        entry = PathCacheEntry(tuple((int(i), int(j)) for i, j in path), tuple((int(m), int(e)) for m, e in slices))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if self.directory is not None:
+                self._store(key, entry)
+            self._evict_perhaps()
+
+    def clear(self):
+        """
+        Remove all entries from the cache (including the on-disk store) and reset the counters.
+        """
+        with self._lock:
+            if self.directory is not None:
+                for key in self._entries:
+                    try:
+                        os.remove(self._entry_file(key))
+                    except OSError:
+                        pass
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
@@ -6,8 +6,9 @@
 Computational primitives for tensors
 """
 
-__all__ = ['decompose', 'DecompositionOptions', 'QRMethod', 'SVDInfo', 'SVDMethod']
+__all__ = ['decompose', 'decompose_batch', 'Decomposer', 'DecompositionOptions', 'QRMethod', 'SVDInfo', 'SVDMethod']
 
+import collections.abc
 import dataclasses
 import logging
 import re
@@ -16,12 +17,15 @@ from typing import Optional
 from . import cutensornet as cutn
 from .configuration import NetworkOptions
 from ._internal import decomposition_utils
+from ._internal.decomposition_utils import DecompositionResources, InvalidDecompositionState
+from ._internal import tensor_wrapper
 from ._internal import utils 
 
 
 DecompositionOptions = dataclasses.make_dataclass("DecompositionOptions", fields=[(field.name, field.type, field) for field in dataclasses.fields(NetworkOptions)], bases=(NetworkOptions,))
 DecompositionOptions.__doc__ = re.sub(":class:`cuquantum.Network` object", ":func:`cuquantum.cutensornet.tensor.decompose` and :func:`cuquantum.cutensornet.experimental.contract_decompose` functions", NetworkOptions.__doc__)
 
+
 def decompose(
     subscripts, 
     operand, 
@@ -200,144 +204,410 @@ def decompose(
         >>> T = torch.rand(4,4,6,6, device=f'cuda:{dev}')
         >>> q, r = decompose('ijab->ika,kjb', T)
     """
-    options = utils.check_or_create_options(DecompositionOptions, options, "decomposition options")
+    method = _parse_method(method)
+    if isinstance(method, SVDMethod) and method.algorithm == 'gesvdr':
+        return _randomized_svd_decompose(subscripts, operand, method, options, stream, return_info)
+
+    with Decomposer(subscripts, operand, method=method, options=options) as decomposer:
+        return decomposer.decompose(stream=stream, return_info=return_info)
+
 
+def _randomized_svd_decompose(subscripts, operand, method, options, stream, return_info):
+    """
+    Perform the randomized SVD of the operand, see :attr:`SVDMethod.algorithm`.
+    """
+    options = utils.check_or_create_options(DecompositionOptions, options, "decomposition options")
     logger = logging.getLogger() if options.logger is None else options.logger
-    logger.info(f"CUDA runtime version = {cutn.get_cudart_version()}")
-    logger.info(f"cuTensorNet version = {cutn.MAJOR_VER}.{cutn.MINOR_VER}.{cutn.PATCH_VER}")
     logger.info("Beginning operands parsing...")
 
-    # Infer the correct decomposition method, QRMethod by default
+    wrapped_operands, inputs, outputs, size_dict, *_ = decomposition_utils.parse_decomposition(subscripts, operand)
+    if len(wrapped_operands) != 1:
+        raise ValueError(f"only one input operand expected for tensor.decompose, found {len(wrapped_operands)}")
+    dtype_name = utils.get_operands_dtype(wrapped_operands)
+    if dtype_name not in decomposition_utils.DECOMPOSITION_DTYPE_NAMES:
+        raise ValueError(f"dtype {dtype_name} not supported")
+
+    u, s, v, info = decomposition_utils.randomized_svd(wrapped_operands[0], inputs, outputs, size_dict, method, stream, logger)
+    if return_info:
+        return u, s, v, SVDInfo(**info)
+    else:
+        return u, s, v
+
+
+def decompose_batch(
+    subscripts,
+    operands,
+    *,
+    method=None,
+    options=None,
+    stream=None,
+    return_info=False
+):
+    r"""
+    decompose_batch(subscripts, operands, *, method=None, options=None, stream=None, return_info=False)
+
+    Perform the same tensor decomposition on a batch of operands of the same shape, data type and strides.
+
+    The decomposition is specified for a single item of the batch, as for :func:`decompose`. The parsing of the expression,
+    the tensor descriptors, the decomposition configuration and the workspace are set up once and shared by all the items,
+    whose results are written into stacked output tensors. For operands on the CPU, the batch is transferred to the device
+    and the stacked results back to the host at once. This amortizes the setup cost when decomposing a large number of
+    small tensors, for example the tensors of all the bonds of a layer of a matrix product state.
+
+    Args:
+        subscripts : The mode labels (subscripts) defining the decomposition of each item of the batch. See :func:`decompose`.
+        operands : The batch of operands, as a ndarray-like tensor object with the items stacked along its leading mode, or as a
+            sequence of ndarray-like tensor objects of the same shape. The currently supported types are :class:`numpy.ndarray`,
+            :class:`cupy.ndarray`, and :class:`torch.Tensor`.
+        method : Specify decomposition method as a :class:`cuquantum.cutensornet.tensor.QRMethod` or a :class:`cuquantum.cutensornet.tensor.SVDMethod` object,
+            or a `dict` containing the parameters for their constructors. See :func:`decompose`.
+        options : Specify the computational options for the decomposition as a :class:`cuquantum.cutensornet.tensor.DecompositionOptions` object,
+            or a `dict` containing the parameters for its constructor. See :func:`decompose`.
+        stream: Provide the CUDA stream to use for the decomposition. Acceptable inputs include ``cudaStream_t``
+            (as Python :class:`int`), :class:`cupy.cuda.Stream`, and :class:`torch.cuda.Stream`. If a stream is not provided,
+            the current stream will be used.
+        return_info : If true, a list with the :class:`cuquantum.cutensornet.tensor.SVDInfo` object of each item will also be
+            returned. Currently this option is only supported for SVD decomposition.
+
+    Returns:
+        The stacked results of the decomposition with the batch mode leading, as for :func:`decompose` (followed by the list
+        of the ``SVDInfo`` objects if ``return_info`` is `True`). The output tensors are of the same type and on the same
+        device as the operands. If the number of singular values retained by the SVD truncation differs among the items,
+        the shared mode of the outputs has the largest reduced extent in the batch, and the results of the other items are
+        padded with zeros (see :attr:`SVDInfo.reduced_extent`), which leaves the decomposed tensors unchanged.
+
+    Examples:
+
+        >>> from cuquantum.cutensornet.tensor import decompose_batch, SVDMethod
+        >>> import cupy as cp
+
+        Perform the truncated SVD of 1000 matrices of size 64x64 at once:
+
+        >>> T = cp.random.random((1000, 64, 64))
+        >>> u, s, v, info = decompose_batch('ij->ik,kj', T, method=SVDMethod(max_extent=16, rel_cutoff=1e-2), return_info=True)
+        >>> print(u.shape, s.shape, v.shape) # (1000, 64, 16) (1000, 16) (1000, 16, 64)
+        >>> print(info[0].reduced_extent)
+    """
+    options = utils.check_or_create_options(DecompositionOptions, options, "decomposition options")
+    logger = logging.getLogger() if options.logger is None else options.logger
+
+    # Wrap the batch, and copy it to the device at once if it is on the CPU.
+    if isinstance(operands, collections.abc.Sequence):
+        if len(operands) == 0:
+            raise ValueError("The batch of operands must not be empty.")
+        wrapped_operands = tensor_wrapper.wrap_operands(operands)
+        utils.check_operands_match(wrapped_operands[:1] * len(operands), wrapped_operands, 'dtype', "data type")
+        utils.check_operands_match(wrapped_operands[:1] * len(operands), wrapped_operands, 'shape', 'shape')
+        device_id = utils.get_network_device_id(wrapped_operands)
+        if device_id is None:
+            logger.info(f"Begin transferring input data from host to device {options.device_id}")
+            items = [o.to(options.device_id) for o in wrapped_operands]
+            logger.info("Input data transfer finished")
+        else:
+            items = [o.tensor for o in wrapped_operands]
+    else:
+        wrapped_operand = tensor_wrapper.wrap_operand(operands)
+        if len(wrapped_operand.shape) == 0 or wrapped_operand.shape[0] == 0:
+            raise ValueError("The batch of operands must have a non-empty leading mode.")
+        device_id = wrapped_operand.device_id
+        if device_id is None:
+            logger.info(f"Begin transferring input data from host to device {options.device_id}")
+            stacked_operand = wrapped_operand.to(options.device_id)
+            logger.info("Input data transfer finished")
+        else:
+            stacked_operand = wrapped_operand.tensor
+        items = [stacked_operand[k] for k in range(wrapped_operand.shape[0])]
+    operands_location = 'cpu' if device_id is None else 'cuda'
+    batch_size = len(items)
+
+    with Decomposer(subscripts, items[0], method=method, options=options) as decomposer:
+        if return_info and not isinstance(decomposer.method, SVDMethod):
+            raise ValueError("``return_info`` is only supported for SVDMethod")
+
+        stream, stream_ctx, stream_ptr = utils.get_or_create_stream(decomposer.device_id, stream, decomposer.package)
+        decomposer._allocate_workspace_memory_perhaps(stream, stream_ctx)
+
+        # Create the stacked outputs, the results of each item are written into the corresponding slices.
+        logger.debug("Beginning stacked output tensors creation...")
+        with utils.device_ctx(decomposer.device_id):
+            stacked_outputs = [utils.create_empty_tensor(decomposer.output_class, (batch_size, ) + extents, decomposer.data_type, decomposer.device_id, stream_ctx)
+                               for extents in decomposer.output_extents]
+            stacked_s = None
+            if decomposer.s_data_type is not None:
+                stacked_s = utils.create_empty_tensor(decomposer.output_class, (batch_size, decomposer.mid_extent), decomposer.s_data_type, decomposer.device_id, stream_ctx)
+        logger.debug("The stacked output tensors have been created.")
+
+        logger.info(f"Starting the decomposition of a batch of {batch_size} operands...")
+        results, svd_info = [], []
+        for k, item in enumerate(items):
+            if k > 0:
+                decomposer.reset_operand(item)
+            item_outputs = [tensor_wrapper.wrap_operand(o.tensor[k]) for o in stacked_outputs]
+            item_s = None if stacked_s is None else tensor_wrapper.wrap_operand(stacked_s.tensor[k])
+            item_outputs, item_s, item_info = decomposer._decompose_into(item_outputs, item_s, stream, stream_ptr)
+            results.append((item_outputs, item_s))
+            svd_info.append(item_info)
+
+        # Pad the results with zeros to the largest reduced extent if the truncation differs among the items.
+        if isinstance(decomposer.method, SVDMethod) and any(info.reduced_extent != decomposer.mid_extent for info in svd_info):
+            reduced_extent = max(info.reduced_extent for info in svd_info)
+            logger.debug(f"Padding the results to the largest reduced extent {reduced_extent}...")
+            shared_mode = (set(decomposer.outputs[0]) & set(decomposer.outputs[1])).pop()
+            with utils.device_ctx(decomposer.device_id):
+                padded_outputs = []
+                for i, (extents, modes) in enumerate(zip(decomposer.output_extents, decomposer.outputs)):
+                    axis = modes.index(shared_mode)
+                    extents = extents[:axis] + (reduced_extent, ) + extents[axis+1:]
+                    padded = utils.create_empty_tensor(decomposer.output_class, (batch_size, ) + extents, decomposer.data_type, decomposer.device_id, stream_ctx)
+                    with stream_ctx:
+                        padded.tensor[...] = 0
+                        for k, (item_outputs, _) in enumerate(results):
+                            index = (k, ) + (slice(None), ) * axis + (slice(0, svd_info[k].reduced_extent), )
+                            padded.tensor[index] = item_outputs[i].tensor
+                    padded_outputs.append(padded)
+                stacked_outputs = padded_outputs
+                if stacked_s is not None:
+                    padded = utils.create_empty_tensor(decomposer.output_class, (batch_size, reduced_extent), decomposer.s_data_type, decomposer.device_id, stream_ctx)
+                    with stream_ctx:
+                        padded.tensor[...] = 0
+                        for k, (_, item_s) in enumerate(results):
+                            padded.tensor[k, :svd_info[k].reduced_extent] = item_s.tensor
+                    stacked_s = padded
+        logger.info("The decomposition of the batch is completed.")
+
+    left_output, right_output, s = [decomposition_utils.get_return_operand_data(o, operands_location) for o in stacked_outputs + [stacked_s, ]]
+
+    if isinstance(decomposer.method, QRMethod):
+        return left_output, right_output
+    elif return_info:
+        return left_output, s, right_output, svd_info
+    else:
+        return left_output, s, right_output
+
+
+def _parse_method(method):
+    """
+    Infer the decomposition method from a QRMethod/SVDMethod object or a dict, QRMethod by default.
+    """
     for method_class in (QRMethod, SVDMethod):
         try:
-            method = utils.check_or_create_options(method_class, method, method_class.__name__)
+            return utils.check_or_create_options(method_class, method, method_class.__name__)
         except TypeError:
             continue
-        else:
-            break
-    else:
-        raise ValueError("method must be either a QRMethod/SVDMethod object or a dict that can be used to construct QRMethod/SVDMethod")
-    
-    # Parse the decomposition expression
-    wrapped_operands, inputs, outputs, size_dict, mode_map_user_to_ord, mode_map_ord_to_user, max_mid_extent = decomposition_utils.parse_decomposition(subscripts, operand)
+    raise ValueError("method must be either a QRMethod/SVDMethod object or a dict that can be used to construct QRMethod/SVDMethod")
 
-    if len(wrapped_operands) != 1:
-        raise ValueError(f"only one input operand expected for tensor.decompose, found {len(wrapped_operands)}")
 
-    # placeholder to help avoid resource leak
-    handle = workspace_desc = svd_config = svd_info = None
-    input_descriptors = output_descriptors = []
+class Decomposer(DecompositionResources):
+    """
+    Decomposer(subscripts, operand, *, method=None, options=None)
+
+    Create a stateful object that encapsulates the specified tensor decomposition, so that the decomposition of operands
+    of the same shape, data type and strides can be performed repeatedly. The tensor descriptors, the decomposition
+    configuration and the workspace are created once and reused for all the decompositions.
+
+    Args:
+        subscripts : The mode labels (subscripts) defining the decomposition. See :func:`decompose`.
+        operand : A ndarray-like tensor object. The currently supported types are :class:`numpy.ndarray`,
+            :class:`cupy.ndarray`, and :class:`torch.Tensor`.
+        method : Specify decomposition method as a :class:`cuquantum.cutensornet.tensor.QRMethod` or a :class:`cuquantum.cutensornet.tensor.SVDMethod` object.
+            Alternatively, a `dict` containing the parameters for the ``QRMethod`` or ``SVDMethod`` constructor can also be provided.
+            If not specified, the value will be set to the default-constructed ``QRMethod``.
+        options : Specify the computational options for the decomposition as a :class:`cuquantum.cutensornet.tensor.DecompositionOptions` object.
+            Alternatively, a `dict` containing the parameters for the ``DecompositionOptions`` constructor can also be provided.
+            If not specified, the value will be set to the default-constructed ``DecompositionOptions``.
+
+    See Also:
+        :meth:`~Decomposer.reset_operand`, :meth:`~Decomposer.decompose`, :func:`decompose`
+
+    Examples:
+
+        >>> from cuquantum.cutensornet.tensor import Decomposer, SVDMethod
+        >>> import cupy as cp
+
+        Create a :class:`Decomposer` object for truncated SVD of a rank-4 tensor, and use it within a context
+        so that its resources are freed when it goes out of scope:
+
+        >>> T = cp.random.random((4,4,6,6))
+        >>> with Decomposer('ijab->ika,kjb', T, method=SVDMethod(max_extent=8)) as decomposer:
+        ...     u, s, v = decomposer.decompose()
+        ...     # Update the operand in place (or use reset_operand()) and decompose again.
+        ...     T[:] = cp.random.random((4,4,6,6))
+        ...     u, s, v, info = decomposer.decompose(return_info=True)
+    """
+
+    resource_name = 'decomposer'
+
+    def __init__(self, subscripts, operand, *, method=None, options=None):
+        """
+        __init__(subscripts, operand, *, method=None, options=None)
+        """
+        options = utils.check_or_create_options(DecompositionOptions, options, "decomposition options")
+
+        self.logger = logging.getLogger() if options.logger is None else options.logger
+        self.logger.info(f"CUDA runtime version = {cutn.get_cudart_version()}")
+        self.logger.info(f"cuTensorNet version = {cutn.MAJOR_VER}.{cutn.MINOR_VER}.{cutn.PATCH_VER}")
+        self.logger.info("Beginning operands parsing...")
+
+        self.method = _parse_method(method)
+        if isinstance(self.method, SVDMethod) and self.method.algorithm == 'gesvdr':
+            raise ValueError("The randomized SVD algorithm 'gesvdr' is not supported by Decomposer, use decompose instead.")
+
+        # Parse the decomposition expression
+        wrapped_operands, self.inputs, self.outputs, self.size_dict, self.mode_map_user_to_ord, self.mode_map_ord_to_user, max_mid_extent = decomposition_utils.parse_decomposition(subscripts, operand)
+
+        if len(wrapped_operands) != 1:
+            raise ValueError(f"only one input operand expected for tensor.decompose, found {len(wrapped_operands)}")
 
-    try:
         # wrap operands to be consistent with options.
         # options is a new instance of DecompositionOptions with all entries initialized
-        wrapped_operands, options, own_handle, operands_location = decomposition_utils.parse_decompose_operands_options(options, 
+        wrapped_operands, self.options, self.own_handle, self.operands_location = decomposition_utils.parse_decompose_operands_options(options,
                 wrapped_operands, allowed_dtype_names=decomposition_utils.DECOMPOSITION_DTYPE_NAMES)
-        handle = options.handle
-
-        if isinstance(method, QRMethod):
-            mid_extent = max_mid_extent
-            if return_info:
-                raise ValueError("``return_info`` is only supported for SVDMethod")
-        elif isinstance(method, SVDMethod):
-            mid_extent = max_mid_extent if method.max_extent is None else min(max_mid_extent, method.max_extent)
-        else:
-            raise ValueError("method must be either SVDMethod or QRMethod")
-        
-        # # Create input/output tensor descriptors and empty output operands 
-        package = utils.infer_object_package(wrapped_operands[0].tensor)
-        stream, stream_ctx, stream_ptr = utils.get_or_create_stream(options.device_id, stream, package)
-        input_descriptors, output_operands, output_descriptors, s, s_ptr = decomposition_utils.create_operands_and_descriptors(options.handle, 
-                    wrapped_operands, size_dict, inputs, outputs, mid_extent, method, options.device_id, stream_ctx, options.logger)
-
-        # Create workspace descriptor
-        workspace_desc = cutn.create_workspace_descriptor(handle)
-        workspace_ptr = None
-        
-        # Compute required workspace size
-        if isinstance(method, QRMethod):
-            logger.debug("Querying QR workspace size...")
-            cutn.workspace_compute_qr_sizes(handle, *input_descriptors, *output_descriptors, workspace_desc)
-        elif isinstance(method, SVDMethod):
-            svd_config = cutn.create_tensor_svd_config(handle)
-            decomposition_utils.parse_svd_config(handle, svd_config, method, logger)
-            logger.debug("Querying SVD workspace size...")
-            cutn.workspace_compute_svd_sizes(handle, 
-                *input_descriptors, *output_descriptors, svd_config, workspace_desc)
+        self.operand = wrapped_operands[0]
+        self.handle = self.options.handle
+        self.device_id = self.options.device_id
+        self.blocking = self.options.blocking
+        self.package = utils.infer_object_package(self.operand.tensor)
+        self.output_class = self.operand.__class__
+
+        if isinstance(self.method, QRMethod):
+            self.mid_extent = max_mid_extent
         else:
-            ValueError("method must be either a QRMethod/SVDMethod object or a dict that can be used to construct QRMethod/SVDMethod")
-        
-        # Allocate and set workspace
-        workspace_ptr = decomposition_utils.allocate_and_set_workspace(handle, options.allocator, workspace_desc, 
-                    cutn.WorksizePref.MIN, cutn.Memspace.DEVICE, cutn.WorkspaceKind.SCRATCH, options.device_id, 
-                    stream, stream_ctx, options.logger, task_name='tensor decomposition')
-        
+            self.mid_extent = max_mid_extent if self.method.max_extent is None else min(max_mid_extent, self.method.max_extent)
+
+        self._init_resources()
+
+        try:
+            self._create_workspace()
+            self._create_operands_and_descriptors(wrapped_operands, self.method)
+
+            # Create workspace descriptor and compute the required workspace size
+            self.workspace_desc = cutn.create_workspace_descriptor(self.handle)
+            if isinstance(self.method, QRMethod):
+                self.logger.debug("Querying QR workspace size...")
+                cutn.workspace_compute_qr_sizes(self.handle, *self.input_descriptors, *self.output_descriptors, self.workspace_desc)
+            else:
+                self.svd_config = cutn.create_tensor_svd_config(self.handle)
+                decomposition_utils.parse_svd_config(self.handle, self.svd_config, self.method, self.logger)
+                self.svd_info = cutn.create_tensor_svd_info(self.handle)
+                self.logger.debug("Querying SVD workspace size...")
+                cutn.workspace_compute_svd_sizes(self.handle,
+                    *self.input_descriptors, *self.output_descriptors, self.svd_config, self.workspace_desc)
+            self._query_workspace_size()
+        except:
+            self.free()
+            raise
+
+        self.logger.info("The decomposer has been created.")
+
+    @utils.precondition(DecompositionResources._check_valid_state)
+    def reset_operand(self, operand):
+        """Reset the operand held by this :class:`Decomposer` instance.
+
+        This method is not needed when the operand resides on the GPU and in-place operations are used to update
+        the operand values.
+
+        This method will perform various checks on the new operand to make sure:
+
+            - The shape, strides and datatype match those of the old one.
+            - The package that the operand belongs to matches that of the old one.
+            - If the input tensor is on GPU, the library package and device must match.
+
+        Args:
+            operand: See :class:`Decomposer`'s documentation.
+        """
+        self.logger.info("Resetting operand...")
+        self.operand, = self._reset_operands((self.operand, ), (tensor_wrapper.wrap_operand(operand), ))
+        self.logger.info("The operand has been reset.")
+
+    def _decompose_into(self, output_operands, s, stream, stream_ptr):
+        """
+        Decompose the operand into the specified (wrapped) full-size output tensors, and return the views of the results
+        along with the SVDInfo object (None for QR).
+        """
+        output_operands, s = self._prepare_output_operands(output_operands, s)
+        s_ptr = 0 if s is None else s.data_ptr
+
         svd_info_obj = None
 
         # Perform QR/SVD computation
-        logger.info("Starting tensor decomposition...")
-        if options.blocking:
-            logger.info("This call is blocking and will return only after the operation is complete.")
+        self.logger.info("Starting tensor decomposition...")
+        if self.blocking:
+            self.logger.info("This call is blocking and will return only after the operation is complete.")
         else:
-            logger.info("This call is non-blocking and will return immediately after the operation is launched on the device.")
-        timing =  bool(logger and logger.handlers)
-        if isinstance(method, QRMethod):
-            with utils.device_ctx(options.device_id), utils.cuda_call_ctx(stream, options.blocking, timing) as (last_compute_event, elapsed):
-                cutn.tensor_qr(handle, 
-                    *input_descriptors, wrapped_operands[0].data_ptr,
-                    output_descriptors[0], output_operands[0].data_ptr,
-                    output_descriptors[1], output_operands[1].data_ptr,
-                    workspace_desc, stream_ptr)
+            self.logger.info("This call is non-blocking and will return immediately after the operation is launched on the device.")
+        timing = bool(self.logger and self.logger.handlers)
+        if isinstance(self.method, QRMethod):
+            with utils.device_ctx(self.device_id), utils.cuda_call_ctx(stream, self.blocking, timing) as (self.last_compute_event, elapsed):
+                cutn.tensor_qr(self.handle,
+                    *self.input_descriptors, self.operand.data_ptr,
+                    self.output_descriptors[0], output_operands[0].data_ptr,
+                    self.output_descriptors[1], output_operands[1].data_ptr,
+                    self.workspace_desc, stream_ptr)
+            self._record_compute_event()
 
             if elapsed.data is not None:
-                logger.info(f"The QR decomposition took {elapsed.data:.3f} ms to complete.")
-        elif isinstance(method, SVDMethod):
-            svd_info = cutn.create_tensor_svd_info(handle)
-            with utils.device_ctx(options.device_id), utils.cuda_call_ctx(stream, options.blocking, timing) as (last_compute_event, elapsed):
-                cutn.tensor_svd(handle, 
-                    *input_descriptors, wrapped_operands[0].data_ptr, 
-                    output_descriptors[0], output_operands[0].data_ptr, 
-                    s_ptr, 
-                    output_descriptors[1], output_operands[1].data_ptr, 
-                    svd_config,  svd_info, 
-                    workspace_desc,  stream_ptr)
+                self.logger.info(f"The QR decomposition took {elapsed.data:.3f} ms to complete.")
+        else:
+            with utils.device_ctx(self.device_id), utils.cuda_call_ctx(stream, self.blocking, timing) as (self.last_compute_event, elapsed):
+                cutn.tensor_svd(self.handle,
+                    *self.input_descriptors, self.operand.data_ptr,
+                    self.output_descriptors[0], output_operands[0].data_ptr,
+                    s_ptr,
+                    self.output_descriptors[1], output_operands[1].data_ptr,
+                    self.svd_config, self.svd_info,
+                    self.workspace_desc, stream_ptr)
+            self._record_compute_event()
             if elapsed.data is not None:
-                logger.info(f"The SVD decomposition took {elapsed.data:.3f} ms to complete.")
-            svd_info_obj = SVDInfo(**decomposition_utils.get_svd_info_dict(handle, svd_info))
+                self.logger.info(f"The SVD decomposition took {elapsed.data:.3f} ms to complete.")
+            svd_info_obj = SVDInfo(**decomposition_utils.get_svd_info_dict(self.handle, self.svd_info))
 
             # update the operand to reduced_extent if needed
-            for (wrapped_tensor, tensor_desc) in zip(output_operands, output_descriptors):
-                wrapped_tensor.reshape_to_match_tensor_descriptor(handle, tensor_desc)
-            reduced_extent = svd_info_obj.reduced_extent
-            if s is not None and reduced_extent != mid_extent:
-                s.tensor = s.tensor[:reduced_extent]
-    finally:
-        # Free resources
-        if svd_config is not None:
-            cutn.destroy_tensor_svd_config(svd_config)
-        if svd_info is not None:
-            cutn.destroy_tensor_svd_info(svd_info)
-        decomposition_utils._destroy_tensor_descriptors(input_descriptors)
-        decomposition_utils._destroy_tensor_descriptors(output_descriptors)
-        if workspace_desc is not None:
-            cutn.destroy_workspace_descriptor(workspace_desc)
-
-        # destroy handle if owned
-        if own_handle and handle is not None:
-            cutn.destroy(handle)
-        logger.info(f"All resources for the decomposition are freed.")
-    
-    left_output, right_output, s = [decomposition_utils.get_return_operand_data(o, operands_location) for o in output_operands + [s, ]]
-    
-    if isinstance(method, QRMethod):
-        return left_output, right_output
-    elif isinstance(method, SVDMethod):
-        if return_info:
+            self._truncate_output_operands(output_operands, s, svd_info_obj.reduced_extent)
+
+        return output_operands, s, svd_info_obj
+
+    @utils.precondition(DecompositionResources._check_valid_state)
+    def decompose(self, *, stream=None, return_info=False):
+        """Decompose the operand and return the results.
+
+        Args:
+            stream: Provide the CUDA stream to use for the decomposition. Acceptable inputs include ``cudaStream_t``
+                (as Python :class:`int`), :class:`cupy.cuda.Stream`, and :class:`torch.cuda.Stream`. If a stream is not provided,
+                the current stream will be used.
+            return_info : If true, information about the decomposition will be returned via a :class:`cuquantum.cutensornet.tensor.SVDInfo` object.
+                Currently this option is only supported for SVD decomposition.
+
+        Returns:
+            The results of the decomposition, as for :func:`decompose`. The output tensors are of the same type and on the
+            same device as the operand.
+        """
+        if return_info and not isinstance(self.method, SVDMethod):
+            raise ValueError("``return_info`` is only supported for SVDMethod")
+
+        stream, stream_ctx, stream_ptr = utils.get_or_create_stream(self.device_id, stream, self.package)
+
+        # Allocate the workspace once, and the outputs as needed.
+        self._allocate_workspace_memory_perhaps(stream, stream_ctx)
+        self._create_output_operands_perhaps(stream, stream_ctx)
+
+        output_operands, s, svd_info_obj = self._decompose_into(self.output_operands, self.s, stream, stream_ptr)
+
+        left_output, right_output, s = self._return_output_operands(output_operands, s)
+
+        if isinstance(self.method, QRMethod):
+            return left_output, right_output
+        elif return_info:
             return left_output, s, right_output, svd_info_obj
         else:
             return left_output, s, right_output
-    else:
-        raise NotImplementedError
+
+    def free(self):
+        """Free decomposer resources.
+
+        It is recommended that the :class:`Decomposer` object be used within a context, but if it is not possible then this
+        method must be called explicitly to ensure that the decomposer resources are properly cleaned up.
+        """
+        super().free()
 
 
 @dataclasses.dataclass
@@ -384,11 +654,24 @@ class SVDMethod:
             :func:`cuquantum.cutensornet.experimental.contract_decompose` will be `None`.
         normalization: The specified norm of the singular values (after truncation) will be normalized to 1. 
             Currently supports ``None``, ``"L1"``, ``"L2"`` and ``"LInf"``. 
+        algorithm: The SVD algorithm, ``"gesvd"`` (default) for the full SVD of the matricized operand followed by truncation, or ``"gesvdr"``
+            for the randomized SVD, which only decomposes the projection of the operand onto its approximate range sampled with
+            ``max_extent + gesvdr_oversampling`` random vectors, at a cost of O(mnk) instead of O(mn min(m, n)) for a m x n matricization
+            and k retained singular values. ``max_extent`` must be specified for ``"gesvdr"``, and the result is accurate when the singular
+            values decay quickly enough beyond ``max_extent``.
+        gesvdr_oversampling: The number of random vectors sampled in addition to ``max_extent`` for ``algorithm="gesvdr"``.
+        gesvdr_niters: The number of power iterations for ``algorithm="gesvdr"``, which improve the accuracy when the singular values decay slowly.
     
     .. note::
         
         For truncated SVD, currently at least one singular value will be retained in the output even if the truncation parameters are set to trim out all singular values. 
         This behavior may be subject to change in a future release.
+
+    .. note::
+
+        The randomized SVD (``algorithm="gesvdr"``) is computed with NumPy for CPU operands and with CuPy for GPU operands, and the call is
+        blocking. It is supported by :func:`cuquantum.cutensornet.tensor.decompose` and by :func:`cuquantum.cutensornet.experimental.contract_decompose`,
+        where the QR reduction (``qr_method``) is then not used.
         
     """
     max_extent: Optional[int] = None
@@ -396,6 +679,21 @@ class SVDMethod:
     rel_cutoff: Optional[float] = 0.0
     partition: Optional[str] = None
     normalization: Optional[str] = None
+    algorithm: str = 'gesvd'
+    gesvdr_oversampling: int = 10
+    gesvdr_niters: int = 2
+
+    def __post_init__(self):
+        if self.algorithm not in ('gesvd', 'gesvdr'):
+            raise ValueError(f"The SVD algorithm must be either 'gesvd' or 'gesvdr', not '{self.algorithm}'.")
+
+        if self.algorithm == 'gesvdr':
+            if self.max_extent is None:
+                raise ValueError("max_extent must be specified for the randomized SVD algorithm 'gesvdr'.")
+            if not isinstance(self.gesvdr_oversampling, int) or self.gesvdr_oversampling < 0:
+                raise ValueError("The oversampling for the randomized SVD must be a non-negative integer.")
+            if not isinstance(self.gesvdr_niters, int) or self.gesvdr_niters < 0:
+                raise ValueError("The number of power iterations for the randomized SVD must be a non-negative integer.")
 
     def __str__(self):
 
@@ -404,6 +702,11 @@ class SVDMethod:
     Absolute value cutoff = {self.abs_cutoff} 
     Relative value cutoff = {self.rel_cutoff}
     Singular values partition = {self.partition}
-    Singular values normalization = {self.normalization}"""
+    Singular values normalization = {self.normalization}
+    SVD algorithm = {self.algorithm}"""
+        if self.algorithm == 'gesvdr':
+            s += f"""
+    Randomized SVD oversampling = {self.gesvdr_oversampling}
+    Randomized SVD power iterations = {self.gesvdr_niters}"""
 
         return s
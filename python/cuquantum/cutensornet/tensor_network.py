@@ -10,7 +10,9 @@ __all__ = ['contract', 'contract_path', 'einsum', 'einsum_path', 'Network']
 
 import collections
 import dataclasses
+import json
 import logging
+import os
 
 import cupy as cp
 import numpy as np
@@ -18,14 +20,31 @@ import numpy as np
 from cuquantum import cutensornet as cutn
 from . import configuration
 from . import memory
+from ._internal import canonical_form
 from ._internal import einsum_parser
 from ._internal import formatters
 from ._internal import optimizer_ifc
+from ._internal import package_wrapper
+from ._internal import staging
 from ._internal import tensor_wrapper
 from ._internal import typemaps
 from ._internal import utils
 
 
+_PLAN_FORMAT_VERSION = 1
+
+
+def _plan_serializer(obj):
+    """
+    Convert the NumPy scalars found in the path, slicing and optimizer statistics.
+    """
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable.")
+
+
 class InvalidNetworkState(Exception):
     pass
 
@@ -80,7 +99,8 @@ class Network:
             the value will be set to the default-constructed ``NetworkOptions`` object.
 
     See Also:
-        :meth:`~Network.contract_path`, :meth:`autotune`, :meth:`~Network.contract`, :meth:`reset_operands`
+        :meth:`~Network.contract_path`, :meth:`autotune`, :meth:`~Network.contract`, :meth:`reset_operands`, :meth:`save_plan`,
+        :meth:`from_plan`
 
     Examples:
 
@@ -191,6 +211,15 @@ class Network:
             self.device_id = options.device_id
             self.operands = tensor_wrapper.to(self.operands, self.device_id)
 
+        # Pinned staging buffers for asynchronous transfers of CPU operands and results, if requested.
+        self.staging_buffers, self.staging_event = None, None
+        if options.host_staging and self.network_location == 'cpu':
+            if all(staging.is_dense(o.shape, o.strides) for o in self.operands):
+                self.staging_buffers = staging.StagingBuffers(num_slots=2)
+                self.logger.info("Host transfers will be staged through pinned memory.")
+            else:
+                self.logger.info("Host transfers cannot be staged through pinned memory since the device operands are not dense.")
+
         # Set blocking or non-blocking behavior.
         self.blocking = self.options.blocking is True or self.network_location == 'cpu'
         if self.blocking:
@@ -255,8 +284,15 @@ The data type '{self.data_type}' is currently not supported.
                 num_modes_out, extents_out, strides_out, modes_out,  # output
                 typemaps.NAME_TO_DATA_TYPE[self.data_type], self.compute_type)
 
-        # Keep output extents for creating new tensors, if needed.
+        # Keep output extents and strides for creating new tensors and checking user-provided ones, if needed.
         self.extents_out = extents_out
+        self.strides_out = strides_out
+
+        # Ring of output tensors recycled by contract(), if requested. For CPU operands, the ring holds host tensors.
+        self.output_ring = [None] * options.output_ring_size if options.output_ring_size is not None else None
+        self.output_ring_index = 0
+        # The host tensor the result is downloaded to, before copying it into a user-provided output of another layout.
+        self.host_output = None
 
         # Path optimization attributes.
         self.optimizer_config_ptr, self.optimizer_info_ptr = None, None
@@ -273,6 +309,7 @@ The data type '{self.data_type}' is currently not supported.
         # Autotuning attributes.
         self.autotune_pref_ptr = None
         self.autotuned = False
+        self.autotune_iterations = None
 
         # Attributes to establish stream ordering.
         self.workspace_stream = None
@@ -506,6 +543,8 @@ The memory limit specified is {self.memory_limit}, while the minimum workspace s
         Notes:
 
             - If the path is provided, the user has to set the sliced modes too if slicing is desired.
+            - If a :class:`PathCache` is provided in ``optimize``, the path finder is skipped when the network, or any network that
+              only differs in the mode labels or the order of the operands, is found in the cache.
         """
 
         binary_contraction_optimization = len(self.operands) == 2 and optimize is None
@@ -528,12 +567,35 @@ The memory limit specified is {self.memory_limit}, while the minimum workspace s
 
         # Compute path (or set provided path).
         if isinstance(optimize.path, configuration.PathFinderOptions):
-            # Set optimizer options.
-            self._set_optimizer_options(optimize)
-            # Find "optimal" path.
-            self.logger.info("Finding optimal path as well as sliced modes...")
-            cutn.contraction_optimize(self.handle, self.network, self.optimizer_config_ptr, self.memory_limit, self.optimizer_info_ptr)
-            self.logger.info("Finished finding optimal path as well as sliced modes.")
+            # Look up the path cache, if provided.
+            cache_key = cache_entry = None
+            if optimize.cache is not None:
+                canonical = canonical_form.canonicalize(self.inputs, self.output, self.size_dict)
+                cache_key = optimize.cache.compute_key(canonical.fingerprint, self.data_type, self.memory_limit, optimize)
+                cache_entry = optimize.cache.get(cache_key)
+
+            if cache_entry is not None:
+                self.logger.info("Setting path as well as sliced modes from the path cache...")
+                opt_info_ifc.path = canonical.path_from_canonical(cache_entry.path)
+                if isinstance(optimize.slicing, configuration.SlicerOptions) and cache_entry.slices:
+                    mode_map = canonical.mode_map_canonical_to_ord
+                    opt_info_ifc.sliced_mode_extent = [(self.mode_map_ord_to_user[mode_map[m]], e) for m, e in cache_entry.slices]
+                self.logger.info(f"Finished setting path as well as sliced modes from the path cache (hits = {optimize.cache.hits}, misses = {optimize.cache.misses}).")
+            else:
+                # Set optimizer options.
+                self._set_optimizer_options(optimize)
+                # Find "optimal" path.
+                self.logger.info("Finding optimal path as well as sliced modes...")
+                cutn.contraction_optimize(self.handle, self.network, self.optimizer_config_ptr, self.memory_limit, self.optimizer_info_ptr)
+                self.logger.info("Finished finding optimal path as well as sliced modes.")
+
+                if cache_key is not None:
+                    slices = ()
+                    if isinstance(optimize.slicing, configuration.SlicerOptions):
+                        mode_map = canonical.mode_map_ord_to_canonical
+                        slices = [(mode_map[self.mode_map_user_to_ord[m]], e) for m, e in opt_info_ifc.sliced_mode_extent]
+                    optimize.cache.put(cache_key, canonical.path_to_canonical(opt_info_ifc.path), slices)
+                    self.logger.info("The path as well as sliced modes have been added to the path cache.")
         else:
             self.logger.info("Setting user-provided path...")
             opt_info_ifc.path = optimize.path
@@ -573,6 +635,9 @@ The memory limit specified is {self.memory_limit}, while the minimum workspace s
         else:
             self.planned = False
 
+        # Autotuning applies to the previous plan.
+        self.autotune_iterations = None
+
         return opt_info.path, opt_info
 
     def _set_autotune_options(self, options):
@@ -644,6 +709,8 @@ The memory limit specified is {self.memory_limit}, while the minimum workspace s
             self.contraction_output_event = None
             self.logger.debug("Established ordering with output tensor creation event.")
 
+        self._wait_for_staging_perhaps(stream)
+
         timing =  bool(self.logger and self.logger.handlers)
         self.logger.info(f"Starting autotuning...")
         self.logger.info(f"{self.call_prologue}")
@@ -655,6 +722,115 @@ The memory limit specified is {self.memory_limit}, while the minimum workspace s
             self.logger.info(f"The autotuning took {elapsed.data:.3f} ms to complete.")
 
         self.autotuned = True
+        self.autotune_iterations = iterations
+
+    @utils.precondition(_check_valid_network)
+    @utils.precondition(_check_optimized, "Saving the plan")
+    def save_plan(self, file):
+        """Save the contraction plan, so that the same network can later be created with :meth:`from_plan` without path finding.
+
+        The plan consists of the Einstein summation expression, the extents and data type of the operands, the contraction path
+        and the sliced modes, the optimizer statistics and the number of autotuning iterations (if :meth:`autotune` has been
+        called), stored in a versioned JSON format.
+
+        Args:
+            file: The path of the file, or a text file object, to write the plan to.
+        """
+        # The mode labels are saved as they are if they can be represented in JSON, and replaced with their ordinals otherwise.
+        labels = self.mode_map_ord_to_user
+        if not all(isinstance(label, (str, int)) for label in labels.values()):
+            labels = {m: m for m in labels}
+
+        opt_info_ifc = optimizer_ifc.OptimizerInfoInterface(self)
+        plan = {
+            'version': _PLAN_FORMAT_VERSION,
+            'inputs': [[labels[m] for m in _input] for _input in self.inputs],
+            'output': [labels[m] for m in self.output],
+            'extents': [list(o.shape) for o in self.operands],
+            'dtype': self.data_type,
+            'path': opt_info_ifc.path,
+            'slices': [(labels[self.mode_map_user_to_ord[m]], e) for m, e in opt_info_ifc.sliced_mode_extent],
+            'optimizer_info': {
+                'largest_intermediate': opt_info_ifc.largest_intermediate,
+                'opt_cost': opt_info_ifc.flop_count,
+                'num_slices': self.num_slices
+            },
+            'autotune_iterations': self.autotune_iterations
+        }
+
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, 'w') as f:
+                json.dump(plan, f, default=_plan_serializer, separators=(',', ':'))
+        else:
+            json.dump(plan, file, default=_plan_serializer, separators=(',', ':'))
+        self.logger.info(f"The plan has been saved to '{file}'.")
+
+    @classmethod
+    def from_plan(cls, file, operands, *, qualifiers=None, options=None, stream=None):
+        """Create a network from a plan saved by :meth:`save_plan`, and prepare it for contraction.
+
+        The contraction path and sliced modes are taken from the plan, so that path finding is skipped, and the network is
+        autotuned with the same number of iterations as the network the plan was saved from, if it was autotuned.
+
+        Args:
+            file: The path of the file, or a text file object, to read the plan from.
+            operands: A sequence of tensors (ndarray-like objects) of the extents and data type recorded in the plan, in the order
+                of the operands of the original network.
+            qualifiers: Specify the tensor qualifiers as a :class:`numpy.ndarray` of :class:`~cuquantum.tensor_qualifiers_dtype`
+                objects of length equal to the number of operands.
+            options: Specify options for the tensor network as a :class:`~cuquantum.NetworkOptions` object. Alternatively, a `dict`
+                containing the parameters for the ``NetworkOptions`` constructor can also be provided. If not specified,
+                the value will be set to the default-constructed ``NetworkOptions`` object.
+            stream: Provide the CUDA stream to use for autotuning. Acceptable inputs include ``cudaStream_t``
+                (as Python :class:`int`), :class:`cupy.cuda.Stream`, and :class:`torch.cuda.Stream`. If a stream is not provided,
+                the current stream will be used.
+
+        Returns:
+            Network: A network on which :meth:`contract` can be called directly.
+
+        Note:
+            The autotuning results themselves are not part of the plan, since they are specific to the device and library
+            version; only the number of autotuning iterations is recorded.
+        """
+        if isinstance(file, (str, os.PathLike)):
+            with open(file) as f:
+                plan = json.load(f)
+        else:
+            plan = json.load(file)
+
+        if not isinstance(plan, dict) or plan.get('version') != _PLAN_FORMAT_VERSION:
+            version = plan.get('version') if isinstance(plan, dict) else None
+            raise ValueError(f"The plan format version {version} is not supported (expected {_PLAN_FORMAT_VERSION}).")
+
+        operands = list(operands)
+        if len(operands) != len(plan['inputs']):
+            raise ValueError(f"The number of operands ({len(operands)}) must match the number of operands in the plan ({len(plan['inputs'])}).")
+
+        # The expression is recreated in the interleaved format.
+        expression = []
+        for operand, _input in zip(operands, plan['inputs']):
+            expression += [operand, _input]
+        expression.append(plan['output'])
+
+        network = cls(*expression, qualifiers=qualifiers, options=options)
+        try:
+            extents = [list(o.shape) for o in network.operands]
+            if extents != plan['extents']:
+                raise ValueError(f"The extents of the operands {extents} must match those in the plan {plan['extents']}.")
+            if network.data_type != plan['dtype']:
+                raise ValueError(f"The data type of the operands '{network.data_type}' must match that in the plan '{plan['dtype']}'.")
+
+            network.logger.info(f"Creating the network from the plan with {plan['optimizer_info']['num_slices']} slices and "
+                                f"a cost of {plan['optimizer_info']['opt_cost']:.3e} FLOPs.")
+            optimize = {'path': [tuple(p) for p in plan['path']], 'slicing': [tuple(s) for s in plan['slices']]}
+            network.contract_path(optimize=optimize)
+            if plan['autotune_iterations'] is not None:
+                network.autotune(iterations=plan['autotune_iterations'], stream=stream)
+        except:
+            network.free()
+            raise
+
+        return network
 
 
     @utils.precondition(_check_valid_network)
@@ -674,11 +850,40 @@ The memory limit specified is {self.memory_limit}, while the minimum workspace s
             operands: See :class:`Network`'s documentation.
         """
 
+        self.logger.info("Resetting operands...")
+        operands, device_id = self._check_new_operands(operands)
+
+        if device_id is None and self.staging_buffers is not None:
+            # Copy asynchronously to existing device pointers through the pinned staging buffers.
+            stream, _, _ = utils.get_or_create_stream(self.device_id, None, self.package)
+            with utils.device_ctx(self.device_id):
+                self.staging_event = self.staging_buffers.upload(operands, self.operands, stream)
+        elif device_id is None:
+            # Copy to existing device pointers because the new operands are on the CPU.
+            tensor_wrapper.copy_(operands, self.operands)
+        else:
+            # Finally, replace the original data pointers by the new ones.
+            self.operands_data = utils.get_operands_data(operands)
+        self.logger.info("The operands have been reset.")
+
+    def _wait_for_staging_perhaps(self, stream):
+        """
+        Establish ordering with the asynchronous transfer of the operands through the pinned staging buffers, if any.
+        """
+        if self.staging_event is not None:
+            stream.wait_event(self.staging_event)
+            self.staging_event = None
+            self.logger.debug("Established ordering with operand staging event.")
+
+    def _check_new_operands(self, operands):
+        """
+        Wrap the new operands and check that they are compatible with the original ones. Return the wrapped operands and
+        their device ID (None for CPU operands).
+        """
         if len(operands) != len(self.operands):
             message = f"Mismatch in the number of operands ({len(operands)} provided, need {len(self.operands)})."
             raise ValueError(message)
 
-        self.logger.info("Resetting operands...")
         # First wrap operands.
         operands = tensor_wrapper.wrap_operands(operands)
 
@@ -686,10 +891,7 @@ The memory limit specified is {self.memory_limit}, while the minimum workspace s
         utils.check_operands_match(self.operands, operands, 'shape', 'shape')
 
         device_id = utils.get_network_device_id(operands)
-        if device_id is None:
-            # Copy to existing device pointers because the new operands are on the CPU.
-            tensor_wrapper.copy_(operands, self.operands)
-        else:
+        if device_id is not None:
             utils.check_operands_match(self.operands, operands, 'strides', 'strides')
             package = utils.get_operands_package(operands)
             if self.package != package:
@@ -700,14 +902,12 @@ The memory limit specified is {self.memory_limit}, while the minimum workspace s
                 raise ValueError(f"The new operands must be on the same device ({device_id}) as the original operands "
                                  f"({self.device_id}).")
 
-            # Finally, replace the original data pointers by the new ones.
-            self.operands_data = utils.get_operands_data(operands)
-        self.logger.info("The operands have been reset.")
+        return operands, device_id
 
     @utils.precondition(_check_valid_network)
     @utils.precondition(_check_optimized, "Contraction")
     @utils.precondition(_check_planned, "Contraction")
-    def contract(self, *, slices=None, stream=None):
+    def contract(self, *, slices=None, stream=None, out=None):
         """Contract the network and return the result.
 
         Args:
@@ -716,17 +916,40 @@ The memory limit specified is {self.memory_limit}, while the minimum workspace s
             stream: Provide the CUDA stream to use for the contraction operation. Acceptable inputs include ``cudaStream_t``
                 (as Python :class:`int`), :class:`cupy.cuda.Stream`, and :class:`torch.cuda.Stream`. If a stream is not provided,
                 the current stream will be used.
+            out: An ndarray-like object to store the result in, instead of allocating a new output tensor. It must be of the
+                same type and on the same device as the operands, and have the shape and data type of the result. For operands
+                on the GPU, its strides must also match those of the output tensor created by the network (see ``Notes``).
+                For operands on the CPU, any strides are accepted.
 
         Returns:
-            The result is of the same type and on the same device as the operands.
+            The result is of the same type and on the same device as the operands. If ``out`` is provided, it is returned.
+
+        Notes:
+            - For operands on the GPU, the result is written directly to ``out`` and its strides must be those of the output
+              tensor the network would otherwise create (C order).
+            - For operands on the CPU, the network contracts into a device output tensor that is allocated once and kept. The
+              result is then copied from the device straight into ``out`` if ``out`` has the strides of that tensor (C order).
+              For any other strides, it goes through a host tensor that is allocated once and then copied into ``out``. With
+              ``host_staging``, the host tensors are in pinned memory. Without ``out``, a new host tensor is
+              allocated for each call, unless an output ring is used.
+            - If ``output_ring_size`` is specified in :class:`NetworkOptions`, the results are written to a ring of
+              output tensors (allocated once) in round-robin order instead of a new tensor for each call. For operands on the
+              CPU, the ring holds host tensors. The result of a call then remains valid only until ``output_ring_size``
+              further calls to :meth:`contract` or :meth:`autotune`.
         """
 
+        if out is not None:
+            out_wrapped = self._check_output_tensor(out)
+
         # Allocate device memory (in stream context) if needed.
         stream, stream_ctx, stream_ptr = utils.get_or_create_stream(self.device_id, stream, self.package)
         self._allocate_workspace_memory_perhaps(stream, stream_ctx)
 
+        # Contract directly into the provided output tensor, if it is on the GPU.
+        if out is not None and self.network_location != 'cpu':
+            contraction = out_wrapped
         # Check if we still hold an output tensor; if not, create a new one.
-        if self.contraction is None:
+        elif self.contraction is None:
             self.logger.debug("Beginning output (empty) tensor creation...")
             self.contraction = utils.create_empty_tensor(self.output_class, self.extents_out, self.data_type, self.device_id, stream_ctx)
             self.logger.debug("The output (empty) tensor has been created.")
@@ -734,6 +957,8 @@ The memory limit specified is {self.memory_limit}, while the minimum workspace s
             stream.wait_event(self.contraction_output_event)
             self.contraction_output_event = None
             self.logger.debug("Established ordering with output tensor creation event.")
+        if out is None or self.network_location == 'cpu':
+            contraction = self.contraction
 
         # Create a slice group for contraction.
         slice_group = None
@@ -750,11 +975,13 @@ The memory limit specified is {self.memory_limit}, while the minimum workspace s
             message = f"The provided 'slices' must be a range object or a sequence object. The object type is {type(slices)}."
             raise TypeError(message)
 
+        self._wait_for_staging_perhaps(stream)
+
         timing =  bool(self.logger and self.logger.handlers)
         self.logger.info("Starting network contraction...")
         self.logger.info(f"{self.call_prologue}")
         with utils.device_ctx(self.device_id), utils.cuda_call_ctx(stream, self.blocking, timing) as (self.last_compute_event, elapsed):
-            cutn.contract_slices(self.handle, self.plan, self.operands_data, self.contraction.data_ptr, False,
+            cutn.contract_slices(self.handle, self.plan, self.operands_data, contraction.data_ptr, False,
                     self.workspace_desc, slice_group, stream_ptr)
 
         if elapsed.data is not None:
@@ -766,10 +993,224 @@ The memory limit specified is {self.memory_limit}, while the minimum workspace s
            self.logger.debug(f"Slice group ({slice_group}) has been destroyed.")
 
         if self.network_location == 'cpu':
-            out = self.contraction.to('cpu')
+            # Users only get a copy, so the device output tensor is retained for reuse.
+            return self._download_output(out, stream)
+
+        if out is not None:
+            return out
+
+        result = self.contraction.tensor
+        if self.output_ring is not None:
+            # Recycle the output tensors in round-robin order.
+            self.output_ring[self.output_ring_index] = self.contraction
+            self.output_ring_index = (self.output_ring_index + 1) % len(self.output_ring)
+            self.contraction = self.output_ring[self.output_ring_index]
+        else:
+            self.contraction = None    # We cannot overwrite what we've already handed to users.
+
+        return result
+
+    def _create_host_output(self):
+        """
+        Create a host ndarray with the layout of the device output tensor, in pinned memory if the host transfers are staged.
+        """
+        return staging.empty_host(self.extents_out, self.data_type, self.strides_out, pinned=self.staging_buffers is not None)
+
+    def _download_output(self, out, stream):
+        """
+        Copy the device output tensor to the host, and return the result for CPU operands. The result is downloaded
+        directly into ``out`` if it has the layout of the device output tensor, and into a host buffer otherwise: one kept
+        for copying into ``out``, the next one of the output ring if any, or a new one handed to the user.
+        """
+        host_package = 'torch' if self.package == 'torch' else 'numpy'
+        if out is not None and tuple(tensor_wrapper.wrap_operand(out).strides) == tuple(self.strides_out):
+            host_output = staging.from_host_tensor(out, host_package)
+        elif out is not None:
+            if self.host_output is None:
+                self.host_output = self._create_host_output()
+            host_output = self.host_output
+        elif self.output_ring is not None:
+            # Recycle the host outputs in round-robin order.
+            if self.output_ring[self.output_ring_index] is None:
+                self.output_ring[self.output_ring_index] = self._create_host_output()
+            host_output = self.output_ring[self.output_ring_index]
+            self.output_ring_index = (self.output_ring_index + 1) % len(self.output_ring)
+        else:
+            host_output = self._create_host_output()
+
+        with utils.device_ctx(self.device_id):
+            staging.download(self.contraction, stream, out=host_output)
+            stream.synchronize()
+
+        result = staging.to_host_tensor(host_output, host_package)
+        if out is None:
+            return result
+        if result is not out:
+            tensor_wrapper.wrap_operand(out).copy_(result)
+        return out
+
+    def _check_output_tensor(self, out):
+        """
+        Wrap the user-provided output tensor and check that it is compatible with the result of the contraction.
+        """
+        out_wrapped, = tensor_wrapper.wrap_operands((out,))
+
+        if self.network_location == 'cpu':
+            package = tensor_wrapper.infer_tensor_package(out)
+            expected_package = 'numpy' if self.package == 'cupy' else self.package
+            if package != expected_package or out_wrapped.device_id is not None:
+                raise TypeError(f"The output must be a CPU tensor from the '{expected_package}' package, like the operands.")
+        else:
+            package = utils.infer_object_package(out)
+            if package != self.package:
+                raise TypeError(f"Library package mismatch for the output: '{self.package}' => '{package}'")
+            if out_wrapped.device_id != self.device_id:
+                raise ValueError(f"The output must be on the same device ({self.device_id}) as the operands, not on "
+                                 f"'{out_wrapped.device_id}'.")
+            if tuple(out_wrapped.strides) != tuple(self.strides_out):
+                raise ValueError(f"The strides of the output {out_wrapped.strides} must match {tuple(self.strides_out)}.")
+
+        if tuple(out_wrapped.shape) != tuple(self.extents_out):
+            raise ValueError(f"The shape of the output {out_wrapped.shape} must match the shape of the result {tuple(self.extents_out)}.")
+        if out_wrapped.dtype != self.data_type:
+            raise ValueError(f"The data type of the output '{out_wrapped.dtype}' must match the data type of the result '{self.data_type}'.")
+
+        return out_wrapped
+
+    def _parse_operand_batch(self, operand_sets):
+        """
+        Return the batch as a list of operand sequences, unstacking the operands if they are provided as stacked tensors.
+        """
+        num_operands = len(self.operands)
+        if isinstance(operand_sets, collections.abc.Sequence) and len(operand_sets) == num_operands:
+            try:
+                stacked = tensor_wrapper.wrap_operands(operand_sets)
+            except (ValueError, KeyError):
+                stacked = None
+            if stacked is not None and all(len(s.shape) == len(o.shape) + 1 for s, o in zip(stacked, self.operands)):
+                batch_size = stacked[0].shape[0]
+                if any(s.shape[0] != batch_size for s in stacked):
+                    message = f"The stacked operands must have the same batch size (leading extent). Extents found = {set(s.shape[0] for s in stacked)}."
+                    raise ValueError(message)
+                return [tuple(s.tensor[i] for s in stacked) for i in range(batch_size)]
+
+        return [tuple(operands) for operands in operand_sets]
+
+    @utils.precondition(_check_valid_network)
+    @utils.precondition(_check_optimized, "Batched contraction")
+    @utils.precondition(_check_planned, "Batched contraction")
+    def contract_batch(self, operand_sets, *, stream=None):
+        """Contract the network for each set of operands in a batch and return the stacked results.
+
+        The same contraction plan, workspace and output buffer are used for all the items in the batch, which avoids the
+        overhead of calling :meth:`reset_operands` and :meth:`contract` in a loop. For operands on the CPU, the copy of the
+        next item to the device is overlapped with the contraction of the current item using two sets of device buffers.
+
+        Args:
+            operand_sets: The batch of operands, provided either as an iterable of operand sequences (each of which must be
+                acceptable to :meth:`reset_operands`) or as a sequence of stacked operands, one per operand of the network,
+                with the batch as the additional leading dimension. The operands must be located on the CPU if the network
+                operands were on the CPU, and on the network device otherwise.
+            stream: Provide the CUDA stream to use for the contraction operation. Acceptable inputs include ``cudaStream_t``
+                (as Python :class:`int`), :class:`cupy.cuda.Stream`, and :class:`torch.cuda.Stream`. If a stream is not provided,
+                the current stream will be used.
+
+        Returns:
+            The results stacked along the leading dimension, of the same type and on the same device as the operands.
+
+        Note:
+            Like :meth:`reset_operands`, this method replaces the operands held by the network by those of the last item in
+            the batch.
+        """
+        operand_sets = self._parse_operand_batch(operand_sets)
+        batch_size = len(operand_sets)
+        if batch_size == 0:
+            raise ValueError("The batch must contain at least one set of operands.")
+
+        # Check all the operands before launching any work.
+        operand_sets = [self._check_new_operands(operands) for operands in operand_sets]
+        location = 'cpu' if self.network_location == 'cpu' else 'cuda'
+        if any((device_id is None) != (location == 'cpu') for _, device_id in operand_sets):
+            message = f"All the operands in the batch must be located on the same device as the network operands ({location})."
+            raise ValueError(message)
+        operand_sets = [operands for operands, _ in operand_sets]
+
+        # Allocate device memory (in stream context) if needed.
+        stream, stream_ctx, stream_ptr = utils.get_or_create_stream(self.device_id, stream, self.package)
+        self._allocate_workspace_memory_perhaps(stream, stream_ctx)
+
+        self.logger.debug("Beginning batched output (empty) tensor creation...")
+        batch_output = utils.create_empty_tensor(self.output_class, (batch_size,) + tuple(self.extents_out), self.data_type, self.device_id, stream_ctx)
+        self.logger.debug("The batched output (empty) tensor has been created.")
+        output_ptr = batch_output.data_ptr
+        output_size = np.dtype(self.data_type).itemsize * int(np.prod(self.extents_out, dtype=np.int64))
+
+        if location == 'cpu':
+            # Stage the items alternately in two sets of device buffers, such that the last item ends up in the network operands.
+            with utils.device_ctx(self.device_id), stream_ctx:
+                buffers = [self.operands, tuple(tensor_wrapper.wrap_operand(o.module.empty_like(o.tensor)) for o in self.operands)]
+            buffers_data = [self.operands_data, utils.get_operands_data(buffers[1])]
+            buffer_index = lambda k: (batch_size - 1 - k) % 2
+            copy_stream = package_wrapper.PACKAGE[self.package].create_stream(self.device_id)
+            copy_stream, copy_stream_ctx, _ = utils.get_or_create_stream(self.device_id, copy_stream, self.package)
+            copy_events, compute_events = [None, None], [None, None]
+
+            def stage(k):
+                b = buffer_index(k)
+                if compute_events[b] is not None:
+                    copy_stream.wait_event(compute_events[b])
+                with utils.device_ctx(self.device_id), copy_stream_ctx:
+                    if self.staging_buffers is not None:
+                        copy_events[b] = self.staging_buffers.upload(operand_sets[k], buffers[b], copy_stream, slot=b)
+                    else:
+                        tensor_wrapper.copy_(operand_sets[k], buffers[b])
+                        copy_events[b] = copy_stream.record()
+
+            self._wait_for_staging_perhaps(stream)
+            copy_stream.wait_event(stream.record())
+            stage(0)
+
+            if self.staging_buffers is not None:
+                # The results are copied back to pinned host memory on a separate stream, overlapping with the contraction.
+                download_stream = package_wrapper.PACKAGE[self.package].create_stream(self.device_id)
+                download_stream, _, _ = utils.get_or_create_stream(self.device_id, download_stream, self.package)
+                batch_result = staging.empty_pinned(batch_output.shape, self.data_type, batch_output.strides)
+
+        timing =  bool(self.logger and self.logger.handlers)
+        self.logger.info(f"Starting batched network contraction of {batch_size} items...")
+        self.logger.info(f"{self.call_prologue}")
+        with utils.device_ctx(self.device_id), utils.cuda_call_ctx(stream, self.blocking, timing) as (self.last_compute_event, elapsed):
+            for k in range(batch_size):
+                if location == 'cpu':
+                    b = buffer_index(k)
+                    stream.wait_event(copy_events[b])
+                    operands_data = buffers_data[b]
+                else:
+                    operands_data = utils.get_operands_data(operand_sets[k])
+                cutn.contract_slices(self.handle, self.plan, operands_data, output_ptr + k * output_size, False,
+                        self.workspace_desc, 0, stream_ptr)
+                if location == 'cpu':
+                    compute_events[b] = stream.record()
+                    if self.staging_buffers is not None:
+                        download_stream.wait_event(compute_events[b])
+                        staging.download(tensor_wrapper.wrap_operand(batch_output.tensor[k]), download_stream, out=batch_result[k])
+                    # Stage the next item while the current one is being contracted.
+                    if k + 1 < batch_size:
+                        stage(k + 1)
+            if location == 'cpu' and self.staging_buffers is not None:
+                stream.wait_event(download_stream.record())
+
+        if elapsed.data is not None:
+            self.logger.info(f"The batched contraction took {elapsed.data:.3f} ms to complete ({elapsed.data / batch_size:.3f} ms per item, {1e3 * batch_size / elapsed.data:.1f} items per second).")
+
+        if location == 'cpu' and self.staging_buffers is not None:
+            out = staging.to_host_tensor(batch_result, self.package)
+        elif location == 'cpu':
+            out = batch_output.to('cpu')
         else:
-            out = self.contraction.tensor
-        self.contraction = None    # We cannot overwrite what we've already handed to users.
+            # The network holds the operands of the last item, as with reset_operands().
+            self.operands_data = operands_data
+            out = batch_output.tensor
 
         return out
 
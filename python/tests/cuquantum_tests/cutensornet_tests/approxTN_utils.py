@@ -216,8 +216,12 @@ def matrix_svd(
     rel_cutoff=0,
     partition=None,
     normalization=None,
+    algorithm=None,
+    gesvdr_oversampling=None,
+    gesvdr_niters=None,
     return_info=True
 ):
+    # the reference is always computed with the full SVD, the algorithm options are ignored
     info = dict()
     backend = infer_backend(T)
     if backend not in (cp, np) and T.device.type != 'cpu':
@@ -376,6 +380,48 @@ def gate_decompose(
         raise ValueError
 
 
+####################################
+########## Reference MPS ###########
+####################################
+
+def mps_apply_gate(
+    mps_tensors, 
+    gate, 
+    qubits, 
+    **svd_kwargs
+):
+    # apply the gate to the MPS tensors in place, moving the qubits next to each other with swap gates for 
+    # non-adjacent two-qubit gates. Returns the discarded weights of all the gate split operations
+    backend = infer_backend(gate)
+    if len(qubits) == 1:
+        i, = qubits
+        mps_tensors[i] = backend.einsum("ipj,qp->iqj", mps_tensors[i], gate)
+        return []
+    i, j = qubits
+    if i > j:
+        return mps_apply_gate(mps_tensors, gate.transpose(1, 0, 3, 2), (j, i), **svd_kwargs)
+    swap = backend.asarray(np.eye(4)[[0, 2, 1, 3]].reshape(2, 2, 2, 2), dtype=gate.dtype)
+    discarded_weights = []
+    def split(k, g):
+        u, _, v, info = gate_decompose("ipj,jqk,rspq->irj,jsk", mps_tensors[k], mps_tensors[k+1], g, return_info=True, **svd_kwargs)
+        mps_tensors[k:k+2] = (u, v)
+        discarded_weights.append(info["discarded_weight"])
+    for k in range(j-1, i, -1):
+        split(k, swap)
+    split(i, gate)
+    for k in range(i+1, j):
+        split(k, swap)
+    return discarded_weights
+
+
+def mps_to_state_vector(mps_tensors):
+    backend = infer_backend(mps_tensors[0])
+    sv = mps_tensors[0]
+    for o in mps_tensors[1:]:
+        sv = backend.tensordot(sv, o, axes=1)
+    return sv.reshape(sv.shape[1:-1])
+
+
 ####################################
 ########### Verification ###########
 ####################################
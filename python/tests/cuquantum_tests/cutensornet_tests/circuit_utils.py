@@ -2,6 +2,7 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import functools
 import itertools
 from types import MappingProxyType
 
@@ -20,7 +21,9 @@ try:
 except ImportError:
     qiskit = None
 
-from cuquantum import contract, CircuitToEinsum
+from cuquantum import contract, CircuitToEinsum, NativeCircuit, PathCache
+from cuquantum.cutensornet.experimental import sample_circuit
+from cuquantum.cutensornet.native_circuit import GATE_SPECS
 from cuquantum.cutensornet._internal.circuit_converter_utils import convert_mode_labels_to_expression
 from cuquantum.cutensornet._internal.circuit_converter_utils import EINSUM_SYMBOLS_BASE
 from cuquantum.cutensornet._internal.circuit_converter_utils import get_pauli_gates
@@ -39,6 +42,8 @@ if torch:
 
 cirq_circuits = []
 qiskit_circuits = []
+native_circuits = []
+parameterized_circuits = []
 
 EMPTY_DICT = MappingProxyType(dict())
 
@@ -176,6 +181,118 @@ if qiskit:
             qiskit_circuits.append(get_qiskit_random_circuit(n_qubits, depth))
 
 
+##################################################
+# functions to generate NativeCircuit for testing
+##################################################
+
+def get_native_qft_circuit(n_qubits):
+    gates = []
+    for i in range(n_qubits):
+        gates.append(('h', (i,)))
+        for j in range(i+1, n_qubits):
+            gates.append(('cp', (j, i), (np.pi / 2 ** (j - i),)))
+    return NativeCircuit.from_gates(n_qubits, gates)
+
+
+def get_native_random_circuit(n_qubits, n_gates, seed=3):
+    rng = np.random.default_rng(seed)
+    gates = []
+    for _ in range(n_gates):
+        name, n_gate_qubits, n_params = GATE_SPECS[rng.integers(len(GATE_SPECS))]
+        if name == 'unitary':
+            n_gate_qubits = 2
+            matrix = rng.normal(size=(4, 4)) + 1j * rng.normal(size=(4, 4))
+            params = np.linalg.qr(matrix)[0]
+        else:
+            params = tuple(rng.uniform(-np.pi, np.pi, n_params))
+        gate_qubits = tuple(rng.choice(n_qubits, n_gate_qubits, replace=False).tolist())
+        gates.append((name, gate_qubits, params))
+    return NativeCircuit.from_gates(n_qubits, gates)
+
+
+def get_native_mps_circuit(n_qubits, n_layers, seed=3):
+    # layers of random single-qubit gates followed by two-qubit gates on random (possibly non-adjacent) pairs of qubits
+    rng = np.random.default_rng(seed)
+    gates = []
+    for _ in range(n_layers):
+        for i in range(n_qubits):
+            gates.append(('u', (i,), tuple(rng.uniform(-np.pi, np.pi, 3))))
+        for _ in range(n_qubits // 2):
+            name = str(rng.choice(['cx', 'rzz', 'swap']))
+            gate_qubits = tuple(rng.choice(n_qubits, 2, replace=False).tolist())
+            gates.append((name, gate_qubits, (rng.uniform(-np.pi, np.pi),) if name == 'rzz' else ()))
+    return NativeCircuit.from_gates(n_qubits, gates)
+
+
+def get_native_gate_matrix(name, params):
+    # reference definitions of the native gates, independent of the implementation
+    paulis = {'I': np.eye(2), 'X': np.array([[0, 1], [1, 0]]), 'Y': np.array([[0, -1j], [1j, 0]]), 'Z': np.diag([1, -1])}
+    swap = np.eye(4)[[0, 2, 1, 3]]
+    def expm_hermitian(h):
+        w, v = np.linalg.eigh(h)
+        return (v * np.exp(-1j * w)) @ v.conj().T
+    def controlled(u):
+        d = len(u)
+        return np.block([[np.eye(d), np.zeros((d, d))], [np.zeros((d, d)), u]])
+    def rotation(pauli_string, theta):
+        generator = functools.reduce(np.kron, [paulis[p] for p in pauli_string])
+        return expm_hermitian(theta / 2 * generator)
+
+    if name == 'unitary':
+        return params
+    if name in ('i', 'x', 'y', 'z'):
+        return paulis[name.upper()]
+    if name in ('h', 's', 'sdg', 't', 'tdg', 'sx', 'sxdg'):
+        # powers of Pauli matrices up to a global phase
+        pauli, exponent = {'h': ('H', 1), 's': ('Z', 1/2), 'sdg': ('Z', -1/2), 't': ('Z', 1/4),
+                           'tdg': ('Z', -1/4), 'sx': ('X', 1/2), 'sxdg': ('X', -1/2)}[name]
+        if pauli == 'H':
+            return (paulis['X'] + paulis['Z']) / np.sqrt(2)
+        return np.exp(1j * np.pi * exponent / 2) * rotation(pauli, np.pi * exponent)
+    if name in ('rx', 'ry', 'rz'):
+        return rotation(name[1].upper(), params[0])
+    if name in ('rxx', 'ryy', 'rzz'):
+        return rotation(name[1:].upper(), params[0])
+    if name == 'p':
+        return np.exp(1j * params[0] / 2) * rotation('Z', params[0])
+    if name == 'u':
+        theta, phi, lam = params
+        return (np.exp(1j * (phi + lam) / 2) * rotation('Z', phi) @ rotation('Y', theta) @ rotation('Z', lam))
+    if name in ('cx', 'cy', 'cz'):
+        return controlled(paulis[name[1].upper()])
+    if name in ('crx', 'cry', 'crz', 'cp'):
+        return controlled(get_native_gate_matrix(name[1:], params))
+    if name == 'swap':
+        return swap
+    if name == 'ccx':
+        return controlled(controlled(paulis['X']))
+    if name == 'cswap':
+        return controlled(swap)
+    raise ValueError(f'unknown gate {name}')
+
+
+def simulate_native_circuit(circuit, sv=None):
+    n_qubits = circuit.num_qubits
+    if sv is None:
+        sv = np.zeros((2,) * n_qubits, dtype=np.complex128)
+        sv[(0,) * n_qubits] = 1
+    for opcode, qubits, params, n_gate_qubits in zip(circuit.opcodes, circuit.qubits, circuit.params, circuit.num_gate_qubits):
+        name, _, n_params = GATE_SPECS[opcode]
+        qubits = list(qubits[:n_gate_qubits])
+        params = circuit.unitaries[int(params[0])] if name == 'unitary' else params[:n_params]
+        matrix = get_native_gate_matrix(name, params).reshape((2,) * 2 * n_gate_qubits)
+        sv = np.tensordot(matrix, sv, axes=(list(range(n_gate_qubits, 2 * n_gate_qubits)), qubits))
+        sv = np.moveaxis(sv, list(range(n_gate_qubits)), qubits)
+    return sv
+
+
+native_circuits.append(get_native_random_circuit(4, 0))
+for n_qubits in N_QUBITS_RANGE:
+    native_circuits.append(get_native_qft_circuit(n_qubits))
+    for depth in DEPTH_RANGE:
+        native_circuits.append(get_native_random_circuit(n_qubits, depth * n_qubits, seed=depth))
+
+
 ###################################################################
 #
 # Simulator APIs inside cirq and qiskit may be subject to change.
@@ -187,9 +304,9 @@ if qiskit:
 ###################################################################
 
 class BaseTester:
-    def __init__(self, circuit, dtype, backend, nsample, nsite_max, nfix_max):
+    def __init__(self, circuit, dtype, backend, nsample, nsite_max, nfix_max, fusion=None, hyperedges=False):
         self.circuit = circuit
-        self.converter = CircuitToEinsum(circuit, dtype=dtype, backend=backend)
+        self.converter = CircuitToEinsum(circuit, dtype=dtype, backend=backend, fusion=fusion, hyperedges=hyperedges)
         self.backend = backend
         self.qubits = self.converter.qubits
         self.n_qubits = self.converter.n_qubits
@@ -328,12 +445,60 @@ class BaseTester:
             self.backend.allclose(
                 expec1, expec3, atol=atol_mapper[self.dtype], rtol=rtol_mapper[self.dtype])
 
+    def test_expectation_batch(self):
+        pauli_strings = list(random_pauli_string_generator(self.n_qubits, 6))
+        pauli_strings.append('I' * self.n_qubits)
+        # a string repeated with a different operator on the same qubits shares the network
+        pauli_strings.append(''.join('I' if c == 'I' else 'Z' for c in pauli_strings[0]))
+        for lightcone in (True, False):
+            networks = self.converter.expectation_batch(pauli_strings, lightcone=lightcone)
+            assert sorted(i for _, _, indices in networks for i in indices) == list(range(len(pauli_strings)))
+            if not lightcone:
+                assert len(networks) == 1
+            for expression, operands, indices in networks:
+                expec1 = contract(expression, *operands)
+                assert expec1.shape == (len(indices),)
+                for k, i in enumerate(indices):
+                    expec2 = self.get_expectation_from_sv(pauli_strings[i])
+                    assert self.backend.allclose(
+                        expec1[k], expec2, atol=atol_mapper[self.dtype], rtol=rtol_mapper[self.dtype])
+
+    def test_sampling(self, nshots=2000):
+        sv = self.get_state_vector_from_simulator()
+        if self.backend is not np:
+            sv = sv.cpu() if self.backend is torch else sv.get()
+        probabilities = abs(np.asarray(sv)) ** 2
+        for lightcone in (True, False):
+            counts = sample_circuit(self.converter, nshots, lightcone=lightcone, seed=0)
+            assert sum(counts.values()) == nshots
+            for bitstring, count in counts.items():
+                p = probabilities[tuple(int(ibit) for ibit in bitstring)]
+                # the counts follow a binomial distribution
+                assert abs(count - nshots * p) <= 6 * np.sqrt(nshots * p * (1 - p)) + 1
+
+        # sample a subset of the qubits in a different order
+        where = self.qubits[::-2]
+        counts = sample_circuit(self.converter, nshots, qubits=where, seed=0)
+        assert sum(counts.values()) == nshots
+        assert all(len(bitstring) == len(where) for bitstring in counts)
+
+        # the paths found in the first call are reused in the second one
+        cache = PathCache()
+        sample_circuit(self.converter, nshots, seed=0, optimize={'cache': cache})
+        misses = cache.misses
+        assert misses > 0
+        sample_circuit(self.converter, nshots, seed=1, optimize={'cache': cache})
+        assert cache.misses == misses
+        assert cache.hits >= len(self.qubits)
+
     def run_tests(self):
         self.test_state_vector()
         self.test_amplitude()
         self.test_batched_amplitudes()
         self.test_reduced_density_matrix()
         self.test_expectation()
+        self.test_expectation_batch()
+        self.test_sampling()
 
 
 class CirqTester(BaseTester):
@@ -374,3 +539,56 @@ class QiskitTester(BaseTester):
         else:
             sv = self.backend.asarray(sv, dtype=self.dtype)
         return sv
+
+
+class NativeTester(BaseTester):
+    def _get_state_vector_from_simulator(self):
+        sv = simulate_native_circuit(self.circuit)
+        if self.backend is torch:
+            sv = torch.as_tensor(sv, dtype=getattr(torch, self.dtype), device='cuda')
+        else:
+            sv = self.backend.asarray(sv, dtype=self.dtype)
+        return sv
+
+
+##############################################################
+# functions to generate parameterized circuits for testing
+##############################################################
+
+def get_cirq_parameterized_circuit(n_qubits):
+    import sympy
+    alpha, beta = sympy.symbols('alpha beta')
+    qubits = cirq.LineQubit.range(n_qubits)
+    operations = [cirq.H.on_each(*qubits)]
+    for i in range(n_qubits - 1):
+        operations.append(cirq.rx(alpha * (i + 1)).on(qubits[i]))
+        operations.append((cirq.CZ ** beta)(qubits[i], qubits[i+1]))
+        operations.append((cirq.ZZ ** (alpha + beta))(qubits[i], qubits[i+1]))
+        operations.append(cirq.CNOT(qubits[i+1], qubits[i]))
+    return cirq.Circuit(operations)
+
+
+def get_qiskit_parameterized_circuit(n_qubits):
+    alpha, beta = qiskit.circuit.Parameter('alpha'), qiskit.circuit.Parameter('beta')
+    circuit = qiskit.QuantumCircuit(n_qubits)
+    circuit.h(range(n_qubits))
+    for i in range(n_qubits - 1):
+        circuit.rx(alpha * (i + 1), i)
+        circuit.crz(beta, i, i+1)
+        circuit.rzz(alpha + beta, i, i+1)
+        circuit.u(alpha, 0.3, beta, i+1)
+        circuit.cx(i+1, i)
+    return circuit
+
+
+def bind_circuit_parameters(circuit, values):
+    """Return the circuit with the parameters bound to the values, given as a mapping from the parameter names."""
+    if cirq and isinstance(circuit, cirq.Circuit):
+        return cirq.resolve_parameters(circuit, values)
+    return circuit.assign_parameters({p: values[p.name] for p in circuit.parameters})
+
+
+if cirq:
+    parameterized_circuits.append(get_cirq_parameterized_circuit(4))
+if qiskit:
+    parameterized_circuits.append(get_qiskit_parameterized_circuit(4))
@@ -2,10 +2,18 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import itertools
+
+import numpy as np
 import pytest
 
+from cuquantum import contract, CircuitToEinsum, NativeCircuit
+
 from .circuit_utils import backends
 from .circuit_utils import cirq_circuits, CirqTester
+from .circuit_utils import get_native_random_circuit
+from .circuit_utils import native_circuits, NativeTester
+from .circuit_utils import bind_circuit_parameters, parameterized_circuits
 from .circuit_utils import qiskit_circuits, QiskitTester
 
 
@@ -26,3 +34,199 @@ class TestCircuitToEinsum:
     def test_qiskit(self, circuit, dtype, backend, nsample=3, nsite_max=3, nfix_max=3):
         qiskit_tests = QiskitTester(circuit, dtype, backend, nsample, nsite_max, nfix_max)
         qiskit_tests.run_tests()
+
+    @pytest.mark.parametrize("circuit", native_circuits)
+    @pytest.mark.parametrize("dtype", ('complex64', 'complex128',))
+    @pytest.mark.parametrize("backend", backends)
+    def test_native(self, circuit, dtype, backend, nsample=3, nsite_max=3, nfix_max=3):
+        native_tests = NativeTester(circuit, dtype, backend, nsample, nsite_max, nfix_max)
+        native_tests.run_tests()
+
+    @pytest.mark.parametrize("circuit", native_circuits)
+    @pytest.mark.parametrize("fusion", (1, 2, 3))
+    @pytest.mark.parametrize("backend", backends)
+    def test_fusion(self, circuit, fusion, backend, nsample=3, nsite_max=3, nfix_max=3):
+        native_tests = NativeTester(circuit, 'complex128', backend, nsample, nsite_max, nfix_max, fusion=fusion)
+        stats = native_tests.converter.fusion_stats
+        assert stats.num_gates == len(circuit)
+        assert stats.num_fused_gates == len(native_tests.converter.gates)
+        assert stats.num_tensors_removed == stats.num_gates - stats.num_fused_gates
+        native_tests.run_tests()
+
+    def test_fusion_merges_blocks(self):
+        circuit = NativeCircuit.from_gates(3, [('h', (0,)), ('x', (0,)), ('cx', (0, 1)), ('rz', (1,), (0.3,)),
+                                               ('cx', (0, 1)), ('h', (2,)), ('cz', (1, 2))])
+        converter = CircuitToEinsum(circuit, backend=np, fusion=2)
+        assert [qubits for _, qubits in converter.gates] == [(0, 1), (2, 1)]
+        assert converter.fusion_stats.num_tensors_removed == 5
+        assert CircuitToEinsum(circuit, backend=np).fusion_stats is None
+
+    @pytest.mark.parametrize("circuit", native_circuits)
+    @pytest.mark.parametrize("fusion", (None, 2))
+    @pytest.mark.parametrize("backend", backends)
+    def test_hyperedges(self, circuit, fusion, backend, nsample=3, nsite_max=3, nfix_max=3):
+        native_tests = NativeTester(circuit, 'complex128', backend, nsample, nsite_max, nfix_max, fusion=fusion, hyperedges=True)
+        native_tests.run_tests()
+
+    def test_hyperedges_encoding(self):
+        circuit = NativeCircuit.from_gates(2, [('h', (0,)), ('cz', (0, 1)), ('cx', (0, 1)), ('rz', (1,), (0.3,))])
+        converter = CircuitToEinsum(circuit, backend=np, hyperedges=True)
+        expression, operands = converter.state_vector()
+        # H is dense, CZ and RZ are diagonal, and CX is diagonal on its control qubit
+        assert [o.shape for o in operands[2:]] == [(2, 2), (2, 2), (2, 2, 2), (2,)]
+        inputs, output = expression.split('->')
+        inputs = inputs.split(',')
+        assert inputs[3] == inputs[2][0] + inputs[1][0]
+        assert output == inputs[4][0] + inputs[5]
+        dense_expression, dense_operands = CircuitToEinsum(circuit, backend=np).state_vector()
+        assert np.allclose(contract(expression, *operands), contract(dense_expression, *dense_operands))
+
+    @pytest.mark.parametrize("circuit", native_circuits)
+    @pytest.mark.parametrize("hyperedges", (False, True))
+    @pytest.mark.parametrize("backend", backends)
+    def test_interleaved(self, circuit, hyperedges, backend):
+        converter = CircuitToEinsum(circuit, backend=backend, hyperedges=hyperedges)
+        interleaved_converter = CircuitToEinsum(circuit, backend=backend, hyperedges=hyperedges, interleaved=True)
+        n_qubits = circuit.num_qubits
+        pauli_strings = ['X' * n_qubits, 'Z' + 'I' * (n_qubits - 1), 'I' * (n_qubits - 1) + 'Y']
+        for method, args in (('state_vector', ()),
+                             ('amplitude', ('1' * n_qubits,)),
+                             ('batched_amplitudes', ({0: '1'},)),
+                             ('reduced_density_matrix', ((0, n_qubits - 1),)),
+                             ('expectation', (pauli_strings[0],))):
+            expression, operands = getattr(converter, method)(*args)
+            (inputs, output), interleaved_operands = getattr(interleaved_converter, method)(*args)
+            assert len(inputs) == len(interleaved_operands)
+            assert all(isinstance(labels, np.ndarray) and labels.dtype.kind == 'i' for labels in inputs)
+            interleaved = itertools.chain.from_iterable(zip(interleaved_operands, inputs))
+            assert backend.allclose(contract(*interleaved, output), contract(expression, *operands))
+
+        for (expression, operands, indices), ((inputs, output), interleaved_operands, interleaved_indices) in zip(
+                converter.expectation_batch(pauli_strings), interleaved_converter.expectation_batch(pauli_strings)):
+            assert indices == interleaved_indices
+            interleaved = itertools.chain.from_iterable(zip(interleaved_operands, inputs))
+            assert backend.allclose(contract(*interleaved, output), contract(expression, *operands))
+
+    def test_memoized_queries(self):
+        circuit = get_native_random_circuit(5, 30, seed=2)
+        converter = CircuitToEinsum(circuit, backend=np, cache_size=2)
+        amplitude = converter.amplitude('01101')
+        rdm = converter.reduced_density_matrix((0, 3))
+        expectation = converter.expectation('XIZIY')
+
+        def is_memoized(network, query):
+            (expression, operands), (query_expression, query_operands) = network, query
+            assert query_expression == expression
+            assert query_operands is not operands
+            assert np.allclose(contract(query_expression, *query_operands), contract(expression, *operands))
+            # the expression is only generated again if the query is not memoized
+            return query_expression is expression
+
+        # only the two most recently used queries are memoized
+        assert is_memoized(expectation, converter.expectation('XIZIY'))
+        assert is_memoized(rdm, converter.reduced_density_matrix([0, 3]))
+        assert not is_memoized(amplitude, converter.amplitude('01101'))
+        assert not is_memoized(expectation, converter.expectation('XIZIY'))
+
+        # the basis state and Pauli tensors are shared across queries
+        _, amplitude_operands = converter.amplitude('00000')
+        _, expectation_operands = converter.expectation('ZZZZZ', lightcone=False)
+        assert amplitude_operands[-1] is expectation_operands[0]
+
+        # a batch of expectation values is memoized as a whole, without adding other entries to the cache
+        pauli_strings = ['XIZIY', 'ZZIII', 'IXXII']
+        networks = converter.expectation_batch(pauli_strings)
+        cache_size = len(converter._network_cache)
+        query_networks = converter.expectation_batch(pauli_strings)
+        assert len(converter._network_cache) == cache_size
+        assert len(query_networks) == len(networks)
+        for (expression, operands, indices), (query_expression, query_operands, query_indices) in zip(networks, query_networks):
+            assert query_indices == indices
+            assert is_memoized((expression, operands), (query_expression, query_operands))
+            assert all(q is o for q, o in zip(query_operands, operands))
+
+        converter = CircuitToEinsum(circuit, backend=np, cache_size=0)
+        assert not is_memoized(converter.state_vector(), converter.state_vector())
+        with pytest.raises(ValueError):
+            CircuitToEinsum(circuit, backend=np, cache_size=-1)
+
+class TestRebind:
+
+    @staticmethod
+    def get_networks(converter):
+        n_qubits = converter.n_qubits
+        return [converter.state_vector(),
+                converter.amplitude('0' * n_qubits),
+                converter.reduced_density_matrix(converter.qubits[:1]),
+                converter.expectation('XZ' * (n_qubits // 2))]
+
+    @pytest.mark.parametrize("circuit", parameterized_circuits)
+    @pytest.mark.parametrize("options", ({}, {'fusion': 2, 'hyperedges': True}))
+    @pytest.mark.parametrize("backend", backends)
+    def test_rebind(self, circuit, options, backend):
+        converter = CircuitToEinsum(circuit, backend=backend, params={'alpha': 0.1, 'beta': -0.4}, **options)
+        assert sorted(str(p) for p in converter.parameters) == ['alpha', 'beta']
+        networks = self.get_networks(converter)
+        operand_ids = [[id(o) for o in operands] for _, operands in networks]
+
+        for values in ({'alpha': 0.7, 'beta': 1.3}, {'alpha': 0.7, 'beta': -2.}):
+            converter.rebind(values)
+            reference = CircuitToEinsum(bind_circuit_parameters(circuit, values), backend=backend, **options)
+            for (expression, operands), (ref_expression, ref_operands), ids in zip(networks, self.get_networks(reference), operand_ids):
+                assert [id(o) for o in operands] == ids
+                result = contract(expression, *operands)
+                ref_result = contract(ref_expression, *ref_operands)
+                assert backend.allclose(result, ref_result, atol=1e-12)
+
+        # the values can also be specified as a sequence in the order of the parameters
+        values = {'alpha': -0.2, 'beta': 0.5}
+        converter.rebind([values[str(p)] for p in converter.parameters])
+        expression, operands = converter.state_vector()
+        ref_expression, ref_operands = CircuitToEinsum(bind_circuit_parameters(circuit, values), backend=backend).state_vector()
+        assert backend.allclose(contract(expression, *operands), contract(ref_expression, *ref_operands), atol=1e-12)
+
+    @pytest.mark.parametrize("circuit", parameterized_circuits)
+    def test_rebind_invalid(self, circuit):
+        with pytest.raises(ValueError):
+            CircuitToEinsum(circuit, backend=np)
+        with pytest.raises(ValueError):
+            CircuitToEinsum(circuit, backend=np, params={'alpha': 0.1})
+        converter = CircuitToEinsum(circuit, backend=np, params=[0.1, 0.2])
+        with pytest.raises(ValueError):
+            converter.rebind([0.1])
+        with pytest.raises(ValueError):
+            converter.rebind({'gamma': 0.1})
+
+    def test_native_params(self):
+        circuit = NativeCircuit.from_gates(1, [('rx', (0,), (0.1,))])
+        assert CircuitToEinsum(circuit, backend=np).parameters == ()
+        with pytest.raises(ValueError):
+            CircuitToEinsum(circuit, backend=np, params=[0.1])
+
+
+class TestNativeCircuit:
+
+    def test_from_gates(self):
+        circuit = NativeCircuit.from_gates(3, [('h', (0,)), ('cx', (0, 1)), ('u', (2,), (0.1, 0.2, 0.3)), ('unitary', (1, 2), np.eye(4))])
+        assert len(circuit) == 4
+        assert circuit.opcodes.tolist() == [NativeCircuit.OPCODES[name] for name in ('h', 'cx', 'u', 'unitary')]
+        assert circuit.qubits.tolist() == [[0, -1], [0, 1], [2, -1], [1, 2]]
+        assert circuit.num_gate_qubits.tolist() == [1, 2, 1, 2]
+        assert circuit.params[2].tolist() == [0.1, 0.2, 0.3]
+        assert len(circuit.unitaries) == 1
+        with pytest.raises(ValueError):
+            circuit.params[0, 0] = 1
+
+    @pytest.mark.parametrize(
+        "gates", (
+            [('foo', (0,))],
+            [('cx', (0, 0))],
+            [('cx', (0,))],
+            [('h', (3,))],
+            [('rx', (0,), (np.inf,))],
+            [('unitary', (0,), np.eye(3))],
+        )
+    )
+    def test_invalid(self, gates):
+        with pytest.raises(ValueError):
+            NativeCircuit.from_gates(3, gates)
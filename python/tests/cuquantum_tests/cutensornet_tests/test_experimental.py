@@ -2,6 +2,8 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import os
+import queue
 import sys
 import dataclasses
 
@@ -10,13 +12,22 @@ import numpy
 import opt_einsum as oe
 import pytest
 
-from cuquantum import tensor, OptimizerInfo
-from cuquantum.cutensornet.experimental import contract_decompose, ContractDecomposeAlgorithm, ContractDecomposeInfo
+from cuquantum import tensor, CircuitToEinsum, Network, OptimizerInfo
+from cuquantum.cutensornet.experimental import contract_decompose, ContractDecomposeAlgorithm, ContractDecomposeInfo, GateSplitter
+from cuquantum.cutensornet.experimental import MPSState
+from cuquantum.cutensornet.experimental import mps as mps_module
+from cuquantum.cutensornet.experimental import contract_sliced, SliceSchedulerOptions
+from cuquantum.cutensornet.experimental import contract_checkpointed, CheckpointOptions
+from cuquantum.cutensornet.experimental.slice_scheduler import _collect_results, _initial_bounds, _next_chunk
 from cuquantum.cutensornet.experimental._internal.utils import is_gate_split
+from cuquantum.cutensornet._internal import decomposition_utils
 from cuquantum.cutensornet._internal.decomposition_utils import DECOMPOSITION_DTYPE_NAMES, parse_decomposition
 from cuquantum.cutensornet._internal.utils import infer_object_package
+from cuquantum.cutensornet.tensor import InvalidDecompositionState
 
+from .approxTN_utils import mps_apply_gate, mps_to_state_vector
 from .approxTN_utils import split_contract_decompose, tensor_decompose, verify_split_QR, verify_split_SVD
+from .circuit_utils import get_native_mps_circuit, get_native_qft_circuit, simulate_native_circuit
 from .data import backend_names, contract_decompose_expr
 from .test_options import _OptionsBase
 from .test_utils import DecomposeFactory, deselect_contract_decompose_algorithm_tests, deselect_decompose_tests, gen_rand_svd_method
@@ -148,6 +159,202 @@ class TestContractDecompose:
         self._run_contract_decompose(decompose_expr, xp, dtype, order, stream, algorithm)
 
 
+    @pytest.mark.parametrize(
+        "svd_method_seed", (0, 1, 2)
+    )
+    def test_contract_randomized_svd_decompose(self, decompose_expr, xp, dtype, order, stream, svd_method_seed):
+        # with enough oversampling the sampled range is complete, so the results must match the full SVD
+        svd_method = dataclasses.replace(gen_rand_svd_method(seed=svd_method_seed), algorithm='gesvdr', gesvdr_oversampling=64)
+        algorithm = ContractDecomposeAlgorithm(qr_method=False, svd_method=svd_method)
+        self._run_contract_decompose(decompose_expr, xp, dtype, order, stream, algorithm)
+
+
+
+@pytest.mark.uncollect_if(func=deselect_decompose_tests)
+@pytest.mark.parametrize(
+    "stream", (None, True)
+)
+@pytest.mark.parametrize(
+    "xp", backend_names
+)
+@pytest.mark.parametrize(
+    "decompose_expr", ('ijk,klm,jlpq->ipk,kqm', 'sOD,DdNr,ROrsq->KR,qKdN', 'beQ,cey,cbJj->Je,jQey')
+)
+class TestGateSplitter:
+
+    def _run_gate_splitter(self, decompose_expr, xp, stream, algorithm, dtype="float64", order="C"):
+        factory = DecomposeFactory(decompose_expr)
+        contract_expr, decomp_expr = split_contract_decompose(decompose_expr)
+        operands = factory.generate_operands(factory.input_shapes, xp, dtype, order)
+        backend = sys.modules[infer_object_package(operands[0])]
+        if stream:
+            stream = get_stream_for_backend(backend)
+
+        # the reference decomposes the intermediate tensor, whose mid extent may exceed that of the gate split
+        svd_kwargs = dataclasses.asdict(algorithm.svd_method)
+        max_mid_extent = parse_decomposition(decompose_expr, *operands)[-1]
+        max_extent = svd_kwargs.get('max_extent')
+        if max_extent in [0, None] or max_extent > max_mid_extent:
+            svd_kwargs['max_extent'] = max_mid_extent
+
+        with GateSplitter(decompose_expr, *operands, algorithm=algorithm) as splitter:
+            for _ in range(3):
+                # bind new data of the same shapes, the truncation of each operation must not affect the next one
+                operands = factory.generate_operands(factory.input_shapes, xp, dtype, order)
+                splitter.reset_operands(*operands)
+                u, s, v, info = splitter.split(stream=stream, return_info=True)
+                if stream:
+                    stream.synchronize()
+                assert isinstance(info, ContractDecomposeInfo)
+                assert type(u) is type(operands[0])
+
+                _, _, _, info_ref = contract_decompose(decompose_expr, *operands, algorithm=algorithm, return_info=True)
+                assert info.svd_info.reduced_extent == info_ref.svd_info.reduced_extent
+
+                intm = oe.contract(contract_expr, *operands)
+                u_ref, s_ref, v_ref = tensor_decompose(decomp_expr, intm, method="svd", **svd_kwargs)
+                assert verify_split_SVD(decomp_expr, intm, u, s, v, u_ref, s_ref, v_ref, **svd_kwargs)
+
+        with pytest.raises(InvalidDecompositionState):
+            splitter.split()
+
+    @pytest.mark.parametrize(
+        "qr_method", (False, {})
+    )
+    @pytest.mark.parametrize(
+        "svd_method_seed", (None, 0, 1)
+    )
+    def test_gate_splitter(self, decompose_expr, xp, stream, qr_method, svd_method_seed):
+        svd_method = gen_rand_svd_method(seed=svd_method_seed)
+        algorithm = ContractDecomposeAlgorithm(qr_method=qr_method, svd_method=svd_method)
+        self._run_gate_splitter(decompose_expr, xp, stream, algorithm)
+
+    def test_shared_workspace(self, decompose_expr, xp, stream):
+        factory = DecomposeFactory(decompose_expr)
+        contract_expr, decomp_expr = split_contract_decompose(decompose_expr)
+        operands = factory.generate_operands(factory.input_shapes, xp, "float64", "C")
+        intm = oe.contract(contract_expr, *operands)
+        svd_kwargs = {'max_extent': parse_decomposition(decompose_expr, *operands)[-1]}
+        u_ref, s_ref, v_ref = tensor_decompose(decomp_expr, intm, method="svd", **svd_kwargs)
+
+        # the direct and the QR-assisted algorithms require different workspace sizes
+        direct, reduced = [ContractDecomposeAlgorithm(qr_method=qr_method, svd_method={}) for qr_method in (False, {})]
+        with GateSplitter(decompose_expr, *operands, algorithm=direct) as splitter:
+            workspace = splitter.workspace
+            with GateSplitter(decompose_expr, *operands, algorithm=reduced, shared_with=splitter) as other:
+                assert other.workspace is workspace
+                for gate_splitter in (splitter, other, splitter):
+                    u, s, v = gate_splitter.split()
+                    assert verify_split_SVD(decomp_expr, intm, u, s, v, u_ref, s_ref, v_ref, **svd_kwargs)
+                assert workspace.size == max(splitter.workspace_size, other.workspace_size)
+            # the workspace is kept until all the gate splitters sharing it are freed
+            assert workspace.ptr is not None
+            u, s, v = splitter.split()
+            assert verify_split_SVD(decomp_expr, intm, u, s, v, u_ref, s_ref, v_ref, **svd_kwargs)
+        assert workspace.ptr is None
+
+    def test_parsed_once(self, decompose_expr, xp, stream, monkeypatch):
+        factory = DecomposeFactory(decompose_expr)
+        operands = factory.generate_operands(factory.input_shapes, xp, "float64", "C")
+        parse = decomposition_utils.parse_decomposition
+        calls = []
+        def counted_parse(subscripts, *operands):
+            calls.append(subscripts)
+            return parse(subscripts, *operands)
+        monkeypatch.setattr(decomposition_utils, 'parse_decomposition', counted_parse)
+
+        algorithm = ContractDecomposeAlgorithm(qr_method=False, svd_method={})
+        contract_decompose(decompose_expr, *operands, algorithm=algorithm)
+        assert calls == [decompose_expr]
+
+    def test_not_gate_split(self, decompose_expr, xp, stream):
+        factory = DecomposeFactory(decompose_expr)
+        operands = factory.generate_operands(factory.input_shapes, xp, "float64", "C")
+        algorithm = ContractDecomposeAlgorithm(qr_method={}, svd_method=False)
+        with pytest.raises(ValueError):
+            GateSplitter(decompose_expr, *operands, algorithm=algorithm)
+
+
+
+class TestMPSState:
+
+    @pytest.mark.parametrize(
+        "backend", ("numpy", "cupy")
+    )
+    @pytest.mark.parametrize(
+        "circuit", (get_native_qft_circuit(5), get_native_mps_circuit(4, 3), get_native_mps_circuit(6, 2, seed=5))
+    )
+    def test_exact(self, backend, circuit):
+        n_qubits = circuit.num_qubits
+        sv_ref = simulate_native_circuit(circuit)
+        with MPSState(n_qubits, backend=backend) as mps:
+            mps.apply_circuit(circuit)
+            assert mps.truncation_error < 1e-12
+            sv = mps.state_vector()
+            assert type(sv) is sys.modules[backend].ndarray
+            assert numpy.allclose(cupy.asnumpy(sv), sv_ref)
+            assert numpy.allclose(mps.state_vector(reference=True), sv_ref)
+            assert numpy.isclose(float(mps.norm()), 1)
+            for bitstring in ('0' * n_qubits, '1' * n_qubits, '01' * (n_qubits // 2) + '0' * (n_qubits % 2)):
+                amplitude = mps.amplitude(bitstring)
+                assert numpy.isclose(complex(amplitude), sv_ref[tuple(map(int, bitstring))])
+            # <Z_0 Z_{n-1}> from the state vector
+            z = numpy.array([1, -1])
+            zz = numpy.einsum('i,j,i...j->', z, z, numpy.abs(sv_ref)**2)
+            assert numpy.isclose(complex(mps.expectation('Z' + 'I' * (n_qubits-2) + 'Z')), zz)
+            assert numpy.isclose(complex(mps.expectation({0: 'Z', n_qubits-1: 'Z'})), zz)
+
+    @pytest.mark.parametrize(
+        "max_extent", (2, 3)
+    )
+    def test_truncated(self, max_extent):
+        circuit = get_native_mps_circuit(6, 3)
+        svd_method = {'max_extent': max_extent, 'partition': 'UV'}
+        with MPSState(circuit.num_qubits, backend='cupy', algorithm={'qr_method': False, 'svd_method': svd_method}) as mps:
+            mps.apply_circuit(circuit)
+            mps_tensors_ref = [cupy.asarray([1, 0], dtype='complex128').reshape(1, 2, 1)] * circuit.num_qubits
+            discarded_weights = []
+            for gate, qubits in CircuitToEinsum(circuit, backend=cupy).gates:
+                discarded_weights += mps_apply_gate(mps_tensors_ref, gate, qubits, **svd_method)
+            assert all(extent <= max_extent for extent in mps.bond_dimensions)
+            assert mps.bond_dimensions == tuple(o.shape[2] for o in mps_tensors_ref[:-1])
+            assert numpy.isclose(mps.truncation_error, 1 - numpy.prod([1 - w for w in discarded_weights]))
+            assert mps.truncation_error > 0
+            assert cupy.allclose(mps.state_vector(), mps_to_state_vector(mps_tensors_ref))
+            assert numpy.allclose(mps.state_vector(reference=True), cupy.asnumpy(mps_to_state_vector(mps_tensors_ref)))
+        with pytest.raises(InvalidDecompositionState):
+            mps.state_vector()
+
+    def test_splitter_cache(self, monkeypatch):
+        monkeypatch.setattr(mps_module, '_MAX_SPLITTERS', 2)
+        circuit = get_native_mps_circuit(6, 3)
+        sv_ref = simulate_native_circuit(circuit)
+        with MPSState(circuit.num_qubits, backend='cupy') as mps:
+            freed = []
+            free = GateSplitter.free
+            def counted_free(splitter):
+                freed.append(splitter)
+                free(splitter)
+            monkeypatch.setattr(GateSplitter, 'free', counted_free)
+            mps.apply_circuit(circuit)
+            # the bond dimensions grow along the circuit, so that older gate splitters are evicted
+            assert len(mps._splitters) == 2
+            assert len(freed) > 0
+            splitters = list(mps._splitters.values())
+            assert splitters[0].workspace is splitters[1].workspace
+            assert splitters[0].workspace.users == 2
+            assert numpy.allclose(cupy.asnumpy(mps.state_vector()), sv_ref)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            MPSState(2, algorithm={'qr_method': False, 'svd_method': {'partition': None}})
+        with MPSState(3) as mps:
+            with pytest.raises(ValueError):
+                mps.apply_gate(cupy.eye(4).reshape(2, 2, 2, 2), (0, 3))
+            with pytest.raises(NotImplementedError):
+                mps.apply_gate(cupy.eye(8).reshape((2,) * 6), (0, 1, 2))
+
+
 class TestContractDecomposeAlgorithm(_OptionsBase):
 
     options_type = ContractDecomposeAlgorithm
@@ -193,3 +400,191 @@ class TestContractDecomposeInfo(_OptionsBase):
             "svd_info": svd_info,
             "optimizer_info": optimizer_info,
         })
+
+
+class TestSliceSchedulerOptions(_OptionsBase):
+
+    options_type = SliceSchedulerOptions
+
+    @pytest.mark.parametrize(
+        'options', [{}, {'num_workers': 2, 'chunk_size': 4}, {'reduction': numpy.maximum}, {'backend': 'mpi'}]
+    )
+    def test_slice_scheduler_options(self, options):
+        self.create_options(options)
+
+    @pytest.mark.parametrize(
+        'options', [{'backend': 'dask'}, {'num_workers': 0}, {'chunk_size': 0}, {'comm': object()}]
+    )
+    def test_invalid_slice_scheduler_options(self, options):
+        with pytest.raises(ValueError):
+            self.create_options(options)
+
+
+class TestContractSliced:
+
+    @pytest.mark.parametrize(
+        "num_slices, num_workers, chunk_size", ((1, 1, 1), (10, 3, 2), (64, 4, 3), (5, 8, 1))
+    )
+    def test_work_stealing(self, num_slices, num_workers, chunk_size):
+        bounds = _initial_bounds(num_slices, num_workers)
+        # let worker 0 do all the work, stealing from the others
+        chunks = []
+        while (chunk := _next_chunk(bounds, 0, chunk_size)) is not None:
+            assert 0 < len(chunk) <= chunk_size
+            chunks.append(chunk)
+        assert sorted(s for chunk in chunks for s in chunk) == list(range(num_slices))
+        for w in range(num_workers):
+            assert _next_chunk(bounds, w, chunk_size) is None
+
+    @pytest.mark.parametrize(
+        "xp", ("numpy", "cupy")
+    )
+    def test_contract_sliced(self, xp):
+        xp = sys.modules[xp]
+        a = xp.asarray(numpy.random.random((4, 6, 8)))
+        b = xp.asarray(numpy.random.random((6, 8, 4)))
+        expr = 'ijk,jkl->il'
+        optimize = {'slicing': {'min_slices': 8}}
+        ref = oe.contract(expr, a, b)
+
+        out, info = contract_sliced(expr, a, b, optimize=optimize, scheduler={'num_workers': 2, 'chunk_size': 1}, return_info=True)
+        assert info.num_slices >= 8
+        assert infer_object_package(out) == xp.__name__
+        assert xp.allclose(out, ref)
+
+        # custom reductions, compared against the serial reduction of the slices
+        with Network(expr, a, b) as network:
+            network.contract_path(optimize={'path': info.path, 'slicing': info.slices})
+            slice_results = [network.contract(slices=[s]) for s in range(info.num_slices)]
+        # the slices are reduced in order by a single worker
+        out = contract_sliced(expr, a, b, optimize=optimize, scheduler={'num_workers': 1, 'chunk_size': 1, 'reduction': numpy.subtract})
+        ref = slice_results[0]
+        for r in slice_results[1:]:
+            ref = ref - r
+        assert xp.allclose(out, ref)
+        # the result of an order-independent reduction does not depend on the distribution of the slices
+        out = contract_sliced(expr, a, b, optimize=optimize, scheduler={'num_workers': 2, 'chunk_size': 1, 'reduction': numpy.maximum})
+        ref = slice_results[0]
+        for r in slice_results[1:]:
+            ref = xp.maximum(ref, r)
+        assert xp.allclose(out, ref)
+
+    def test_dead_worker(self):
+        class Process:
+            def __init__(self, exitcode):
+                self.exitcode = exitcode
+            def is_alive(self):
+                return False
+
+        results = queue.Queue()
+        results.put((1, None, 0, None))
+        results.put((0, None, 0, None))
+        assert [r[0] for r in _collect_results(results, [Process(0), Process(0)], timeout=0.01)] == [0, 1]
+
+        # the second worker exits without reporting a result
+        results.put((0, None, 0, None))
+        with pytest.raises(RuntimeError, match="exited without reporting"):
+            _collect_results(results, [Process(0), Process(-9)], timeout=0.01)
+
+
+class TestCheckpointOptions(_OptionsBase):
+
+    options_type = CheckpointOptions
+
+    @pytest.mark.parametrize(
+        'options', [{'file': 'a.ckpt'}, {'file': 'a.ckpt', 'interval': 1, 'chunk_size': 4}, {'file': 'a.ckpt', 'keep': True}]
+    )
+    def test_checkpoint_options(self, options):
+        self.create_options(options)
+
+    @pytest.mark.parametrize(
+        'options', [{'file': 'a.ckpt', 'interval': 0}, {'file': 'a.ckpt', 'interval': -1}, {'file': 'a.ckpt', 'chunk_size': 0},
+                    {'file': 'a.ckpt', 'keep': 1}]
+    )
+    def test_invalid_checkpoint_options(self, options):
+        with pytest.raises(ValueError):
+            self.create_options(options)
+
+
+class TestContractCheckpointed:
+
+    @pytest.mark.parametrize(
+        "xp", ("numpy", "cupy")
+    )
+    def test_resume(self, xp, tmp_path, monkeypatch):
+        xp = sys.modules[xp]
+        a = xp.asarray(numpy.random.random((4, 6, 8)))
+        b = xp.asarray(numpy.random.random((6, 8, 4)))
+        expr = 'ijk,jkl->il'
+        ref = oe.contract(expr, a, b)
+        file = str(tmp_path / "ijk_jkl.ckpt")
+        checkpoint = {'file': file, 'interval': 1, 'chunk_size': 2}
+
+        # interrupt the contraction after a few chunks
+        contract = Network.contract
+        calls = []
+        def interrupted_contract(self, **kwargs):
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            calls.append(kwargs['slices'])
+            return contract(self, **kwargs)
+        monkeypatch.setattr(Network, 'contract', interrupted_contract)
+
+        with pytest.raises(KeyboardInterrupt):
+            contract_checkpointed(expr, a, b, optimize={'slicing': {'min_slices': 16}}, checkpoint=checkpoint)
+        with numpy.load(file) as data:
+            assert sorted(data['completed']) == sorted(s for chunk in calls for s in chunk)
+
+        # resume, contracting only the remaining slices
+        monkeypatch.setattr(Network, 'contract', contract)
+        out, info = contract_checkpointed(expr, a, b, checkpoint=checkpoint, return_info=True)
+        assert info.num_slices >= 16
+        assert infer_object_package(out) == xp.__name__
+        assert xp.allclose(out, ref)
+        assert not os.path.exists(file)
+
+    def test_interrupted_accumulation(self, tmp_path, monkeypatch):
+        a = numpy.random.random((4, 6, 8))
+        b = numpy.random.random((6, 8, 4))
+        expr = 'ijk,jkl->il'
+        file = str(tmp_path / "ijk_jkl.ckpt")
+        checkpoint = {'file': file, 'interval': 3600, 'chunk_size': 2}
+
+        class InterruptedSum(numpy.ndarray):
+            # the interrupt arrives right after the next chunk has been added to the partial result
+            def __add__(self, other):
+                numpy.ndarray.__add__(self, other)
+                raise KeyboardInterrupt
+            def __iadd__(self, other):
+                numpy.ndarray.__iadd__(self, other)
+                raise KeyboardInterrupt
+
+        contract = Network.contract
+        calls = []
+        def interrupted_contract(self, **kwargs):
+            calls.append(kwargs['slices'])
+            out = contract(self, **kwargs)
+            return out.view(InterruptedSum) if len(calls) == 1 else out
+        monkeypatch.setattr(Network, 'contract', interrupted_contract)
+
+        with pytest.raises(KeyboardInterrupt):
+            contract_checkpointed(expr, a, b, optimize={'slicing': {'min_slices': 16}}, checkpoint=checkpoint)
+        assert len(calls) == 2
+        # the checkpoint holds the first chunk only, so the second chunk is not counted twice when resuming
+        with numpy.load(file) as data:
+            assert sorted(data['completed']) == list(calls[0])
+
+        monkeypatch.setattr(Network, 'contract', contract)
+        out = contract_checkpointed(expr, a, b, checkpoint=checkpoint)
+        assert numpy.allclose(out, oe.contract(expr, a, b))
+
+    def test_mismatch(self, tmp_path):
+        a = numpy.random.random((4, 6, 8))
+        b = numpy.random.random((6, 8, 4))
+        file = str(tmp_path / "ijk_jkl.ckpt")
+        contract_checkpointed('ijk,jkl->il', a, b, optimize={'slicing': {'min_slices': 4}},
+                              checkpoint={'file': file, 'keep': True})
+        assert os.path.exists(file)
+
+        with pytest.raises(ValueError):
+            contract_checkpointed('ijk,jkl->il', a, b.reshape(6, 8, 2, 2).sum(axis=-1), checkpoint={'file': file})
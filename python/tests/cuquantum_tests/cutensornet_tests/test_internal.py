@@ -1,9 +1,19 @@
+import itertools
 import threading
 
 import cupy as cp
+import numpy as np
 from cupy.cuda.runtime import getDevice, setDevice
 import pytest
 
+from cuquantum import contract_path
+from cuquantum.cutensornet._internal import canonical_form
+from cuquantum.cutensornet._internal import circuit_converter_utils
+from cuquantum.cutensornet._internal import cost_model
+from cuquantum.cutensornet._internal import einsum_parser
+from cuquantum.cutensornet._internal import gate_tensors
+from cuquantum.cutensornet._internal import path_utils
+from cuquantum.cutensornet._internal import reference_engine
 from cuquantum.cutensornet._internal import utils
 
 
@@ -85,3 +95,231 @@ class TestDeviceCtx:
         with pytest.raises(Exception):
             with dev:
                 pass
+
+
+class TestCanonicalForm:
+
+    @pytest.mark.parametrize(
+        "path", ([(0, 1), (0, 1), (0, 1)], [(2, 3), (0, 1), (1, 0)], [(3, 0), (1, 0), (0, 1)])
+    )
+    def test_path_conversion(self, path):
+        ssa_path = path_utils.linear_to_ssa(path, 4)
+        assert path_utils.ssa_to_linear(ssa_path, 4) == path
+
+    def test_canonicalize(self):
+        inputs, output, size_dict = [(0, 1, 2), (1, 2, 3), (0, 3, 4), (4, 0, 5)], (5,), {0: 4, 1: 6, 2: 8, 3: 4, 4: 6, 5: 2}
+        canonical = canonical_form.canonicalize(inputs, output, size_dict)
+
+        # relabel the modes and reverse the operands
+        relabel = {m: 10 - m for m in size_dict}
+        iso_inputs = [tuple(relabel[m] for m in reversed(_input)) for _input in reversed(inputs)]
+        iso_output = tuple(relabel[m] for m in output)
+        iso_size_dict = {relabel[m]: e for m, e in size_dict.items()}
+        iso_canonical = canonical_form.canonicalize(iso_inputs, iso_output, iso_size_dict)
+        assert canonical.fingerprint == iso_canonical.fingerprint
+
+        path = [(1, 3), (0, 2), (0, 1)]
+        iso_path = iso_canonical.path_from_canonical(canonical.path_to_canonical(path))
+        # the first pair (operands 1 and 3) corresponds to operands 2 and 0 in the reversed network
+        assert set(iso_path[0]) == {0, 2}
+        assert canonical.path_from_canonical(canonical.path_to_canonical(path)) == path
+        for m, c in canonical.mode_map_ord_to_canonical.items():
+            assert iso_canonical.mode_map_canonical_to_ord[c] == relabel[m]
+
+        # a different extent leads to a different fingerprint
+        other_size_dict = {**size_dict, 5: 4}
+        assert canonical_form.canonicalize(inputs, output, other_size_dict).fingerprint != canonical.fingerprint
+
+
+class TestReferenceEngine:
+
+    @pytest.mark.parametrize(
+        "expr, shapes", (
+            ("ij,jk,kl->il", ((4, 6), (6, 8), (8, 2))),
+            ("abc,bcd,dea,e->ce", ((3, 4, 5), (4, 5, 6), (6, 2, 3), (2,))),
+            ("ii,ij,jk->k", ((4, 4), (4, 5), (5, 3))),
+            ("ab,cb->abc", ((3, 4), (5, 4))),
+        )
+    )
+    @pytest.mark.parametrize(
+        "num_threads", (1, 4)
+    )
+    def test_contract(self, expr, shapes, num_threads):
+        operands = [np.random.random(shape) for shape in shapes]
+        ref = np.einsum(expr, *operands)
+
+        path, info = contract_path(expr, *operands, optimize={'slicing': {'min_slices': 4}})
+        out, stats = reference_engine.einsum(expr, *operands, path=path, slices=info.slices, num_threads=num_threads)
+        assert np.allclose(out, ref)
+        assert stats.num_slices == info.num_slices
+        assert stats.largest_intermediate > 0 and stats.peak_memory > 0
+
+        # a subset of the slices
+        if info.num_slices > 1:
+            half, _ = reference_engine.einsum(expr, *operands, path=path, slices=info.slices, slice_ids=range(0, info.num_slices, 2))
+            rest, _ = reference_engine.einsum(expr, *operands, path=path, slices=info.slices, slice_ids=range(1, info.num_slices, 2))
+            assert np.allclose(half + rest, ref)
+
+    @pytest.mark.parametrize(
+        "slices, num_slices", (
+            ([('j', 1)], 6),
+            ([('j', 2)], 3),
+            ([('j', 4), ('k', 8)], 2),
+            ([('j', 3), ('i', 2)], 4),
+        )
+    )
+    def test_sliced_extent(self, slices, num_slices):
+        # the slices are specified with the extents of the modes after slicing, as in OptimizerInfo.slices
+        operands = [np.random.random((4, 6)), np.random.random((6, 8))]
+        out, stats = reference_engine.einsum('ij,jk->ik', *operands, slices=slices)
+        assert np.allclose(out, np.einsum('ij,jk->ik', *operands))
+        assert stats.num_slices == num_slices
+
+    def test_unsliced(self):
+        operands = [np.random.random((4, 6)), np.random.random((6, 8)), np.random.random((8,))]
+        out, stats = reference_engine.einsum('ij,jk,k->i', *operands)
+        assert np.allclose(out, np.einsum('ij,jk,k->i', *operands))
+        assert stats.num_slices == 1
+        # operands (24 + 48 + 8) and the 4x8 intermediate, in double precision
+        assert stats.peak_memory == (24 + 48 + 8 + 32) * 8
+
+
+class TestCostModel:
+
+    def test_evaluate_paths(self):
+        inputs, output, size_dict = [(0, 1), (1, 2), (2, 3)], (0, 3), {0: 4, 1: 6, 2: 8, 3: 2}
+        costs = cost_model.evaluate_paths(inputs, output, size_dict, [[(0, 1), (0, 1)], [(1, 2), (0, 1)]])
+        # (ij,jk->ik) then (kl,ik->il) vs. (jk,kl->jl) then (ij,jl->il)
+        assert costs.flop_count.tolist() == [2 * (4*6*8 + 4*8*2), 2 * (6*8*2 + 4*6*2)]
+        assert costs.intermediate_sizes.tolist() == [[32, 8], [12, 8]]
+        assert costs.largest_intermediate.tolist() == [32, 12]
+        assert costs.peak_memory.tolist() == [(24 + 48 + 16 + 32) * 8, (24 + 48 + 16 + 12) * 8]
+        assert costs.num_slices == 1 and costs.slicing_overhead.tolist() == [1, 1]
+
+        # slicing the contracted mode k in two (sliced extent 4) halves the intermediates without overhead for the first path
+        costs = cost_model.evaluate_paths(inputs, output, size_dict, [[(0, 1), (0, 1)]], slices=[(2, 4)])
+        assert costs.num_slices == 2
+        assert costs.largest_intermediate.tolist() == [16]
+        assert costs.slicing_overhead.tolist() == [1]
+
+    @pytest.mark.parametrize(
+        "expr, shapes", (
+            ("ij,jk,kl->il", ((4, 6), (6, 8), (8, 2))),
+            ("abc,bcd,dea,e->ce", ((3, 4, 5), (4, 5, 6), (6, 2, 3), (2,))),
+        )
+    )
+    def test_optimizer_slicing(self, expr, shapes):
+        # the costs of a slicing found by the library, whose slices give the extents of the modes after slicing
+        operands = [np.random.random(shape) for shape in shapes]
+        path, info = contract_path(expr, *operands, optimize={'slicing': {'min_slices': 4}})
+        _, unsliced_info = contract_path(expr, *operands, optimize={'path': path})
+        costs = cost_model.evaluate_einsum_paths(expr, *operands, paths=[path], slices=info.slices)
+        assert costs.num_slices == info.num_slices
+        # the FLOP counts are compared relative to the unsliced contraction, independently of the counting convention
+        assert costs.slicing_overhead[0] == pytest.approx(info.opt_cost / unsliced_info.opt_cost)
+
+    @pytest.mark.parametrize(
+        "expr, shapes", (
+            ("abc,bcd,dea,e->ce", ((3, 4, 5), (4, 5, 6), (6, 2, 3), (2,))),
+            ("ii,ij,jk->k", ((4, 4), (4, 5), (5, 3))),
+        )
+    )
+    def test_reference_engine(self, expr, shapes):
+        operands = [np.random.random(shape) for shape in shapes]
+        paths = [[(0, 1)] * (len(shapes) - 1), [(len(shapes) - 2, len(shapes) - 1)] + [(0, 1)] * (len(shapes) - 2)]
+        costs = cost_model.evaluate_einsum_paths(expr, *operands, paths=paths)
+        for p, path in enumerate(paths):
+            _, stats = reference_engine.einsum(expr, *operands, path=path)
+            assert costs.peak_memory[p] == stats.peak_memory
+            assert costs.largest_intermediate[p] == stats.largest_intermediate
+
+
+class TestGateTensors:
+
+    def test_create_gate_tensors(self):
+        h = np.array([[1, 1], [1, -1]]) / np.sqrt(2)
+        cx = np.eye(4)[[0, 1, 3, 2]]
+        calls = []
+        def get_matrix(matrix):
+            def func():
+                calls.append(matrix)
+                return matrix
+            return func
+
+        specs = [('h', get_matrix(h), (0,)), ('h', get_matrix(h), (1,)), ('cx', get_matrix(cx), (0, 1)),
+                 (None, get_matrix(cx), (1, 2)), (None, get_matrix(cx), (2, 0))]
+        cache = dict()
+        gates = gate_tensors.create_gate_tensors(specs, 'complex128', cp, cache=cache)
+        assert [q for _, q in gates] == [q for _, _, q in specs]
+        assert gates[0][0] is gates[1][0]
+        assert gates[3][0] is gates[4][0]
+        assert gates[2][0].shape == gates[3][0].shape == (2, 2, 2, 2)
+        assert cp.allclose(gates[0][0], cp.asarray(h))
+        assert cp.allclose(gates[3][0].reshape(4, 4), cp.asarray(cx))
+        # all the distinct tensors are views into one buffer
+        assert len(set(id(t.data.mem) for t, _ in gates)) == 1
+        # the matrix of an interned gate is only generated once, unless it is identified by its matrix
+        assert len(calls) == 4
+
+        # the cache is reused across calls
+        more_gates = gate_tensors.create_gate_tensors([('h', get_matrix(h), (2,))], 'complex128', cp, cache=cache)
+        assert more_gates[0][0] is gates[0][0]
+        assert len(calls) == 4
+
+
+class TestEinsumParser:
+
+    @pytest.mark.parametrize(
+        "input_labels, output_labels", (
+            ([[5, 3], [3, 7, 1], [1, 5]], [7]),
+            ([[10**6, 2], [2, 10**6], [], [4]], None),
+            ([[0, 1, 2, 3]], [3, 1]),
+        )
+    )
+    def test_integer_interleaved(self, input_labels, output_labels):
+        operands = [np.ones((2,) * len(labels)) for labels in input_labels]
+        integer_inputs = [np.asarray(labels, dtype=np.int64) for labels in input_labels]
+        integer_output = None if output_labels is None else np.asarray(output_labels, dtype=np.int64)
+        assert einsum_parser.is_integer_interleaved(integer_inputs, integer_output)
+        assert not einsum_parser.is_integer_interleaved(input_labels, output_labels)
+
+        args = list(itertools.chain.from_iterable(zip(operands, input_labels)))
+        integer_args = list(itertools.chain.from_iterable(zip(operands, integer_inputs)))
+        if output_labels is not None:
+            args.append(output_labels)
+            integer_args.append(integer_output)
+        # the vectorized mapping of integer mode labels matches the general one
+        expected = einsum_parser.parse_einsum(*args)
+        result = einsum_parser.parse_einsum(*integer_args)
+        for r, e in zip(result[1:], expected[1:]):
+            assert r == e
+
+    def test_integer_interleaved_extra_output_mode(self):
+        with pytest.raises(ValueError, match="Extra modes in output"):
+            einsum_parser.parse_einsum(np.ones((2, 2)), np.array([0, 1]), np.array([2]))
+
+
+class TestLightconeIndex:
+
+    def test_lightcone_gates(self):
+        # 0 - A - B - - - E
+        # 1 - A - - - D - E
+        # 2 - - - B - - - -
+        # 3 - C - - - D - -
+        gates = [('A', (0, 1)), ('C', (3,)), ('B', (0, 2)), ('D', (1, 3)), ('E', (0, 1))]
+        index = circuit_converter_utils.LightconeIndex(gates)
+        cone = lambda qubits: ''.join(g for g, _ in index.get_lightcone_gates(qubits))
+        assert cone([2]) == 'AB'
+        assert cone([3]) == 'ACD'
+        assert cone([0]) == 'ACBDE'
+        assert cone([]) == ''
+        assert cone([2, 3]) == 'ACBD'
+        # repeated queries are answered from the cache
+        assert cone({3}) == 'ACD'
+        assert index._query.cache_info().hits == 1
+
+    def test_inverse_gate_tensor(self):
+        u, _ = np.linalg.qr(np.random.random((4, 4)) + 1j * np.random.random((4, 4)))
+        tensor = cp.asarray(u.reshape(2, 2, 2, 2))
+        inverse = circuit_converter_utils.get_inverse_gate_tensor(tensor)
+        assert cp.allclose(inverse.reshape(4, 4), cp.asarray(u.conj().T))
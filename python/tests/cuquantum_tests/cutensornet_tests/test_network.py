@@ -4,6 +4,7 @@
 
 import functools
 import copy
+import json
 import re
 import sys
 
@@ -124,3 +125,200 @@ class TestNetwork:
             *data, backend="torch" if "torch" in xp else xp)
         assert backend.allclose(
             out, out_ref, atol=atol_mapper[dtype], rtol=rtol_mapper[dtype])
+
+
+@pytest.mark.uncollect_if(func=deselect_contract_tests)
+@pytest.mark.parametrize(
+    "host_staging", (False, True)
+)
+@pytest.mark.parametrize(
+    "stacked", (False, True)
+)
+@pytest.mark.parametrize(
+    "stream", (None, True)
+)
+@pytest.mark.parametrize(
+    "dtype", dtype_names
+)
+@pytest.mark.parametrize(
+    "xp", backend_names
+)
+@pytest.mark.parametrize(
+    "einsum_expr_pack", einsum_expressions
+)
+class TestNetworkBatch:
+
+    def test_contract_batch(
+            self, einsum_expr_pack, xp, dtype, stream, stacked, host_staging):
+        einsum_expr = copy.deepcopy(einsum_expr_pack)
+        if isinstance(einsum_expr, list):
+            einsum_expr, network_opts, optimizer_opts, _ = einsum_expr
+        else:
+            network_opts = optimizer_opts = None
+        assert isinstance(einsum_expr, (str, tuple))
+        network_opts = dict(network_opts or {}, host_staging=host_staging)
+
+        factory = EinsumFactory(einsum_expr)
+        batch_size = 3
+        operand_sets = [factory.generate_operands(
+            factory.input_shapes, xp, dtype, "C") for _ in range(batch_size)]
+        backend = sys.modules[infer_object_package(operand_sets[0][0])]
+        if stream:
+            stream = get_stream_for_backend(backend)
+
+        with Network(*factory.convert_by_format(operand_sets[0]), options=network_opts) as tn:
+            tn.contract_path(optimize=optimizer_opts)
+            if stacked:
+                batch = [backend.stack(operands) for operands in zip(*operand_sets)]
+            else:
+                batch = operand_sets
+            out_batch = tn.contract_batch(batch, stream=stream)
+            if stream:
+                stream.synchronize()
+            assert sys.modules[infer_object_package(out_batch)] is backend
+            assert out_batch.shape[0] == batch_size
+
+            for k, operands in enumerate(operand_sets):
+                out_ref = opt_einsum.contract(
+                    *factory.convert_by_format(operands),
+                    backend="torch" if "torch" in xp else xp)
+                assert backend.allclose(
+                    out_batch[k], out_ref, atol=atol_mapper[dtype], rtol=rtol_mapper[dtype])
+
+            # the network holds the last item
+            out = tn.contract(stream=stream)
+            if stream:
+                stream.synchronize()
+            assert backend.allclose(
+                out, out_ref, atol=atol_mapper[dtype], rtol=rtol_mapper[dtype])
+
+            # results handed out earlier are not overwritten by later calls
+            tn.reset_operands(*operand_sets[0])
+            out_first = tn.contract(stream=stream)
+            if stream:
+                stream.synchronize()
+            assert backend.allclose(
+                out, out_ref, atol=atol_mapper[dtype], rtol=rtol_mapper[dtype])
+            assert backend.allclose(
+                out_first, out_batch[0], atol=atol_mapper[dtype], rtol=rtol_mapper[dtype])
+
+            with pytest.raises(ValueError):
+                tn.contract_batch([])
+
+
+@pytest.mark.uncollect_if(func=deselect_contract_tests)
+@pytest.mark.parametrize(
+    "dtype", ("float64",)
+)
+@pytest.mark.parametrize(
+    "xp", backend_names
+)
+@pytest.mark.parametrize(
+    "einsum_expr_pack", ("ij,jk,kl->il",)
+)
+class TestNetworkOutput:
+
+    def _setup(self, einsum_expr_pack, xp, dtype):
+        factory = EinsumFactory(einsum_expr_pack)
+        operands = factory.generate_operands(
+            factory.input_shapes, xp, dtype, "C")
+        backend = sys.modules[infer_object_package(operands[0])]
+        out_ref = opt_einsum.contract(
+            *factory.convert_by_format(operands),
+            backend="torch" if "torch" in xp else xp)
+        return factory, operands, backend, out_ref
+
+    def test_out(self, einsum_expr_pack, xp, dtype):
+        factory, operands, backend, out_ref = self._setup(einsum_expr_pack, xp, dtype)
+        with Network(*factory.convert_by_format(operands)) as tn:
+            tn.contract_path()
+            out = backend.zeros_like(out_ref)
+            result = tn.contract(out=out)
+            assert result is out
+            assert backend.allclose(
+                out, out_ref, atol=atol_mapper[dtype], rtol=rtol_mapper[dtype])
+
+            with pytest.raises(ValueError):
+                tn.contract(out=backend.zeros_like(out_ref)[:1])
+            if xp in ("cupy", "torch-gpu"):
+                # the strides must match for operands on the GPU
+                with pytest.raises(ValueError):
+                    tn.contract(out=out.T)
+            else:
+                # the result is downloaded straight into a C-ordered output
+                assert tn.host_output is None
+                out = backend.zeros(tuple(reversed(out_ref.shape)), dtype=out_ref.dtype).T
+                result = tn.contract(out=out)
+                assert result is out
+                assert backend.allclose(
+                    out, out_ref, atol=atol_mapper[dtype], rtol=rtol_mapper[dtype])
+                # other layouts go through one host tensor kept by the network
+                host_output = tn.host_output
+                assert host_output is not None
+                tn.contract(out=out)
+                assert tn.host_output is host_output
+
+    def test_output_ring(self, einsum_expr_pack, xp, dtype):
+        factory, operands, backend, out_ref = self._setup(einsum_expr_pack, xp, dtype)
+        with Network(*factory.convert_by_format(operands), options={'output_ring_size': 2}) as tn:
+            tn.contract_path()
+            results = [tn.contract() for _ in range(3)]
+            for result in results:
+                assert backend.allclose(
+                    result, out_ref, atol=atol_mapper[dtype], rtol=rtol_mapper[dtype])
+            # the output tensors are recycled, on the host for operands on the CPU
+            if xp == "cupy":
+                ptr = lambda t: t.data.ptr
+            elif xp == "numpy":
+                ptr = lambda t: t.ctypes.data
+            else:
+                ptr = lambda t: t.data_ptr()
+            assert ptr(results[0]) == ptr(results[2])
+            assert ptr(results[0]) != ptr(results[1])
+
+
+@pytest.mark.uncollect_if(func=deselect_contract_tests)
+@pytest.mark.parametrize(
+    "autotune", (None, 2)
+)
+@pytest.mark.parametrize(
+    "dtype", ("float64",)
+)
+@pytest.mark.parametrize(
+    "xp", backend_names
+)
+@pytest.mark.parametrize(
+    "einsum_expr_pack", ("ij,jk,kl->il", "ab,bcd,de,ca->e")
+)
+class TestNetworkPlan:
+
+    def test_plan(self, einsum_expr_pack, xp, dtype, autotune, tmp_path):
+        factory = EinsumFactory(einsum_expr_pack)
+        operands = factory.generate_operands(
+            factory.input_shapes, xp, dtype, "C")
+        backend = sys.modules[infer_object_package(operands[0])]
+        file = tmp_path / "network.plan"
+
+        with Network(*factory.convert_by_format(operands)) as tn:
+            path, info = tn.contract_path(optimize={'slicing': {'min_slices': 4}})
+            if autotune:
+                tn.autotune(iterations=autotune)
+            tn.save_plan(file)
+        with open(file) as f:
+            plan = json.load(f)
+        assert [tuple(p) for p in plan['path']] == [tuple(p) for p in path]
+
+        operands = factory.generate_operands(
+            factory.input_shapes, xp, dtype, "C")
+        out_ref = opt_einsum.contract(
+            *factory.convert_by_format(operands),
+            backend="torch" if "torch" in xp else xp)
+        with Network.from_plan(file, operands) as tn:
+            assert tn.autotune_iterations == autotune
+            assert tn.num_slices == info.num_slices
+            out = tn.contract()
+            assert backend.allclose(
+                out, out_ref, atol=atol_mapper[dtype], rtol=rtol_mapper[dtype])
+
+        with pytest.raises(ValueError):
+            Network.from_plan(file, operands[:-1])
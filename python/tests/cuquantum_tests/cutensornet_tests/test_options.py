@@ -13,6 +13,7 @@ from cuquantum import MemoryPointer
 from cuquantum import NetworkOptions
 from cuquantum import OptimizerInfo
 from cuquantum import OptimizerOptions
+from cuquantum import PathCache
 from cuquantum import PathFinderOptions
 from cuquantum import ReconfigOptions
 from cuquantum import SlicerOptions
@@ -67,6 +68,16 @@ class TestNetworkOptions(_OptionsBase):
         allocator = MyAllocator()
         self.create_options({'allocator': allocator})
 
+    def test_host_staging(self):
+        self.create_options({'host_staging': True})
+        with pytest.raises(ValueError):
+            self.create_options({'host_staging': 1})
+
+    def test_output_ring_size(self):
+        self.create_options({'output_ring_size': 4})
+        with pytest.raises(ValueError):
+            self.create_options({'output_ring_size': 0})
+
 
 class TestOptimizerOptions(_OptionsBase):
 
@@ -99,6 +110,11 @@ class TestOptimizerOptions(_OptionsBase):
     def test_seed(self):
         self.create_options({'seed': 100})
 
+    def test_cache(self):
+        self.create_options({'cache': PathCache()})
+        with pytest.raises(TypeError):
+            self.create_options({'cache': {}})
+
 
 class TestOptimizerInfo(_OptionsBase):
 
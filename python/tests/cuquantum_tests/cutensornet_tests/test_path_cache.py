@@ -0,0 +1,110 @@
+# Copyright (c) 2023, NVIDIA CORPORATION & AFFILIATES
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+
+import numpy
+import pytest
+
+from cuquantum import contract, Network, OptimizerOptions, PathCache
+from cuquantum.cutensornet._internal import canonical_form
+
+
+def _key(inputs, output, size_dict, memory_limit=2**30, **optimize):
+    fingerprint = canonical_form.canonicalize(inputs, output, size_dict).fingerprint
+    return PathCache.compute_key(fingerprint, 'float64', memory_limit, OptimizerOptions(**optimize))
+
+
+class TestPathCache:
+
+    def test_key(self):
+        inputs, output, size_dict = [(0, 1), (1, 2)], (0, 2), {0: 2, 1: 3, 2: 4}
+        key = _key(inputs, output, size_dict)
+        assert key == _key(inputs, output, size_dict)
+        # options that don't influence the path are not part of the key
+        assert key == _key(inputs, output, size_dict, threads=4)
+        assert key != _key(inputs, output, size_dict, samples=8)
+        assert key != _key(inputs, output, size_dict, memory_limit=2**20)
+        assert key != _key(inputs, output, {0: 2, 1: 5, 2: 4})
+        assert key != _key(inputs, (0,), size_dict)
+        # relabeled modes and permuted operands share the key
+        assert key == _key([(5, 3), (7, 5)], (7, 3), {3: 4, 5: 3, 7: 2})
+
+    def test_lru(self):
+        cache = PathCache(capacity=2)
+        cache.put('a', [(0, 1)])
+        cache.put('b', [(1, 0)])
+        assert cache.get('a').path == ((0, 1),)
+        cache.put('c', [(0, 1)], [(3, 2)])
+        assert 'b' not in cache
+        assert 'a' in cache and 'c' in cache
+        assert cache.get('b') is None
+        assert cache.get('c').slices == ((3, 2),)
+        assert (cache.hits, cache.misses, cache.evictions) == (2, 1, 1)
+
+    def test_persistence(self, tmp_path):
+        cache = PathCache(tmp_path, capacity=2)
+        cache.put('a', [(0, 1), (0, 1)], [(1, 4)])
+        cache.put('b', [(0, 1)])
+        cache.put('c', [(0, 1)])
+        assert sorted(os.listdir(tmp_path)) == ['b.json', 'c.json']
+
+        other = PathCache(tmp_path, capacity=2)
+        assert len(other) == 2
+        assert other.get('b').path == ((0, 1),)
+        assert other.get('a') is None
+
+        # entries written by another process are picked up
+        other.put('d', [(1, 0)])
+        assert cache.get('d').path == ((1, 0),)
+
+        other.clear()
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.parametrize(
+        "slicing", (None, {"min_slices": 4})
+    )
+    def test_network(self, tmp_path, slicing):
+        expr = 'abc,bcd,ade,eaf->f'
+        shapes = [(4, 6, 8), (6, 8, 4), (4, 4, 6), (6, 4, 2)]
+        operands = [numpy.random.random(shape) for shape in shapes]
+        cache = PathCache(tmp_path)
+        optimize = {'cache': cache, 'slicing': slicing}
+
+        with Network(expr, *operands) as tn:
+            path, info = tn.contract_path(optimize=optimize)
+            ref = tn.contract()
+        assert (cache.hits, cache.misses) == (0, 1)
+
+        # a new cache object backed by the same directory finds the entry
+        cache = PathCache(tmp_path)
+        optimize = {'cache': cache, 'slicing': slicing}
+        with Network(expr, *operands) as tn:
+            cached_path, cached_info = tn.contract_path(optimize=optimize)
+            out = tn.contract()
+        assert (cache.hits, cache.misses) == (1, 0)
+        assert cached_path == path
+        assert cached_info.slices == info.slices
+        assert numpy.allclose(out, ref)
+
+        out = contract(expr, *operands, optimize=optimize)
+        assert cache.hits == 2
+        assert numpy.allclose(out, ref)
+
+    def test_isomorphic_network(self):
+        expr = 'abc,bcd,ade,eaf->f'
+        shapes = [(4, 6, 8), (6, 8, 4), (4, 4, 6), (6, 4, 2)]
+        operands = [numpy.random.random(shape) for shape in shapes]
+        cache = PathCache()
+        optimize = {'cache': cache, 'slicing': {"min_slices": 4}}
+        ref, (_, info) = contract(expr, *operands, optimize=optimize, return_info=True)
+
+        # relabel the modes, reverse the operands and permute the modes of each operand
+        iso_expr = 'upt,tps,sqr,rpq->u'
+        iso_operands = [operands[3].transpose(2, 1, 0)] + [o.transpose(2, 0, 1) for o in operands[2::-1]]
+        out, (_, iso_info) = contract(iso_expr, *iso_operands, optimize=optimize, return_info=True)
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert iso_info.opt_cost == info.opt_cost
+        assert iso_info.num_slices == info.num_slices
+        assert numpy.allclose(out, ref)
@@ -12,8 +12,9 @@ import pytest
 from cuquantum import tensor
 from cuquantum.cutensornet._internal.decomposition_utils import DECOMPOSITION_DTYPE_NAMES
 from cuquantum.cutensornet._internal.utils import infer_object_package
+from cuquantum.cutensornet.tensor import InvalidDecompositionState
 
-from .approxTN_utils import tensor_decompose, verify_split_QR, verify_split_SVD
+from .approxTN_utils import parse_split_expression, reverse_einsum, tensor_decompose, verify_split_QR, verify_split_SVD
 from .data import backend_names, tensor_decomp_expressions
 from .test_options import _OptionsBase, TestNetworkOptions
 from .test_utils import DecomposeFactory
@@ -103,6 +104,168 @@ class TestDecompose:
         method = gen_rand_svd_method(seed=svd_method_seed)
         self._run_decompose(decompose_expr, xp, dtype, order, stream, method, return_info=return_info)
 
+    @pytest.mark.parametrize(
+        "svd_method_seed", (0, 1, 2)
+    )
+    def test_randomized_svd(self, decompose_expr, xp, dtype, order, stream, svd_method_seed):
+        # with enough oversampling the sampled range is complete, so the results must match the full SVD
+        method = dataclasses.replace(gen_rand_svd_method(seed=svd_method_seed), algorithm='gesvdr', gesvdr_oversampling=64)
+        self._run_decompose(decompose_expr, xp, dtype, order, stream, method, return_info=True)
+
+    def test_randomized_svd_low_rank(self, decompose_expr, xp, dtype, order, stream):
+        factory = DecomposeFactory(decompose_expr)
+        operand = factory.generate_operands(factory.input_shapes, xp, dtype, order)[0]
+        # the range of an operand of rank 2 is captured exactly by 2 random vectors
+        operand = reverse_einsum(decompose_expr, *tensor_decompose(decompose_expr, operand, method="svd", max_extent=2))
+        method = tensor.SVDMethod(max_extent=2, algorithm='gesvdr', gesvdr_oversampling=0, gesvdr_niters=0)
+        u, s, v = tensor.decompose(decompose_expr, operand, method=method)
+        assert type(u) is type(operand)
+        u_ref, s_ref, v_ref = tensor_decompose(decompose_expr, operand, method="svd", max_extent=2)
+        assert verify_split_SVD(decompose_expr, operand, u, s, v, u_ref, s_ref, v_ref, max_extent=2)
+
+
+
+@pytest.mark.uncollect_if(func=deselect_decompose_tests)
+@pytest.mark.parametrize(
+    "stream", (None, True)
+)
+@pytest.mark.parametrize(
+    "xp", backend_names
+)
+@pytest.mark.parametrize(
+    "decompose_expr", list(set([expr[0] for expr in tensor_decomp_expressions])) # filter out duplicated expressions
+)
+class TestDecomposer:
+
+    def _run_decomposer(self, decompose_expr, xp, stream, method, dtype="float64", order="C"):
+        factory = DecomposeFactory(decompose_expr)
+        backend = None
+        with tensor.Decomposer(decompose_expr,
+                               factory.generate_operands(factory.input_shapes, xp, dtype, order)[0],
+                               method=method) as decomposer:
+            for _ in range(3):
+                # bind new data of the same shape and verify against tensor.decompose
+                operand = factory.generate_operands(factory.input_shapes, xp, dtype, order)[0]
+                if backend is None:
+                    backend = sys.modules[infer_object_package(operand)]
+                    if stream:
+                        stream = get_stream_for_backend(backend)
+                decomposer.reset_operand(operand)
+                outputs = decomposer.decompose(stream=stream)
+                if stream:
+                    stream.synchronize()
+                outputs_ref = tensor.decompose(decompose_expr, operand, method=method)
+                for o, o_ref in zip(outputs, outputs_ref):
+                    if o_ref is None:
+                        assert o is None
+                        continue
+                    assert type(o) is type(operand)
+                    assert o.shape == o_ref.shape
+                if isinstance(method, tensor.QRMethod):
+                    assert verify_split_QR(decompose_expr, operand, *outputs, None, None)
+                else:
+                    u, s, v = outputs
+                    u_ref, s_ref, v_ref = tensor_decompose(decompose_expr, operand, method="svd", **dataclasses.asdict(method))
+                    assert verify_split_SVD(decompose_expr, operand, u, s, v, u_ref, s_ref, v_ref, **dataclasses.asdict(method))
+
+        with pytest.raises(InvalidDecompositionState):
+            decomposer.decompose()
+
+    def test_qr(self, decompose_expr, xp, stream):
+        self._run_decomposer(decompose_expr, xp, stream, tensor.QRMethod())
+
+    @pytest.mark.parametrize(
+        "svd_method_seed", (None, 0, 1)
+    )
+    def test_svd(self, decompose_expr, xp, stream, svd_method_seed):
+        # the truncated outputs of each decomposition must not affect the next one
+        self._run_decomposer(decompose_expr, xp, stream, gen_rand_svd_method(seed=svd_method_seed))
+
+    def test_reset_operand_mismatch(self, decompose_expr, xp, stream):
+        factory = DecomposeFactory(decompose_expr)
+        operand = factory.generate_operands(factory.input_shapes, xp, "float64", "C")[0]
+        with pytest.raises(ValueError):
+            tensor.Decomposer(decompose_expr, operand, method=tensor.SVDMethod(max_extent=2, algorithm='gesvdr'))
+        with tensor.Decomposer(decompose_expr, operand) as decomposer:
+            with pytest.raises(ValueError):
+                decomposer.reset_operand(operand.astype("float32") if not xp.startswith("torch") else operand.float())
+            with pytest.raises(ValueError):
+                decomposer.decompose(return_info=True)
+
+
+@pytest.mark.uncollect_if(func=deselect_decompose_tests)
+@pytest.mark.parametrize(
+    "stream", (None, True)
+)
+@pytest.mark.parametrize(
+    "stacked", (False, True)
+)
+@pytest.mark.parametrize(
+    "xp", backend_names
+)
+@pytest.mark.parametrize(
+    "decompose_expr", list(set([expr[0] for expr in tensor_decomp_expressions])) # filter out duplicated expressions
+)
+class TestDecomposeBatch:
+
+    batch_size = 4
+
+    def _run_decompose_batch(self, decompose_expr, xp, stacked, stream, method, return_info=False):
+        factory = DecomposeFactory(decompose_expr)
+        items = [factory.generate_operands(factory.input_shapes, xp, "float64", "C")[0] for _ in range(self.batch_size)]
+        backend = sys.modules[infer_object_package(items[0])]
+        operands = backend.stack(items) if stacked else items
+        if stream:
+            stream = get_stream_for_backend(backend)
+        outputs = tensor.decompose_batch(decompose_expr, operands, method=method, stream=stream, return_info=return_info)
+        if stream:
+            stream.synchronize()
+        if return_info:
+            outputs, svd_info = outputs[:-1], outputs[-1]
+            assert len(svd_info) == self.batch_size
+        for o in outputs:
+            assert type(o) is type(items[0])
+            assert o.shape[0] == self.batch_size
+
+        # each item must match the (zero-padded) results of tensor.decompose
+        _, left_modes, right_modes, shared_mode = parse_split_expression(decompose_expr)
+        for k, operand in enumerate(items):
+            outputs_ref = tensor.decompose(decompose_expr, operand, method=method, return_info=return_info)
+            if return_info:
+                outputs_ref, info_ref = outputs_ref[:-1], outputs_ref[-1]
+                assert svd_info[k].reduced_extent == info_ref.reduced_extent
+            if isinstance(method, tensor.QRMethod):
+                modes = (left_modes, right_modes)
+            else:
+                modes = (left_modes, shared_mode, right_modes)
+            for o, o_ref, o_modes in zip(outputs, outputs_ref, modes):
+                o = o[k]
+                axis = o_modes.index(shared_mode)
+                extent = o_ref.shape[axis]
+                index = (slice(None), ) * axis
+                assert backend.allclose(o[index + (slice(0, extent), )], o_ref)
+                assert backend.all(o[index + (slice(extent, None), )] == 0)
+
+    def test_qr(self, decompose_expr, xp, stacked, stream):
+        self._run_decompose_batch(decompose_expr, xp, stacked, stream, tensor.QRMethod())
+
+    @pytest.mark.parametrize(
+        "svd_method_seed", (None, 0, 1)
+    )
+    @pytest.mark.parametrize(
+        "return_info", (False, True)
+    )
+    def test_svd(self, decompose_expr, xp, stacked, stream, return_info, svd_method_seed):
+        self._run_decompose_batch(decompose_expr, xp, stacked, stream, gen_rand_svd_method(seed=svd_method_seed), return_info=return_info)
+
+    def test_invalid(self, decompose_expr, xp, stacked, stream):
+        with pytest.raises(ValueError):
+            tensor.decompose_batch(decompose_expr, [])
+        factory = DecomposeFactory(decompose_expr)
+        items = [factory.generate_operands(factory.input_shapes, xp, "float64", "C")[0] for _ in range(2)]
+        with pytest.raises(ValueError):
+            tensor.decompose_batch(decompose_expr, items, method=tensor.QRMethod(), return_info=True)
+
 
 class TestDecompositionOptions(TestNetworkOptions):
 
@@ -134,6 +297,17 @@ class TestSVDMethod(_OptionsBase):
     def test_normalization(self, normalization):
         self.create_options({'normalization': normalization})
 
+    def test_algorithm(self):
+        self.create_options({'algorithm': 'gesvd'})
+        self.create_options({'max_extent': 6, 'algorithm': 'gesvdr', 'gesvdr_oversampling': 4, 'gesvdr_niters': 1})
+
+    @pytest.mark.parametrize(
+        'options', [{'algorithm': 'gesvdj'}, {'algorithm': 'gesvdr'}, {'max_extent': 6, 'algorithm': 'gesvdr', 'gesvdr_niters': -1}]
+    )
+    def test_invalid_algorithm(self, options):
+        with pytest.raises(ValueError):
+            self.create_options(options)
+
 
 class TestSVDInfo(_OptionsBase):
 
@@ -349,7 +349,7 @@ def deselect_contract_tests(
     return False
 
 def deselect_decompose_tests(
-        decompose_expr, xp, dtype, *args, **kwargs):
+        decompose_expr, xp, *args, **kwargs):
     if xp.startswith('torch') and torch is None:
         return True
     return False